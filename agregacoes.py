@@ -0,0 +1,139 @@
+"""
+Agregações por grupo usadas pelas páginas do dashboard.
+
+Todas as reduções (contagens, somas, médias e taxas por grupo) são feitas com
+``np.bincount`` sobre o índice linear dos códigos das categorias, sem
+``groupby().agg`` com funções Python. As mesmas funções servem para linhas de
+pacientes e para as contagens do cubo (``cubo_metricas.contagens_por``): com
+``pesos='Contagem'`` cada linha vale o número de pacientes da célula.
+
+Os resultados seguem ``groupby(..., observed=True)``: só aparecem os grupos
+presentes, na ordem das categorias (ou dos valores, para colunas não
+categóricas), e linhas com grupo ausente ficam de fora.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _codigos(serie):
+    """Códigos (-1 para ausentes) e rótulos de uma coluna de agrupamento"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), pd.Categorical.from_codes(range(len(serie.cat.categories)),
+                                                                     dtype=serie.dtype)
+    codigos, rotulos = pd.factorize(serie, sort=True)
+    return codigos, rotulos
+
+
+def _grupos(df, grupos):
+    """Índice linear do grupo de cada linha (-1 se algum rótulo é ausente), forma e rótulos dos eixos"""
+    grupos = [grupos] if isinstance(grupos, str) else list(grupos)
+    codigos, rotulos = zip(*(_codigos(df[grupo]) for grupo in grupos))
+    forma = tuple(len(eixo) for eixo in rotulos)
+    validas = np.logical_and.reduce([codigo >= 0 for codigo in codigos])
+    indice = np.full(len(df), -1, dtype=np.int64)
+    if validas.any():
+        indice[validas] = np.ravel_multi_index([codigo[validas] for codigo in codigos], forma)
+    return grupos, indice, forma, rotulos
+
+
+def _valores(df, coluna):
+    """Coluna do DataFrame (pelo nome) ou array alinhado por posição"""
+    return df[coluna].to_numpy() if isinstance(coluna, str) else np.asarray(coluna)
+
+
+def _reducao(df, grupos, pesos):
+    """Rótulos dos grupos presentes e função que soma valores por grupo presente"""
+    grupos, indice, forma, rotulos = _grupos(df, grupos)
+    validas = indice >= 0
+    indice_valido = indice[validas]
+    tamanho = int(np.prod(forma))
+    presentes = np.flatnonzero(np.bincount(indice_valido, minlength=tamanho))
+    posicoes = np.unravel_index(presentes, forma)
+    tabela = pd.DataFrame({grupo: eixo[posicao] for grupo, eixo, posicao in zip(grupos, rotulos, posicoes)})
+    peso = None if pesos is None else _valores(df, pesos)[validas]
+
+    def somar(valores=None, incluir=None):
+        # Soma ponderada de ``valores`` (ou dos pesos) nas linhas válidas, opcionalmente só onde ``incluir``
+        ponderados = peso if valores is None else (valores[validas] if peso is None else valores[validas] * peso)
+        indices = indice_valido
+        if incluir is not None:
+            incluir = incluir[validas]
+            indices = indice_valido[incluir]
+            ponderados = None if ponderados is None else ponderados[incluir]
+        return np.bincount(indices, ponderados, minlength=tamanho)[presentes]
+
+    inteiros = peso is None or np.issubdtype(peso.dtype, np.integer)
+    return tabela, somar, inteiros
+
+
+def somar_por(df, grupos, colunas=(), pesos=None):
+    """
+    Soma de cada coluna e ``Contagem`` (linhas ou soma dos ``pesos``) por grupo.
+
+    Valores ausentes não entram na soma da coluna, como em ``groupby().sum()``.
+    """
+    resultado, somar, inteiros = _reducao(df, grupos, pesos)
+    for coluna in [colunas] if isinstance(colunas, str) else colunas:
+        resultado[coluna] = somar(np.nan_to_num(_valores(df, coluna).astype(np.float64)))
+    contagem = somar()
+    resultado['Contagem'] = contagem.astype(np.int64) if inteiros else contagem
+    return resultado
+
+
+def contar_por(df, grupos, pesos=None):
+    """Número de pacientes por grupo, na coluna ``Contagem`` (como ``groupby().size()``)"""
+    return somar_por(df, grupos, pesos=pesos)
+
+
+def media_por(df, grupos, colunas, pesos=None):
+    """Média de cada coluna por grupo, ignorando valores ausentes (como ``groupby().mean()``)"""
+    resultado, somar, _ = _reducao(df, grupos, pesos)
+    contagem = somar()
+    for coluna in [colunas] if isinstance(colunas, str) else colunas:
+        valores = _valores(df, coluna)
+        com_valor = pd.notna(valores)
+        if com_valor.all():
+            # Sem ausentes (o caso comum): o denominador é a contagem do grupo
+            soma, quantidade = somar(valores.astype(np.float64)), contagem
+        else:
+            valores = valores.astype(np.float64)
+            soma, quantidade = somar(valores, com_valor), somar(incluir=com_valor)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            resultado[coluna] = np.where(quantidade > 0, soma / quantidade, np.nan)
+    return resultado
+
+
+def taxa_por(df, grupos, indicador, pesos=None):
+    """
+    ``Total`` de pacientes, ``Casos`` com o ``indicador`` verdadeiro e ``Taxa`` (%) por grupo.
+
+    ``indicador`` é uma coluna booleana (ex.: ``Tem_Cancer``) ou uma condição
+    alinhada às linhas de ``df``.
+    """
+    resultado, somar, inteiros = _reducao(df, grupos, pesos)
+    total, casos = somar(), somar(incluir=_valores(df, indicador).astype(bool))
+    resultado['Total'] = total.astype(np.int64) if inteiros else total
+    resultado['Casos'] = casos.astype(np.int64) if inteiros else casos
+    resultado = resultado[resultado['Total'] > 0].reset_index(drop=True)
+    resultado['Taxa'] = resultado['Casos'] / resultado['Total'] * 100
+    return resultado
+
+
+def proporcao(df, condicao, pesos=None):
+    """Fração dos pacientes que atendem à ``condicao`` (NaN se não há pacientes)"""
+    atende = _valores(df, condicao).astype(bool)
+    peso = np.ones(len(df)) if pesos is None else _valores(df, pesos)
+    total = peso.sum()
+    return peso[atende].sum() / total if total else np.nan
+
+
+def percentual_no_grupo(df, grupos, coluna):
+    """Percentual que cada linha representa da soma de ``coluna`` no seu grupo (ex.: participação no ano)"""
+    _, indice, forma, _ = _grupos(df, grupos)
+    valores = _valores(df, coluna).astype(np.float64)
+    validas = indice >= 0
+    totais = np.bincount(indice[validas], valores[validas], minlength=int(np.prod(forma)))
+    percentual = np.full(len(df), np.nan)
+    percentual[validas] = valores[validas] / totais[indice[validas]] * 100
+    return pd.Series(percentual, index=df.index)
@@ -0,0 +1,117 @@
+"""
+Amostragem dos gráficos de dispersão com um orçamento de pontos.
+
+Acima do orçamento, os gráficos recebem uma amostra estratificada das linhas
+em vez do recorte inteiro:
+
+- os outliers (valores fora das cercas de Tukey, 1,5 IQR, em qualquer das
+  colunas indicadas) entram primeiro, dos mais extremos de cada coluna para
+  os menos extremos, até metade do orçamento;
+- o restante é dividido entre os estratos (ex.: estágios do câncer): cada
+  estrato presente tem uma cota mínima, mesmo que seja raro, e o que sobra é
+  distribuído na proporção do tamanho de cada estrato.
+
+Dentro de cada estrato as linhas são escolhidas por uma chave aleatória com
+semente fixa: a mesma entrada gera sempre a mesma amostra.
+"""
+
+import numpy as np
+import pandas as pd
+
+ORCAMENTO_PONTOS_PADRAO = 5_000
+SEMENTE_AMOSTRA = 42
+# Fração do orçamento que pode ser ocupada pelos outliers
+FRACAO_OUTLIERS = 0.5
+
+
+def _codigos_estratos(df, estratos):
+    """Código do estrato de cada linha (a combinação das colunas; ausentes formam um estrato próprio)"""
+    codigos, tamanhos = [], []
+    for coluna in estratos:
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigo, quantidade = serie.cat.codes.to_numpy(np.int64), len(serie.cat.categories)
+        else:
+            codigo, rotulos = pd.factorize(serie, sort=True)
+            quantidade = len(rotulos)
+        codigos.append(np.where(codigo < 0, quantidade, codigo))
+        tamanhos.append(quantidade + 1)
+    if not codigos:
+        return np.zeros(len(df), dtype=np.int64)
+    return np.ravel_multi_index(codigos, tamanhos)
+
+
+def prioridade_outliers(df, colunas):
+    """
+    Prioridade de cada linha como outlier (0 = mais extremo; infinito para linhas dentro das cercas).
+
+    Cada cauda de cada coluna é ordenada do valor mais distante da cerca de
+    Tukey para o mais próximo; a linha fica com a melhor posição entre todas
+    as caudas. Assim os extremos de todas as colunas entram antes dos
+    outliers menos extremos de qualquer uma delas. Valores ausentes não contam.
+    """
+    prioridade = np.full(len(df), np.inf)
+    for coluna in colunas:
+        valores = df[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(valores).all():
+            continue
+        q1, q3 = np.nanpercentile(valores, [25, 75])
+        iqr = q3 - q1
+        for distancia in (q1 - 1.5 * iqr - valores, valores - (q3 + 1.5 * iqr)):
+            fora = np.flatnonzero(distancia > 0)
+            ordem = fora[np.argsort(-distancia[fora], kind='stable')]
+            prioridade[ordem] = np.minimum(prioridade[ordem], np.arange(len(ordem)))
+    return prioridade
+
+
+def posicoes_amostra(df, orcamento=ORCAMENTO_PONTOS_PADRAO, estratos=(), colunas_outliers=(),
+                     semente=SEMENTE_AMOSTRA):
+    """
+    Posições (em ordem crescente) das linhas de ``df`` a desenhar, no máximo ``orcamento``.
+
+    Com até ``orcamento`` linhas, todas são mantidas. Caso contrário, todo
+    estrato de ``estratos`` presente no recorte continua no gráfico (se o
+    orçamento for menor que o número de estratos, ficam os menores), e os
+    outliers de ``colunas_outliers`` são mantidos antes das demais linhas.
+    """
+    total = len(df)
+    if total <= orcamento:
+        return np.arange(total)
+
+    # Outliers primeiro, do mais extremo para o menos extremo (empates pela posição)
+    prioridade = prioridade_outliers(df, colunas_outliers)
+    outliers = np.flatnonzero(np.isfinite(prioridade))
+    outliers = outliers[np.argsort(prioridade[outliers], kind='stable')][:int(orcamento * FRACAO_OUTLIERS)]
+    escolhidas = np.zeros(total, dtype=bool)
+    escolhidas[outliers] = True
+
+    # Cotas por estrato sobre as linhas restantes: mínimo igual para todos, o resto proporcional
+    codigos = _codigos_estratos(df, estratos)
+    candidatos = np.flatnonzero(~escolhidas)
+    presentes, codigos_candidatos, disponiveis = np.unique(codigos[candidatos], return_inverse=True,
+                                                           return_counts=True)
+    restante = orcamento - len(outliers)
+    cotas = np.minimum(disponiveis, max(1, restante // (2 * len(presentes))))
+    if cotas.sum() > restante:
+        # Orçamento menor que o número de estratos: os mínimos vão primeiro para os estratos menores
+        menores = np.argsort(disponiveis, kind='stable')
+        antes = np.cumsum(cotas[menores]) - cotas[menores]
+        cotas[menores] = np.clip(restante - antes, 0, cotas[menores])
+    sobra = restante - cotas.sum()
+    if sobra > 0:
+        livres = disponiveis - cotas
+        cotas += np.floor(sobra * livres / livres.sum()).astype(np.int64)
+
+    # Dentro de cada estrato, as linhas com as menores chaves aleatórias (determinísticas pela semente)
+    chaves = np.random.default_rng(semente).random(total)[candidatos]
+    ordem = np.lexsort((chaves, codigos_candidatos))
+    inicios = np.concatenate(([0], np.cumsum(disponiveis)[:-1]))
+    posicao_no_estrato = np.empty(len(candidatos), dtype=np.int64)
+    posicao_no_estrato[ordem] = np.arange(len(candidatos)) - np.repeat(inicios, disponiveis)
+    escolhidas[candidatos[posicao_no_estrato < cotas[codigos_candidatos]]] = True
+    return np.flatnonzero(escolhidas)
+
+
+def nota_amostra(exibidos, total):
+    """Legenda do gráfico amostrado (ex.: "5.000 de 1.000.000 pontos exibidos")"""
+    return f"{exibidos:,} de {total:,} pontos exibidos".replace(',', '.')
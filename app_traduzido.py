@@ -7,21 +7,31 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
+import os
 import warnings
 
+from agregacoes import contar_por, media_por, percentual_no_grupo, proporcao, taxa_por
+from amostragem import ORCAMENTO_PONTOS_PADRAO, nota_amostra, posicoes_amostra
+from armazenamento_colunar import TAMANHO_BLOCO_PADRAO, assinatura_fonte, carregar_com_cache, ler_colunar
+from colunas_derivadas import construir_colunas_derivadas
+from correlacoes import matriz_fatores, ranking_correlacoes
+from cubo_metricas import construir_cubo, contagens_por, fatiar_cubo, media_dimensao, total_cubo
+from dados_graficos import (contagens_caminho, dados_dispersao, densidade_por_faixas, figura_densidade, grafico_distribuicao,
+                            histograma, modo_renderizacao)
+from discretizacao import decadas, faixas_iguais, quartis
+from dados_compartilhados import carregar_compartilhado, modo_compartilhado_ativo
+from esquema_dados import ORDEM_CATEGORIAS, compactar_numericos, dtypes_leitura, niveis_observados
+from indices_filtros import construir_indices
+from localizacao import (COLUNAS_NUMERICAS_NEUTRAS, ESQUEMA_NEUTRO, IDIOMA_PADRAO, aplicar_esquema_neutro, localizar,
+                         normalizar_desfechos, rotulo_coluna)
+from motor_filtros import (MAX_ENTRADAS_CACHE, avaliar_filtros_em_cache, chave_filtros, coletar, combinar_filtros,
+                           criar_cache_filtros, especificacao_filtros, estatisticas_cache)
+
 # Suprimir warnings para saída mais limpa
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 warnings.filterwarnings('ignore', category=UserWarning)
 np.seterr(divide='ignore', invalid='ignore')
 
-def converter_intervalos_para_string(series):
-    """Converte objetos Interval para strings legíveis para uso em gráficos"""
-    if hasattr(series, 'dtype') and series.dtype.name == 'category':
-        # Verificar se são intervalos
-        if len(series) > 0 and hasattr(series.iloc[0], 'left'):
-            return series.apply(lambda x: f"{x.left:.0f}-{x.right:.0f}")
-    return series
-
 # Configuração da página
 st.set_page_config(
     page_title="Dashboard de Análise de Fatores de Risco do Câncer de Pulmão",
@@ -61,21 +71,146 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Carregar dados
-@st.cache_data
-def carregar_dados():
+# Carregar dados: o dataset é lido da fonte, com rótulos neutros, e traduzido na exibição
+CAMINHO_DATASET = 'Lung_Cancer_Trends_Realistic.csv'
+# Extratos grandes podem ser entregues já em formato colunar, com as colunas da fonte
+CAMINHO_DATASET_COLUNAR = 'Lung_Cancer_Trends_Realistic.parquet'
+# DASHBOARD_DATASET aponta para outro arquivo com as colunas da fonte (CSV, Parquet ou Feather),
+# ex.: os datasets sintéticos de gerar_dataset_sintetico.py
+CAMINHO_DATASET_ALTERNATIVO = os.environ.get('DASHBOARD_DATASET')
+# Com DASHBOARD_VERIFICAR_HASH=1 a versão do dataset inclui um hash do conteúdo
+VERIFICAR_HASH_DATASET = os.environ.get('DASHBOARD_VERIFICAR_HASH', '0').lower() in ('1', 'true', 'sim')
+# Máximo de pontos por gráfico de dispersão (DASHBOARD_ORCAMENTO_PONTOS); acima disso o gráfico recebe uma amostra
+ORCAMENTO_PONTOS = int(os.environ.get('DASHBOARD_ORCAMENTO_PONTOS', ORCAMENTO_PONTOS_PADRAO))
+
+# Colunas do recorte global lidas pelas páginas que aplicam filtros próprios (as demais usam todas)
+COLUNAS_RECORTE_GLOBAL = {
+    "🔍 Análise Detalhada": ['IMC', 'Nivel_Renda', 'Nivel_Educacao'],
+}
+# Páginas respondidas só pelo cubo de contagens, sem coletar linhas de pacientes
+PAGINAS_SO_CUBO = {"🏠 Visão Geral", "📈 Tendências Temporais"}
+# Exibição dos gráficos de dispersão: um ponto por paciente ou contagens/taxa de câncer por célula da grade
+MODOS_DISPERSAO = ["Pontos", "Densidade (pacientes)", "Densidade (taxa de câncer)"]
+
+def localizar_dataset():
+    """Usa o arquivo mais recente do dataset: o extrato em Parquet ou o CSV"""
+    if CAMINHO_DATASET_ALTERNATIVO:
+        if not os.path.exists(CAMINHO_DATASET_ALTERNATIVO):
+            raise FileNotFoundError(CAMINHO_DATASET_ALTERNATIVO)
+        return CAMINHO_DATASET_ALTERNATIVO
+    existentes = [caminho for caminho in (CAMINHO_DATASET_COLUNAR, CAMINHO_DATASET) if os.path.exists(caminho)]
+    if not existentes:
+        raise FileNotFoundError(CAMINHO_DATASET)
+    return max(existentes, key=os.path.getmtime)
+
+def versao_dataset():
+    """
+    Chave dos caches do dataset: caminho, tamanho, data de modificação e hash opcional.
+    Um arquivo novo no servidor gera uma nova chave e é recarregado sem reiniciar o processo.
+    """
     try:
-        df = pd.read_csv('Dataset_Cancer_Pulmao_Traduzido.csv')
-        return df
+        assinatura = assinatura_fonte(localizar_dataset(), com_hash=VERIFICAR_HASH_DATASET)
     except FileNotFoundError:
-        st.error("Dataset traduzido não encontrado. Execute o script traduzir_dataset.py primeiro.")
+        st.error("Dataset não encontrado. Execute o script download_dataset.py primeiro.")
         st.stop()
+    if 'hash' in assinatura:
+        # O hash já identifica o conteúdo: uma cópia idêntica não invalida o cache
+        return (assinatura['caminho'], assinatura['tamanho'], assinatura['hash'])
+    return (assinatura['caminho'], assinatura['tamanho'], assinatura['mtime_ns'])
+
+def preparar_dados(caminho, compacto=True):
+    """
+    Lê o dataset com os rótulos neutros da fonte (sem tradução); no modo
+    compacto também retorna o relatório de memória
+    """
+    if caminho.endswith('.csv'):
+        # CSVs grandes são ingeridos em blocos no cache colunar (pico de memória constante);
+        # se o CSV só ganhou linhas novas, apenas elas são lidas
+        df = carregar_com_cache(caminho, transformar=aplicar_esquema_neutro, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                                com_hash=VERIFICAR_HASH_DATASET, dtype=dtypes_leitura(ESQUEMA_NEUTRO))
+    else:
+        df = ler_colunar(caminho, 'feather' if caminho.endswith(('.feather', '.arrow')) else 'parquet')
+    # Estágio sem câncer normalizado e indicadores de desfecho calculados uma vez, na carga
+    df = normalizar_desfechos(aplicar_esquema_neutro(df))
+    if compacto:
+        return compactar_numericos(df, COLUNAS_NUMERICAS_NEUTRAS)
+    return df, pd.DataFrame()
+
+# As funções em cache recebem a versão do dataset como chave e guardam o dataset neutro,
+# comum a todos os idiomas. O Streamlit calcula cada
+# chave uma única vez por processo (as demais sessões esperam o resultado) e
+# max_entries descarta as versões antigas.
+@st.cache_data(max_entries=2)
+def carregar_dados(versao, compacto=True):
+    try:
+        return preparar_dados(versao[0], compacto)
+    except FileNotFoundError:
+        st.error("Dataset não encontrado. Execute o script download_dataset.py primeiro.")
+        st.stop()
+
+@st.cache_resource(max_entries=2)
+def carregar_dados_compartilhados(versao):
+    """Uma única cópia somente leitura, mapeada em memória, para todas as sessões e processos"""
+    try:
+        return carregar_compartilhado(versao[0], lambda: preparar_dados(versao[0]), com_hash=VERIFICAR_HASH_DATASET)
+    except FileNotFoundError:
+        st.error("Dataset não encontrado. Execute o script download_dataset.py primeiro.")
+        st.stop()
+
+@st.cache_resource(max_entries=2)
+def carregar_indice_filtros(versao, _df):
+    """Índices bitmap e de faixas, construídos uma vez por versão do dataset e compartilhados entre sessões"""
+    return construir_indices(_df)
+
+@st.cache_resource(max_entries=2)
+def carregar_cubo_metricas(versao, _df):
+    """Cubo de contagens das métricas, construído uma vez por versão do dataset e compartilhado entre sessões"""
+    return construir_cubo(_df)
+
+@st.cache_resource(max_entries=2)
+def carregar_colunas_derivadas(versao, _df):
+    """Colunas derivadas (categoria de IMC), calculadas uma vez por versão do dataset"""
+    return construir_colunas_derivadas(_df)
+
+# Fatores do ranking de correlação com câncer: colunas numéricas e categorias ordinais convertidas
+FATORES_NUMERICOS_RANKING = ['Idade', 'Anos_Fumando', 'Cigarros_Por_Dia', 'IMC']
+FATORES_ORDINAIS_RANKING = {
+    'Nivel_Poluicao_Ar': {'Baixo': 1, 'Moderado': 2, 'Alto': 3},
+    'Nivel_Atividade_Fisica': {'Baixo': 1, 'Moderado': 2, 'Alto': 3},
+    'Qualidade_Dieta': {'Ruim': 1, 'Média': 2, 'Boa': 3}
+}
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_ranking_correlacoes(versao, chave, _df_avancado):
+    """Ranking de correlação com câncer, calculado uma vez por versão do dataset e estado dos filtros (``chave``)"""
+    fatores = matriz_fatores(_df_avancado, FATORES_NUMERICOS_RANKING, FATORES_ORDINAIS_RANKING)
+    return ranking_correlacoes(fatores, _df_avancado['Tem_Cancer'])
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def amostrar_pontos(versao, chave, orcamento, estratos, colunas_outliers, _df):
+    """Posições da amostra de um gráfico de dispersão, sorteadas uma vez por versão do dataset e estado dos filtros"""
+    return posicoes_amostra(_df, orcamento, estratos, colunas_outliers)
+
+def titulo_amostra(titulo, exibidos, total):
+    """Título do gráfico de dispersão, com a nota de amostragem quando nem todos os pontos são exibidos"""
+    return titulo if exibidos == total else f"{titulo}<br><sup>{nota_amostra(exibidos, total)}</sup>"
+
+@st.cache_resource(max_entries=2)
+def carregar_cache_filtros(versao):
+    """Cache LRU das posições filtradas, compartilhado entre sessões e descartado quando o dataset muda"""
+    return criar_cache_filtros()
 
 # Título principal
 st.markdown('<h1 class="main-header">🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão</h1>', unsafe_allow_html=True)
 
 # Carregar dados
-df = carregar_dados()
+versao = versao_dataset()
+if modo_compartilhado_ativo():
+    df_neutro, relatorio_memoria = carregar_dados_compartilhados(versao)
+else:
+    df_neutro, relatorio_memoria = carregar_dados(versao)
+# Tradução na leitura: só os nomes de colunas e os rótulos das categorias mudam, sem copiar os dados
+df = localizar(df_neutro, IDIOMA_PADRAO)
 
 # Barra lateral para navegação e filtros
 st.sidebar.title("📊 Navegação e Filtros")
@@ -98,34 +233,45 @@ faixa_idade = st.sidebar.slider(
 )
 
 # Filtro de gênero
-opcoes_genero = ['Todos'] + list(df['Genero'].unique())
+opcoes_genero = ['Todos'] + niveis_observados(df['Genero'])
 genero_selecionado = st.sidebar.selectbox("Gênero", opcoes_genero)
 
 # Filtro de região
-opcoes_regiao = ['Todas'] + list(df['Regiao'].unique())
+opcoes_regiao = ['Todas'] + niveis_observados(df['Regiao'])
 regiao_selecionada = st.sidebar.selectbox("Região", opcoes_regiao)
 
 # Filtro de status de tabagismo
-opcoes_tabagismo = ['Todos'] + list(df['Status_Tabagismo'].unique())
+opcoes_tabagismo = ['Todos'] + niveis_observados(df['Status_Tabagismo'])
 tabagismo_selecionado = st.sidebar.selectbox("Status de Tabagismo", opcoes_tabagismo)
 
-# Aplicar filtros
-df_filtrado = df[
-    (df['Idade'] >= faixa_idade[0]) & 
-    (df['Idade'] <= faixa_idade[1])
-]
-
+# Filtros globais como especificação declarativa; as páginas com filtros próprios a combinam com
+# os seus e avaliam tudo de uma vez
+categorias_globais = {}
 if genero_selecionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['Genero'] == genero_selecionado]
+    categorias_globais['Genero'] = [genero_selecionado]
 
 if regiao_selecionada != 'Todas':
-    df_filtrado = df_filtrado[df_filtrado['Regiao'] == regiao_selecionada]
+    categorias_globais['Regiao'] = [regiao_selecionada]
 
 if tabagismo_selecionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['Status_Tabagismo'] == tabagismo_selecionado]
+    categorias_globais['Status_Tabagismo'] = [tabagismo_selecionado]
+
+faixas_globais = {}
+if faixa_idade != (int(df['Idade'].min()), int(df['Idade'].max())):
+    faixas_globais['Idade'] = faixa_idade
+
+filtros_globais = especificacao_filtros(categorias_globais, faixas_globais)
+indice_filtros = carregar_indice_filtros(versao, df)
+cache_filtros = carregar_cache_filtros(versao)
+# Contagens e taxas saem do cubo, fatiado pelos filtros globais (custo independente do número de linhas)
+cubo_global = fatiar_cubo(carregar_cubo_metricas(versao, df), filtros_globais)
+if pagina not in PAGINAS_SO_CUBO:
+    posicoes_globais = avaliar_filtros_em_cache(cache_filtros, df, indice_filtros, filtros_globais)
+    # Páginas com filtros próprios só leem estas colunas do recorte global (para montar os seus widgets)
+    df_filtrado = coletar(df, posicoes_globais, COLUNAS_RECORTE_GLOBAL.get(pagina))
 
 # Mostrar informações dos dados filtrados
-st.sidebar.markdown(f"**📋 Dados filtrados:** {len(df_filtrado)} de {len(df)} registros")
+st.sidebar.markdown(f"**📋 Dados filtrados:** {total_cubo(cubo_global)} de {len(df)} registros")
 
 # Documentação
 with st.sidebar.expander("📖 Como usar este dashboard"):
@@ -141,6 +287,22 @@ with st.sidebar.expander("📖 Como usar este dashboard"):
     - Use múltiplos filtros para análises detalhadas
     """)
 
+if not relatorio_memoria.empty:
+    with st.sidebar.expander("💾 Uso de memória do dataset"):
+        economia_total = relatorio_memoria['Bytes_Economizados'].sum()
+        st.markdown(f"**Economia com tipos compactos:** {economia_total / 1024:.1f} KB")
+        relatorio_exibido = relatorio_memoria.assign(Coluna=relatorio_memoria['Coluna'].map(rotulo_coluna))
+        st.dataframe(relatorio_exibido[['Coluna', 'Tipo_Original', 'Tipo_Compacto', 'Bytes_Economizados']], hide_index=True)
+
+with st.sidebar.expander("⚡ Cache de filtros"):
+    estatisticas_filtros = estatisticas_cache(cache_filtros)
+    st.markdown(
+        f"**Acertos:** {estatisticas_filtros['acertos']} · **Faltas:** {estatisticas_filtros['faltas']} "
+        f"({estatisticas_filtros['taxa_acerto']:.0%} de acerto)  \n"
+        f"**Seleções guardadas:** {estatisticas_filtros['entradas']} "
+        f"({estatisticas_filtros['bytes'] / 1024:.1f} KB) · **Removidas:** {estatisticas_filtros['remocoes']}"
+    )
+
 # Conteúdo das páginas baseado na seleção
 if pagina == "🏠 Visão Geral":
     st.markdown('<h2 class="section-header">📊 Visão Geral dos Dados</h2>', unsafe_allow_html=True)
@@ -185,29 +347,34 @@ if pagina == "🏠 Visão Geral":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total de Pacientes", len(df_filtrado))
+        st.metric("Total de Pacientes", total_cubo(cubo_global))
     
     with col2:
-        taxa_cancer = (df_filtrado['Estagio_Cancer_Pulmao'] != 'Sem Câncer').mean() * 100
+        por_estagio = contagens_por(cubo_global, ['Estagio_Cancer_Pulmao'])
+        taxa_cancer = proporcao(por_estagio, por_estagio['Estagio_Cancer_Pulmao'] != 'Sem Câncer', pesos='Contagem') * 100
         st.metric("Taxa de Câncer", f"{taxa_cancer:.1f}%")
     
     with col3:
-        idade_media = df_filtrado['Idade'].mean()
+        idade_media = media_dimensao(cubo_global, 'Idade')
         st.metric("Idade Média", f"{idade_media:.1f} anos")
     
     with col4:
-        pct_fumantes = (df_filtrado['Status_Tabagismo'] != 'Nunca').mean() * 100
+        por_tabagismo = contagens_por(cubo_global, ['Status_Tabagismo'])
+        pct_fumantes = proporcao(por_tabagismo, por_tabagismo['Status_Tabagismo'] != 'Nunca', pesos='Contagem') * 100
         st.metric("% Fumantes/Ex-fumantes", f"{pct_fumantes:.1f}%")
     
     # Gráficos principais de visão geral
     col1, col2 = st.columns(2)
     
+    # Pizzas e histograma recebem só as contagens do cubo, não as linhas dos pacientes
     with col1:
         # Distribuição por gênero
         fig_genero = px.pie(
-            df_filtrado, 
-            names='Genero', 
+            contagens_por(cubo_global, ['Genero']).dropna(),
+            names='Genero',
+            values='Contagem',
             title="Distribuição por Gênero",
+            category_orders=ORDEM_CATEGORIAS,
             color_discrete_sequence=['#FF6B6B', '#4ECDC4']
         )
         fig_genero.update_layout(height=400)
@@ -216,22 +383,26 @@ if pagina == "🏠 Visão Geral":
     with col2:
         # Distribuição do status de tabagismo
         fig_tabagismo = px.pie(
-            df_filtrado, 
-            names='Status_Tabagismo', 
+            por_tabagismo.dropna(),
+            names='Status_Tabagismo',
+            values='Contagem',
             title="Status de Tabagismo",
+            category_orders=ORDEM_CATEGORIAS,
             color_discrete_sequence=['#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
         )
         fig_tabagismo.update_layout(height=400)
         st.plotly_chart(fig_tabagismo, use_container_width=True)
     
     # Distribuição dos estágios de câncer
-    dados_cancer = df_filtrado[df_filtrado['Estagio_Cancer_Pulmao'] != 'Sem Câncer']
-    if len(dados_cancer) > 0:
-        fig_estagios = px.histogram(
+    dados_cancer = por_estagio[por_estagio['Estagio_Cancer_Pulmao'] != 'Sem Câncer'].dropna()
+    if dados_cancer['Contagem'].sum() > 0:
+        fig_estagios = px.bar(
             dados_cancer,
             x='Estagio_Cancer_Pulmao',
+            y='Contagem',
             title="Distribuição dos Estágios de Câncer",
             color='Estagio_Cancer_Pulmao',
+            category_orders=ORDEM_CATEGORIAS,
             color_discrete_sequence=['#FF9999', '#FF6666', '#FF3333', '#CC0000']
         )
         fig_estagios.update_layout(height=400, showlegend=False)
@@ -263,30 +434,57 @@ elif pagina == "🚬 Análise de Tabagismo":
         col1, col2 = st.columns(2)
         
         with col1:
-            # Gráfico de dispersão: Cigarros vs Idade
-            fig_scatter = px.scatter(
-                cig_filtrado,
-                x='Idade',
-                y='Cigarros_Por_Dia',
-                color='Genero',
-                size='Anos_Fumando',
-                hover_data=['IMC', 'Nivel_Renda'],
-                title="Cigarros por Dia vs Idade",
-                color_discrete_sequence=['#FF6B6B', '#4ECDC4']
+            # Acima do orçamento de pontos, a densidade é o modo inicial
+            modo_scatter = st.radio(
+                "Exibição:", MODOS_DISPERSAO, index=0 if len(cig_filtrado) <= ORCAMENTO_PONTOS else 1,
+                horizontal=True, key="modo_scatter"
             )
+            if modo_scatter == "Pontos":
+                # Gráfico de dispersão: Cigarros vs Idade, com no máximo ORCAMENTO_PONTOS pontos
+                # (todos os estágios do câncer e os outliers continuam na amostra)
+                posicoes_scatter = amostrar_pontos(
+                    versao, (chave_filtros(filtros_globais), faixa_cig), ORCAMENTO_PONTOS,
+                    ('Estagio_Cancer_Pulmao', 'Genero'), ('Idade', 'Cigarros_Por_Dia', 'Anos_Fumando'), cig_filtrado
+                )
+                # Só as colunas desenhadas; WebGL acima de LIMITE_PONTOS_WEBGL pontos
+                dados_scatter = dados_dispersao(cig_filtrado.iloc[posicoes_scatter],
+                                                ['Idade', 'Cigarros_Por_Dia', 'Genero', 'Anos_Fumando', 'IMC', 'Nivel_Renda'])
+                fig_scatter = px.scatter(
+                    dados_scatter,
+                    x='Idade',
+                    y='Cigarros_Por_Dia',
+                    color='Genero',
+                    size='Anos_Fumando',
+                    hover_data=['IMC', 'Nivel_Renda'],
+                    render_mode=modo_renderizacao(len(dados_scatter)),
+                    title=titulo_amostra("Cigarros por Dia vs Idade", len(posicoes_scatter), len(cig_filtrado)),
+                    color_discrete_sequence=['#FF6B6B', '#4ECDC4']
+                )
+            else:
+                # Contagens e taxa de câncer por célula Idade × Cigarros (tamanho fixo, qualquer número de linhas)
+                densidade_cig = densidade_por_faixas(cig_filtrado, ['Idade', 'Cigarros_Por_Dia'], 'Tem_Cancer')
+                por_taxa = modo_scatter == "Densidade (taxa de câncer)"
+                fig_scatter = figura_densidade(
+                    densidade_cig, 'Idade', 'Cigarros_Por_Dia',
+                    cor='Taxa' if por_taxa else 'Contagem',
+                    titulo="Cigarros por Dia vs Idade",
+                    escala='Reds' if por_taxa else 'Blues'
+                )
             fig_scatter.update_layout(height=400)
             st.plotly_chart(fig_scatter, use_container_width=True)
         
         with col2:
             # Box plot: Cigarros por estágio do câncer
-            fumantes_cancer = cig_filtrado[cig_filtrado['Estagio_Cancer_Pulmao'] != 'Sem Câncer']
+            fumantes_cancer = cig_filtrado[cig_filtrado['Tem_Cancer']]
             if len(fumantes_cancer) > 0:
-                fig_box = px.box(
+                # Acima do limite de linhas, a caixa é montada a partir dos quartis calculados no servidor
+                fig_box = grafico_distribuicao(
                     fumantes_cancer,
-                    x='Estagio_Cancer_Pulmao',
-                    y='Cigarros_Por_Dia',
-                    title="Cigarros por Dia por Estágio do Câncer",
-                    color='Estagio_Cancer_Pulmao'
+                    'Estagio_Cancer_Pulmao',
+                    'Cigarros_Por_Dia',
+                    'box',
+                    titulo="Cigarros por Dia por Estágio do Câncer",
+                    category_orders=ORDEM_CATEGORIAS
                 )
                 fig_box.update_layout(height=400)
                 st.plotly_chart(fig_box, use_container_width=True)
@@ -299,25 +497,30 @@ elif pagina == "🚬 Análise de Tabagismo":
         col1, col2 = st.columns(2)
         
         with col1:
-            # Histograma de anos fumando
-            fig_anos = px.histogram(
-                dados_tabagismo,
-                x='Anos_Fumando',
-                nbins=20,
+            # Histograma de anos fumando, com as faixas contadas no servidor
+            faixas_anos = histograma(dados_tabagismo['Anos_Fumando'], 20)
+            fig_anos = px.bar(
+                faixas_anos,
+                x='Centro',
+                y='Contagem',
+                hover_data=['Inicio', 'Fim'],
+                labels={'Centro': 'Anos_Fumando'},
                 title="Distribuição de Anos Fumando",
                 color_discrete_sequence=['#74B9FF']
             )
-            fig_anos.update_layout(height=400)
+            fig_anos.update_traces(width=faixas_anos['Fim'] - faixas_anos['Inicio'])
+            fig_anos.update_layout(height=400, bargap=0)
             st.plotly_chart(fig_anos, use_container_width=True)
         
         with col2:
             # Anos fumando vs Câncer
-            fig_cancer_anos = px.violin(
+            fig_cancer_anos = grafico_distribuicao(
                 dados_tabagismo,
-                x='Estagio_Cancer_Pulmao',
-                y='Anos_Fumando',
-                title="Anos Fumando por Estágio do Câncer",
-                color='Estagio_Cancer_Pulmao'
+                'Estagio_Cancer_Pulmao',
+                'Anos_Fumando',
+                'violin',
+                titulo="Anos Fumando por Estágio do Câncer",
+                category_orders=ORDEM_CATEGORIAS
             )
             fig_cancer_anos.update_layout(height=400)
             st.plotly_chart(fig_cancer_anos, use_container_width=True)
@@ -325,13 +528,14 @@ elif pagina == "🚬 Análise de Tabagismo":
     # Análise de exposição ao fumo passivo
     st.subheader("💨 Exposição ao Fumo Passivo")
     
-    # Preparar dados para sunburst - remover valores nulos
-    dados_sunburst = df_filtrado[['Exposicao_Fumo_Passivo', 'Estagio_Cancer_Pulmao']].dropna()
+    # Contagens por caminho da hierarquia (sem ausentes), em vez de uma linha por paciente
+    dados_sunburst = contagens_caminho(df_filtrado, ['Exposicao_Fumo_Passivo', 'Estagio_Cancer_Pulmao'])
     
     if len(dados_sunburst) > 0:
         fig_fumo_passivo = px.sunburst(
             dados_sunburst,
             path=['Exposicao_Fumo_Passivo', 'Estagio_Cancer_Pulmao'],
+            values='Contagem',
             title="Exposição ao Fumo Passivo vs Câncer",
             color_discrete_sequence=['#A8E6CF', '#FFD93D', '#FF6B6B', '#6C5CE7']
         )
@@ -350,25 +554,28 @@ elif pagina == "👥 Demografia":
         ["Décadas", "Faixas Personalizadas", "Quartis"]
     )
     
+    # Contagens por idade, gênero e estágio saem do cubo: os grupos etários são atribuídos às idades
+    # distintas, não a cada paciente
+    por_idade = contagens_por(cubo_global, ['Idade', 'Genero', 'Estagio_Cancer_Pulmao'])
+    
     if tipo_grupo_idade == "Décadas":
-        df_filtrado['Grupo_Idade'] = (df_filtrado['Idade'] // 10) * 10
-        df_filtrado['Grupo_Idade'] = df_filtrado['Grupo_Idade'].astype(str) + 's'
+        por_idade['Grupo_Idade'] = decadas(por_idade['Idade'])
         grupo_col = 'Grupo_Idade'
     elif tipo_grupo_idade == "Quartis":
-        df_filtrado['Grupo_Idade'] = pd.qcut(df_filtrado['Idade'], 4, labels=['Q1', 'Q2', 'Q3', 'Q4'])
+        # Quartis das idades dos pacientes: cada idade pesa o número de pacientes com ela
+        por_idade['Grupo_Idade'] = quartis(por_idade['Idade'], pesos=por_idade['Contagem'])
         grupo_col = 'Grupo_Idade'
     else:
         bins = st.slider("Número de faixas etárias:", 3, 10, 5)
-        df_filtrado['Grupo_Idade'] = pd.cut(df_filtrado['Idade'], bins=bins)
-        # Converter intervalos para strings para evitar erro de serialização JSON
-        df_filtrado['Grupo_Idade_Str'] = converter_intervalos_para_string(df_filtrado['Grupo_Idade'])
+        # Rótulos "início-fim" prontos (texto, sem objetos Interval que não serializam em JSON)
+        por_idade['Grupo_Idade_Str'] = faixas_iguais(por_idade['Idade'], bins)
         grupo_col = 'Grupo_Idade_Str'
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Distribuição por grupo de idade
-        dados_dist = df_filtrado.groupby([grupo_col, 'Genero'], observed=True).size().reset_index(name='Contagem')
+        dados_dist = contar_por(por_idade, [grupo_col, 'Genero'], pesos='Contagem')
         fig_dist_idade = px.bar(
             dados_dist,
             x=grupo_col,
@@ -382,9 +589,8 @@ elif pagina == "👥 Demografia":
     
     with col2:
         # Taxa de câncer por grupo de idade
-        cancer_idade = df_filtrado.groupby(grupo_col, observed=True).agg({
-            'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100
-        }).reset_index()
+        cancer_idade = taxa_por(por_idade, grupo_col, por_idade['Estagio_Cancer_Pulmao'] != 'Sem Câncer', pesos='Contagem')
+        cancer_idade = cancer_idade[[grupo_col, 'Taxa']]
         cancer_idade.columns = [grupo_col, 'Taxa_Cancer']
         
         fig_cancer_idade = px.bar(
@@ -405,10 +611,9 @@ elif pagina == "👥 Demografia":
     
     with col1:
         # Distribuição por região
-        dados_regiao = df_filtrado.groupby('Regiao').agg({
-            'ID_Paciente': 'count',
-            'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100
-        }).reset_index()
+        por_regiao = contagens_por(cubo_global, ['Regiao', 'Estagio_Cancer_Pulmao'])
+        dados_regiao = taxa_por(por_regiao, 'Regiao', por_regiao['Estagio_Cancer_Pulmao'] != 'Sem Câncer', pesos='Contagem')
+        dados_regiao = dados_regiao[['Regiao', 'Total', 'Taxa']]
         dados_regiao.columns = ['Regiao', 'Contagem_Pacientes', 'Taxa_Cancer']
         
         fig_regiao = px.bar(
@@ -431,7 +636,10 @@ elif pagina == "👥 Demografia":
             }
             
             # Verificar se os dados são categóricos e mapear para numéricos
-            if df_filtrado['Nivel_Renda'].dtype == 'object':
+            if isinstance(df_filtrado['Nivel_Renda'].dtype, pd.CategoricalDtype):
+                # Categorias ordenadas pelo esquema: Baixa < Média < Alta
+                renda_numerica = df_filtrado['Nivel_Renda'].cat.codes + 1
+            elif df_filtrado['Nivel_Renda'].dtype == 'object':
                 try:
                     renda_numerica = df_filtrado['Nivel_Renda'].map(mapeamento_renda)
                     if renda_numerica.isna().all():
@@ -441,23 +649,24 @@ elif pagina == "👥 Demografia":
             else:
                 renda_numerica = df_filtrado['Nivel_Renda']
             
-            # Criar DataFrame temporário para o gráfico
-            df_temp = df_filtrado.copy()
-            df_temp['Nivel_Renda_Numerico'] = renda_numerica
+            # DataFrame só com as duas colunas do gráfico (sem copiar o recorte inteiro)
+            df_temp = pd.DataFrame({'Nivel_Educacao': df_filtrado['Nivel_Educacao'],
+                                    'Nivel_Renda_Numerico': renda_numerica})
             
-            fig_renda_edu = px.box(
+            fig_renda_edu = grafico_distribuicao(
                 df_temp,
-                x='Nivel_Educacao',
-                y='Nivel_Renda_Numerico',
-                title="Distribuição de Renda por Nível Educacional",
-                color='Nivel_Educacao'
+                'Nivel_Educacao',
+                'Nivel_Renda_Numerico',
+                'box',
+                titulo="Distribuição de Renda por Nível Educacional",
+                category_orders=ORDEM_CATEGORIAS
             )
             fig_renda_edu.update_layout(height=400, xaxis_tickangle=45)
             st.plotly_chart(fig_renda_edu, use_container_width=True)
             
         except Exception as e:
             # Fallback: usar gráfico de barras se box plot falhar
-            contagem_renda_edu = df_filtrado.groupby(['Nivel_Educacao', 'Nivel_Renda'], observed=True).size().reset_index(name='Contagem')
+            contagem_renda_edu = contar_por(df_filtrado, ['Nivel_Educacao', 'Nivel_Renda'])
             fig_renda_edu_fallback = px.bar(
                 contagem_renda_edu,
                 x='Nivel_Educacao',
@@ -472,22 +681,16 @@ elif pagina == "👥 Demografia":
     # Análise do IMC
     st.subheader("⚖️ Análise do IMC")
     
-    # Categorias de IMC
-    def categorizar_imc(imc):
-        if imc < 18.5:
-            return 'Abaixo do peso'
-        elif imc < 25:
-            return 'Peso normal'
-        elif imc < 30:
-            return 'Sobrepeso'
-        else:
-            return 'Obesidade'
-    
-    df_filtrado['Categoria_IMC'] = df_filtrado['IMC'].apply(categorizar_imc)
+    # Categorias de IMC calculadas na carga e coletadas com as mesmas posições do filtro global
+    dados_imc = pd.DataFrame({
+        'Categoria_IMC': coletar(carregar_colunas_derivadas(versao, df), posicoes_globais)['Categoria_IMC'],
+        'Genero': df_filtrado['Genero'],
+    })
     
-    fig_imc = px.histogram(
-        df_filtrado,
+    fig_imc = px.bar(
+        contar_por(dados_imc, ['Categoria_IMC', 'Genero']),
         x='Categoria_IMC',
+        y='Contagem',
         color='Genero',
         title="Distribuição de Categorias de IMC por Gênero",
         barmode='group',
@@ -513,8 +716,9 @@ elif pagina == "🏥 Análise Médica":
     with col1:
         # Distribuição da métrica de saúde
         fig_saude = px.pie(
-            df_filtrado,
+            contar_por(df_filtrado, metrica_saude),
             names=metrica_saude,
+            values='Contagem',
             title=f"Distribuição: {metrica_saude.replace('_', ' ')}",
             color_discrete_sequence=['#FF9999', '#66B2FF', '#99FF99', '#FFB366']
         )
@@ -523,9 +727,7 @@ elif pagina == "🏥 Análise Médica":
     
     with col2:
         # Saúde vs Câncer
-        saude_cancer = df_filtrado.groupby(metrica_saude).agg({
-            'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100
-        }).reset_index()
+        saude_cancer = taxa_por(df_filtrado, metrica_saude, 'Tem_Cancer')[[metrica_saude, 'Taxa']]
         saude_cancer.columns = [metrica_saude, 'Taxa_Cancer']
         
         fig_sc_cancer = px.bar(
@@ -560,7 +762,7 @@ elif pagina == "🏥 Análise Médica":
                     else:
                         # Tentar converter categórico para numérico
                         if fator == 'Nivel_Poluicao_Ar':
-                            col_temp = df_filtrado[fator].map({'Baixo': 1, 'Moderado': 2, 'Alto': 3})
+                            col_temp = df_filtrado[fator].map({'Baixo': 1, 'Moderado': 2, 'Alto': 3}).astype(float)
                             if not col_temp.isna().all():
                                 df_filtrado_temp = df_filtrado.copy()
                                 df_filtrado_temp[fator] = col_temp
@@ -599,7 +801,7 @@ elif pagina == "🏥 Análise Médica":
     with col1:
         # Marcadores genéticos vs Histórico familiar
         fig_genetico = px.bar(
-            df_filtrado.groupby(['Marcadores_Geneticos_Positivos', 'Historico_Familiar'], observed=True).size().reset_index(name='Contagem'),
+            contar_por(df_filtrado, ['Marcadores_Geneticos_Positivos', 'Historico_Familiar']),
             x='Marcadores_Geneticos_Positivos',
             y='Contagem',
             color='Historico_Familiar',
@@ -612,7 +814,7 @@ elif pagina == "🏥 Análise Médica":
     with col2:
         # Análise de status de sobrevivência
         fig_sobrevivencia = px.bar(
-            df_filtrado.groupby(['Status_Sobrevivencia', 'Marcadores_Geneticos_Positivos'], observed=True).size().reset_index(name='Contagem'),
+            contar_por(df_filtrado, ['Status_Sobrevivencia', 'Marcadores_Geneticos_Positivos']),
             x='Status_Sobrevivencia',
             y='Contagem',
             color='Marcadores_Geneticos_Positivos',
@@ -625,9 +827,8 @@ elif pagina == "🏥 Análise Médica":
     # Fatores de estilo de vida
     st.subheader("🏃‍♂️ Fatores de Estilo de Vida")
     
-    dados_estilo_vida = df_filtrado.groupby(['Nivel_Atividade_Fisica', 'Qualidade_Dieta'], observed=True).agg({
-        'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100
-    }).reset_index()
+    dados_estilo_vida = taxa_por(df_filtrado, ['Nivel_Atividade_Fisica', 'Qualidade_Dieta'], 'Tem_Cancer')
+    dados_estilo_vida = dados_estilo_vida[['Nivel_Atividade_Fisica', 'Qualidade_Dieta', 'Taxa']]
     dados_estilo_vida.columns = ['Nivel_Atividade_Fisica', 'Qualidade_Dieta', 'Taxa_Cancer']
     
     fig_estilo_vida = px.scatter(
@@ -647,17 +848,16 @@ elif pagina == "📈 Tendências Temporais":
     st.markdown('<h2 class="section-header">📈 Análise de Tendências Temporais</h2>', unsafe_allow_html=True)
     
     # Seletor de faixa de anos
+    anos_presentes = contagens_por(cubo_global, ['Ano_Diagnostico'])['Ano_Diagnostico']
     faixa_anos = st.slider(
         "Selecione o período para análise:",
-        min_value=int(df_filtrado['Ano_Diagnostico'].min()),
-        max_value=int(df_filtrado['Ano_Diagnostico'].max()),
-        value=(int(df_filtrado['Ano_Diagnostico'].min()), int(df_filtrado['Ano_Diagnostico'].max()))
+        min_value=int(anos_presentes.min()),
+        max_value=int(anos_presentes.max()),
+        value=(int(anos_presentes.min()), int(anos_presentes.max()))
     )
     
-    df_anos_filtrado = df_filtrado[
-        (df_filtrado['Ano_Diagnostico'] >= faixa_anos[0]) & 
-        (df_filtrado['Ano_Diagnostico'] <= faixa_anos[1])
-    ]
+    # Todas as séries da página saem do cubo fatiado pelos filtros globais + período
+    cubo_periodo = fatiar_cubo(cubo_global, especificacao_filtros(faixas={'Ano_Diagnostico': faixa_anos}))
     
     # Tendências do câncer ao longo do tempo
     st.subheader("📊 Tendências do Câncer ao Longo do Tempo")
@@ -666,12 +866,10 @@ elif pagina == "📈 Tendências Temporais":
     
     with col1:
         # Casos de câncer por ano
-        cancer_anual = df_anos_filtrado.groupby('Ano_Diagnostico').agg({
-            'ID_Paciente': 'count',
-            'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').sum()
-        }).reset_index()
-        cancer_anual.columns = ['Ano', 'Total_Casos', 'Casos_Cancer']
-        cancer_anual['Taxa_Cancer'] = (cancer_anual['Casos_Cancer'] / cancer_anual['Total_Casos']) * 100
+        por_ano_estagio = contagens_por(cubo_periodo, ['Ano_Diagnostico', 'Estagio_Cancer_Pulmao'])
+        cancer_anual = taxa_por(por_ano_estagio, 'Ano_Diagnostico',
+                                por_ano_estagio['Estagio_Cancer_Pulmao'] != 'Sem Câncer', pesos='Contagem')
+        cancer_anual.columns = ['Ano', 'Total_Casos', 'Casos_Cancer', 'Taxa_Cancer']
         
         fig_anual = px.line(
             cancer_anual,
@@ -702,7 +900,9 @@ elif pagina == "📈 Tendências Temporais":
     st.subheader("👴 Tendências Etárias")
     
     # Calcular idade média por ano e status de câncer
-    tendencias_idade = df_anos_filtrado.groupby(['Ano_Diagnostico', 'Estagio_Cancer_Pulmao'], observed=True)['Idade'].mean().reset_index()
+    por_ano_estagio_idade = contagens_por(cubo_periodo, ['Ano_Diagnostico', 'Estagio_Cancer_Pulmao', 'Idade'])
+    tendencias_idade = media_por(por_ano_estagio_idade, ['Ano_Diagnostico', 'Estagio_Cancer_Pulmao'], 'Idade',
+                                 pesos='Contagem')
     
     fig_tendencias_idade = px.line(
         tendencias_idade,
@@ -718,8 +918,8 @@ elif pagina == "📈 Tendências Temporais":
     # Tendências do tabagismo
     st.subheader("🚬 Tendências do Tabagismo")
     
-    tendencias_tabagismo = df_anos_filtrado.groupby(['Ano_Diagnostico', 'Status_Tabagismo'], observed=True).size().reset_index(name='Contagem')
-    tendencias_tabagismo['Porcentagem'] = tendencias_tabagismo.groupby('Ano_Diagnostico')['Contagem'].transform(lambda x: x / x.sum() * 100)
+    tendencias_tabagismo = contagens_por(cubo_periodo, ['Ano_Diagnostico', 'Status_Tabagismo']).dropna()
+    tendencias_tabagismo['Porcentagem'] = percentual_no_grupo(tendencias_tabagismo, 'Ano_Diagnostico', 'Contagem')
     
     fig_tendencias_tabagismo = px.area(
         tendencias_tabagismo,
@@ -735,9 +935,10 @@ elif pagina == "📈 Tendências Temporais":
     # Análise de sobrevivência ao longo do tempo
     st.subheader("💚 Análise de Sobrevivência")
     
-    tendencias_sobrevivencia = df_anos_filtrado.groupby('Ano_Diagnostico').agg({
-        'Status_Sobrevivencia': lambda x: (x == 'Vivo').mean() * 100
-    }).reset_index()
+    por_ano_sobrevivencia = contagens_por(cubo_periodo, ['Ano_Diagnostico', 'Status_Sobrevivencia'])
+    tendencias_sobrevivencia = taxa_por(por_ano_sobrevivencia, 'Ano_Diagnostico',
+                                        por_ano_sobrevivencia['Status_Sobrevivencia'] == 'Vivo', pesos='Contagem')
+    tendencias_sobrevivencia = tendencias_sobrevivencia[['Ano_Diagnostico', 'Taxa']]
     tendencias_sobrevivencia.columns = ['Ano', 'Taxa_Sobrevivencia']
     
     fig_tendencia_sobrevivencia = px.bar(
@@ -760,34 +961,36 @@ elif pagina == "🔍 Análise Detalhada":
     col1, col2, col3 = st.columns(3)
     
     with col1:
+        # IMC é float32 no modo compacto: arredondar apenas para exibição no slider
+        imc_min = round(float(df_filtrado['IMC'].min()), 6)
+        imc_max = round(float(df_filtrado['IMC'].max()), 6)
         faixa_imc = st.slider(
             "Faixa de IMC:",
-            float(df_filtrado['IMC'].min()),
-            float(df_filtrado['IMC'].max()),
-            (float(df_filtrado['IMC'].min()), float(df_filtrado['IMC'].max()))
+            imc_min,
+            imc_max,
+            (imc_min, imc_max)
         )
     
     with col2:
         niveis_renda = st.multiselect(
             "Níveis de Renda:",
-            options=df_filtrado['Nivel_Renda'].unique(),
-            default=df_filtrado['Nivel_Renda'].unique()
+            options=niveis_observados(df_filtrado['Nivel_Renda']),
+            default=niveis_observados(df_filtrado['Nivel_Renda'])
         )
     
     with col3:
         niveis_educacao = st.multiselect(
             "Níveis de Educação:",
-            options=df_filtrado['Nivel_Educacao'].unique(),
-            default=df_filtrado['Nivel_Educacao'].unique()
+            options=niveis_observados(df_filtrado['Nivel_Educacao']),
+            default=niveis_observados(df_filtrado['Nivel_Educacao'])
         )
     
-    # Aplicar filtros avançados
-    df_avancado = df_filtrado[
-        (df_filtrado['IMC'] >= faixa_imc[0]) & 
-        (df_filtrado['IMC'] <= faixa_imc[1]) &
-        (df_filtrado['Nivel_Renda'].isin(niveis_renda)) &
-        (df_filtrado['Nivel_Educacao'].isin(niveis_educacao))
-    ]
+    # Filtros avançados + globais em uma única avaliação
+    filtros_avancados = combinar_filtros(filtros_globais, especificacao_filtros(
+        categorias={'Nivel_Renda': niveis_renda, 'Nivel_Educacao': niveis_educacao},
+        faixas={'IMC': faixa_imc}
+    ))
+    df_avancado = coletar(df, avaliar_filtros_em_cache(cache_filtros, df, indice_filtros, filtros_avancados))
     
     st.info(f"Registros após filtros avançados: {len(df_avancado)}")
     
@@ -796,17 +999,45 @@ elif pagina == "🔍 Análise Detalhada":
     
     # Gráfico de dispersão 3D
     if len(df_avancado) > 0:
-        fig_3d = px.scatter_3d(
-            df_avancado,
-            x='Idade',
-            y='IMC',
-            z='Anos_Fumando',
-            color='Estagio_Cancer_Pulmao',
-            size='Cigarros_Por_Dia',
-            hover_data=['Genero', 'Regiao'],
-            title="Análise 3D: Idade vs IMC vs Anos Fumando",
-            color_discrete_sequence=['#74B9FF', '#A29BFE', '#FD79A8', '#FDCB6E', '#00B894']
+        modo_3d = st.radio(
+            "Exibição:", MODOS_DISPERSAO, index=0 if len(df_avancado) <= ORCAMENTO_PONTOS else 1,
+            horizontal=True, key="modo_3d"
         )
+        if modo_3d == "Pontos":
+            # Amostra estratificada por estágio, como no gráfico de cigarros vs idade
+            posicoes_3d = amostrar_pontos(
+                versao, chave_filtros(filtros_avancados), ORCAMENTO_PONTOS,
+                ('Estagio_Cancer_Pulmao',), ('Idade', 'IMC', 'Anos_Fumando', 'Cigarros_Por_Dia'), df_avancado
+            )
+            # O scatter_3d já é WebGL: aqui só entram as colunas desenhadas
+            fig_3d = px.scatter_3d(
+                dados_dispersao(df_avancado.iloc[posicoes_3d],
+                                ['Idade', 'IMC', 'Anos_Fumando', 'Estagio_Cancer_Pulmao', 'Cigarros_Por_Dia', 'Genero', 'Regiao']),
+                x='Idade',
+                y='IMC',
+                z='Anos_Fumando',
+                color='Estagio_Cancer_Pulmao',
+                size='Cigarros_Por_Dia',
+                hover_data=['Genero', 'Regiao'],
+                title=titulo_amostra("Análise 3D: Idade vs IMC vs Anos Fumando", len(posicoes_3d), len(df_avancado)),
+                color_discrete_sequence=['#74B9FF', '#A29BFE', '#FD79A8', '#FDCB6E', '#00B894']
+            )
+        else:
+            # Uma bolha por célula ocupada da grade Idade × IMC × Anos Fumando, com tamanho pelo número de pacientes
+            densidade_3d = densidade_por_faixas(df_avancado, ['Idade', 'IMC', 'Anos_Fumando'], 'Tem_Cancer', 15)
+            por_taxa = modo_3d == "Densidade (taxa de câncer)"
+            fig_3d = px.scatter_3d(
+                densidade_3d,
+                x='Idade',
+                y='IMC',
+                z='Anos_Fumando',
+                color='Taxa' if por_taxa else 'Contagem',
+                size='Contagem',
+                hover_data=['Casos', 'Taxa'],
+                labels={'Contagem': 'Pacientes', 'Taxa': 'Taxa de Câncer (%)'},
+                title="Análise 3D: Idade vs IMC vs Anos Fumando",
+                color_continuous_scale='Reds' if por_taxa else 'Blues'
+            )
         fig_3d.update_layout(height=600)
         st.plotly_chart(fig_3d, use_container_width=True)
     
@@ -830,13 +1061,14 @@ elif pagina == "🔍 Análise Detalhada":
     
     if comparar_por and metrica_comparar:
         # Criar violin plot de comparação
-        fig_comparar = px.violin(
+        fig_comparar = grafico_distribuicao(
             df_avancado,
-            x=comparar_por,
-            y=metrica_comparar,
+            comparar_por,
+            metrica_comparar,
+            'violin',
+            titulo=f"Comparação de {metrica_comparar.replace('_', ' ')} por {comparar_por.replace('_', ' ')}",
             box=True,
-            title=f"Comparação de {metrica_comparar.replace('_', ' ')} por {comparar_por.replace('_', ' ')}",
-            color=comparar_por
+            category_orders=ORDEM_CATEGORIAS
         )
         fig_comparar.update_layout(height=400, xaxis_tickangle=45)
         st.plotly_chart(fig_comparar, use_container_width=True)
@@ -844,80 +1076,10 @@ elif pagina == "🔍 Análise Detalhada":
     # Ranking de fatores de risco
     st.subheader("🏆 Ranking de Fatores de Risco")
     
-    # Calcular correlação com ocorrência de câncer
-    cancer_binario = (df_avancado['Estagio_Cancer_Pulmao'] != 'Sem Câncer').astype(int)
-    
-    # Começar com colunas numéricas básicas
-    colunas_numericas_basicas = []
-    for col in ['Idade', 'Anos_Fumando', 'Cigarros_Por_Dia', 'IMC']:
-        if col in df_avancado.columns and pd.api.types.is_numeric_dtype(df_avancado[col]):
-            colunas_numericas_basicas.append(col)
-    
-    # Tratar colunas categóricas que deveriam ser numéricas
-    mapeamentos_categoricos = {
-        'Nivel_Poluicao_Ar': {'Baixo': 1, 'Moderado': 2, 'Alto': 3},
-        'Nivel_Atividade_Fisica': {'Baixo': 1, 'Moderado': 2, 'Alto': 3},
-        'Qualidade_Dieta': {'Ruim': 1, 'Média': 2, 'Boa': 3}
-    }
-    
-    # Criar DataFrame de trabalho para correlações
-    df_trabalho_corr = df_avancado[colunas_numericas_basicas].copy()
-    
-    # Adicionar colunas categóricas convertidas
-    for col, mapeamento in mapeamentos_categoricos.items():
-        if col in df_avancado.columns:
-            try:
-                col_convertida = df_avancado[col].map(mapeamento)
-                if not col_convertida.isna().all():
-                    df_trabalho_corr[col] = col_convertida
-            except Exception:
-                continue
-    
-    # Calcular correlações com tratamento robusto de erro
-    correlacoes = []
-    for col in df_trabalho_corr.columns:
-        try:
-            # Verificar se a coluna tem dados válidos suficientes
-            dados_col_validos = df_trabalho_corr[col].dropna()
-            if len(dados_col_validos) < 2:
-                continue
-                
-            # Verificar se a coluna tem variância (não todos os mesmos valores)
-            if dados_col_validos.nunique() < 2:
-                continue
-                
-            # Criar dataset válido para correlação
-            dados_col = df_trabalho_corr[col].reset_index(drop=True)
-            dados_cancer = pd.Series(cancer_binario).reset_index(drop=True)
-            
-            # Garantir mesmo comprimento
-            comprimento_min = min(len(dados_col), len(dados_cancer))
-            dados_col = dados_col[:comprimento_min]
-            dados_cancer = dados_cancer[:comprimento_min]
-            
-            # Remover valores NaN
-            indices_validos = pd.notna(dados_col) & pd.notna(dados_cancer)
-            col_limpa = dados_col[indices_validos]
-            cancer_limpo = dados_cancer[indices_validos]
-            
-            # Verificações finais antes da correlação
-            if len(col_limpa) > 1 and col_limpa.nunique() > 1 and cancer_limpo.nunique() > 1:
-                # Suprimir warnings para este cálculo específico
-                with pd.option_context('mode.use_inf_as_na', True):
-                    corr = col_limpa.corr(cancer_limpo)
-                    
-                if pd.notna(corr) and abs(corr) > 1e-10:  # Evitar correlações muito pequenas
-                    nome_fator = col.replace('_', ' ')
-                    correlacoes.append({'Fator': nome_fator, 'Correlacao': abs(corr)})
-                    
-        except (ValueError, ZeroDivisionError, RuntimeWarning):
-            continue
-        except Exception:
-            continue
+    # Correlações de todos os fatores com o indicador de câncer, calculadas uma vez por estado dos filtros
+    df_resultado_corr = calcular_ranking_correlacoes(versao, chave_filtros(filtros_avancados), df_avancado)
     
-    if correlacoes:
-        df_resultado_corr = pd.DataFrame(correlacoes).sort_values('Correlacao', ascending=True)
-        
+    if len(df_resultado_corr) > 0:
         fig_ranking = px.bar(
             df_resultado_corr,
             x='Correlacao',
@@ -951,11 +1113,9 @@ elif pagina == "🔍 Análise Detalhada":
         # Estatísticas de câncer por grupo
         if comparar_por in df_avancado.columns:
             try:
-                cancer_por_grupo = df_avancado.groupby(comparar_por).agg({
-                    'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100,
-                    'Idade': 'mean',
-                    'IMC': 'mean'
-                }).round(2)
+                cancer_por_grupo = taxa_por(df_avancado, comparar_por, 'Tem_Cancer')[[comparar_por, 'Taxa']].merge(
+                    media_por(df_avancado, comparar_por, ['Idade', 'IMC']), on=comparar_por
+                ).set_index(comparar_por).round(2)
                 cancer_por_grupo.columns = ['Taxa de Câncer (%)', 'Idade Média', 'IMC Médio']
                 st.dataframe(cancer_por_grupo)
             except Exception as e:
@@ -0,0 +1,489 @@
+"""
+Cache colunar (Parquet/Feather) para os datasets CSV do dashboard.
+
+Na primeira leitura o CSV é convertido para um arquivo colunar comprimido em
+``.cache_dados/``; as leituras seguintes usam esse arquivo, que é reconstruído
+automaticamente sempre que o CSV de origem muda. A versão do CSV é identificada
+pelo caminho, tamanho, data de modificação e, opcionalmente, por um hash do
+conteúdo. Quando o CSV apenas recebeu novas linhas no final, só essas linhas são
+lidas e anexadas ao arquivo colunar (com hash, o início do CSV é conferido por
+inteiro; sem hash, apenas os últimos 64 KB da versão anterior).
+
+CSVs grandes podem ser ingeridos em blocos (``ingerir_csv_em_blocos``): cada
+bloco é convertido e anexado ao arquivo colunar, então o pico de memória da
+ingestão depende do tamanho do bloco e não do tamanho do arquivo. Qualquer
+sequência de blocos pode ser gravada assim com ``gravar_blocos_colunar``.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIVEL = True
+except ImportError:
+    PYARROW_DISPONIVEL = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+DIRETORIO_CACHE = '.cache_dados'
+FORMATOS_SUPORTADOS = ('parquet', 'feather')
+COMPRESSAO_PADRAO = 'zstd'
+TAMANHO_BLOCO_PADRAO = 250_000
+# Bytes finais do CSV conferidos para decidir se ele apenas cresceu
+TAMANHO_VERIFICACAO_CAUDA = 64 * 1024
+
+
+def caminho_cache(caminho_csv, formato='parquet'):
+    """Retorna o caminho do arquivo colunar correspondente a um CSV"""
+    diretorio = os.path.join(os.path.dirname(os.path.abspath(caminho_csv)), DIRETORIO_CACHE)
+    nome_base = os.path.splitext(os.path.basename(caminho_csv))[0]
+    return os.path.join(diretorio, f"{nome_base}.{formato}")
+
+
+def _hash_inicio(caminho, tamanho):
+    """Hash dos primeiros ``tamanho`` bytes do arquivo (igual ao hash do arquivo inteiro se ele tiver esse tamanho)"""
+    hash_conteudo = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as arquivo:
+        restante = tamanho
+        while restante > 0:
+            bloco = arquivo.read(min(restante, 1 << 20))
+            if not bloco:
+                break
+            hash_conteudo.update(bloco)
+            restante -= len(bloco)
+    return hash_conteudo.hexdigest()
+
+
+@functools.lru_cache(maxsize=32)
+def _hash_arquivo(caminho, tamanho, mtime_ns, ctime_ns, inode):
+    # Os argumentos além do caminho e do tamanho só compõem a chave: qualquer escrita muda o ctime
+    return _hash_inicio(caminho, tamanho)
+
+
+def hash_conteudo(caminho):
+    """Hash do conteúdo do arquivo, recalculado apenas quando o arquivo é alterado"""
+    info = os.stat(caminho)
+    return _hash_arquivo(os.path.abspath(caminho), info.st_size, info.st_mtime_ns, info.st_ctime_ns, info.st_ino)
+
+
+def _hash_cauda(caminho, tamanho):
+    """Hash dos últimos bytes até ``tamanho`` (None se o trecho não terminar em quebra de linha)"""
+    inicio = max(0, tamanho - TAMANHO_VERIFICACAO_CAUDA)
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        dados = arquivo.read(tamanho - inicio)
+    if len(dados) != tamanho - inicio or not dados.endswith(b'\n'):
+        return None
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+def assinatura_fonte(caminho_csv, com_hash=False):
+    """Identifica a versão do CSV de origem pelo caminho, tamanho, data de modificação e hash opcional"""
+    info = os.stat(caminho_csv)
+    assinatura = {'caminho': os.path.abspath(caminho_csv), 'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns}
+    if com_hash:
+        assinatura['hash'] = hash_conteudo(caminho_csv)
+    return assinatura
+
+
+def mesma_fonte(registrada, atual):
+    """
+    Compara duas assinaturas. Com hash, a data de modificação é ignorada: uma
+    cópia idêntica do CSV (novo mtime, mesmo conteúdo) não força reconstrução.
+    """
+    if not registrada:
+        return False
+    campos = ('caminho', 'tamanho', 'hash') if 'hash' in atual else ('caminho', 'tamanho', 'mtime_ns')
+    return all(registrada.get(campo) == atual[campo] for campo in campos)
+
+
+@contextmanager
+def trava_arquivo(caminho):
+    """Trava exclusiva entre processos, para que só um deles reconstrua um arquivo compartilhado"""
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho + '.lock', 'a') as arquivo_trava:
+        if fcntl is not None:
+            fcntl.flock(arquivo_trava, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(arquivo_trava, fcntl.LOCK_UN)
+
+
+def _caminho_metadados(caminho_colunar):
+    return caminho_colunar + '.json'
+
+
+def _descrever_opcoes(opcoes_leitura, transformar=None):
+    # Opções de leitura diferentes (ex.: dtype) geram arquivos colunares diferentes
+    opcoes = dict(opcoes_leitura)
+    if transformar is not None:
+        opcoes['transformar'] = f"{transformar.__module__}.{transformar.__qualname__}"
+    return json.loads(json.dumps(opcoes, sort_keys=True, default=str))
+
+
+def ler_metadados(caminho_colunar):
+    """Lê os metadados gravados ao lado de um arquivo colunar (None se ausentes ou inválidos)"""
+    caminho_meta = _caminho_metadados(caminho_colunar)
+    if not (os.path.exists(caminho_colunar) and os.path.exists(caminho_meta)):
+        return None
+    try:
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def gravar_metadados(caminho_colunar, caminho_csv, assinatura=None, **extras):
+    """Registra de qual versão do CSV o arquivo colunar foi gerado"""
+    metadados = {'fonte': assinatura or assinatura_fonte(caminho_csv)}
+    metadados.update(extras)
+    caminho_temp = _caminho_metadados(caminho_colunar) + '.tmp'
+    with open(caminho_temp, 'w', encoding='utf-8') as arquivo:
+        json.dump(metadados, arquivo, default=str)
+    os.replace(caminho_temp, _caminho_metadados(caminho_colunar))
+
+
+def metadados_validos(caminho_colunar, caminho_csv, transformar=None, com_hash=False, **opcoes_leitura):
+    """Verifica se o arquivo colunar foi gerado a partir da versão atual do CSV e com as mesmas opções"""
+    metadados = ler_metadados(caminho_colunar)
+    if metadados is None:
+        return False
+    return (mesma_fonte(metadados.get('fonte'), assinatura_fonte(caminho_csv, com_hash))
+            and metadados.get('opcoes', {}) == _descrever_opcoes(opcoes_leitura, transformar))
+
+
+def cache_valido(caminho_csv, formato='parquet', transformar=None, com_hash=False, **opcoes_leitura):
+    """Verifica se o arquivo colunar existe e foi gerado a partir da versão atual do CSV"""
+    return metadados_validos(caminho_cache(caminho_csv, formato), caminho_csv, transformar, com_hash,
+                             **opcoes_leitura)
+
+
+def salvar_colunar(df, caminho_colunar, formato='parquet', compressao=COMPRESSAO_PADRAO, lote_unico=False):
+    """
+    Grava o DataFrame em formato colunar de forma atômica (arquivo temporário + rename).
+
+    Com ``lote_unico=True`` o Feather é gravado em um único record batch (o
+    padrão do pyarrow divide a cada 64k linhas): cada coluna fica contígua no
+    arquivo e pode ser mapeada sem cópia.
+    """
+    if formato not in FORMATOS_SUPORTADOS:
+        raise ValueError(f"Formato não suportado: {formato}. Use um de {FORMATOS_SUPORTADOS}.")
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_colunar)), exist_ok=True)
+    caminho_temp = caminho_colunar + '.tmp'
+    if formato == 'parquet':
+        df.to_parquet(caminho_temp, compression=compressao, index=False)
+    else:
+        opcoes = {'chunksize': max(len(df), 1)} if lote_unico else {}
+        df.reset_index(drop=True).to_feather(caminho_temp, compression=compressao, **opcoes)
+    os.replace(caminho_temp, caminho_colunar)
+
+
+def ler_colunar(caminho_colunar, formato='parquet', colunas=None):
+    """Lê um arquivo colunar, opcionalmente apenas as colunas pedidas"""
+    if formato == 'parquet':
+        return pd.read_parquet(caminho_colunar, columns=colunas)
+    return pd.read_feather(caminho_colunar, columns=colunas)
+
+
+def _esquema_do_bloco(tabela, tipos_fixos):
+    """Esquema do primeiro bloco, com os tipos fixos sobrepostos (vale para todos os blocos)"""
+    esquema = tabela.schema
+    for coluna, tipo in (tipos_fixos or {}).items():
+        indice = esquema.get_field_index(coluna)
+        if indice >= 0:
+            esquema = esquema.set(indice, pa.field(coluna, pa.from_numpy_dtype(np.dtype(tipo))))
+    return esquema
+
+
+def _unificar_dicionarios(bloco, dicionarios):
+    """
+    Põe as colunas categóricas do bloco sobre as categorias acumuladas dos blocos anteriores.
+
+    ``aplicar_esquema`` acrescenta ao fim os valores fora do esquema de cada
+    bloco, então blocos diferentes podem ter categorias diferentes. O arquivo
+    Feather (IPC) só aceita um dicionário por coluna, que pode ser estendido
+    no fim (dicionário delta): cada valor novo entra depois dos já vistos.
+    ``dicionarios`` (coluna -> categorias) é atualizado no lugar.
+    """
+    alteradas = {}
+    for coluna in bloco.columns:
+        serie = bloco[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        categorias = list(serie.cat.categories)
+        acumuladas = dicionarios.setdefault(coluna, categorias)
+        if categorias == acumuladas:
+            continue
+        vistas = set(acumuladas)
+        acumuladas.extend(valor for valor in categorias if valor not in vistas)
+        alteradas[coluna] = serie.cat.set_categories(acumuladas)
+    return bloco.assign(**alteradas) if alteradas else bloco
+
+
+def _lotes_existentes(caminho_colunar, formato, tamanho_bloco):
+    """Esquema e lotes de um arquivo colunar já gravado, lidos aos poucos"""
+    if formato == 'parquet':
+        arquivo = pq.ParquetFile(caminho_colunar)
+        return arquivo.schema_arrow, arquivo.iter_batches(batch_size=tamanho_bloco)
+    leitor = pa.ipc.open_file(pa.memory_map(caminho_colunar, 'r'))
+    return leitor.schema, (leitor.get_batch(i) for i in range(leitor.num_record_batches))
+
+
+@contextmanager
+def _ler_csv_em_blocos(caminho_csv, tamanho_bloco, deslocamento=0, colunas=None, **opcoes_leitura):
+    """Leitor em blocos do CSV, opcionalmente a partir de um byte (sem cabeçalho)"""
+    if not deslocamento:
+        with pd.read_csv(caminho_csv, chunksize=tamanho_bloco, **opcoes_leitura) as leitor:
+            yield leitor
+        return
+    with open(caminho_csv, 'rb') as arquivo:
+        arquivo.seek(deslocamento)
+        with pd.read_csv(arquivo, chunksize=tamanho_bloco, header=None, names=colunas, **opcoes_leitura) as leitor:
+            yield leitor
+
+
+def gravar_blocos_colunar(blocos, caminho_saida, formato='parquet', compressao=COMPRESSAO_PADRAO,
+                          tipos_fixos=None, anexar_a=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Grava uma sequência de DataFrames (blocos) em um único arquivo colunar, de forma atômica.
+
+    O primeiro bloco define o esquema (ou ``anexar_a``, um arquivo colunar já
+    existente copiado antes dos blocos); os demais precisam ser compatíveis.
+    Colunas categóricas podem ganhar valores novos de um bloco para outro (no
+    Feather, eles são acrescentados ao fim do dicionário da coluna).
+    ``tipos_fixos`` força tipos numéricos (ex.: int8) em todos os blocos; um
+    valor que não caiba no tipo, ou um bloco incompatível, gera ``ValueError``.
+    Retorna o número de linhas dos blocos gravados.
+    """
+    if formato not in FORMATOS_SUPORTADOS:
+        raise ValueError(f"Formato não suportado: {formato}. Use um de {FORMATOS_SUPORTADOS}.")
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_saida)), exist_ok=True)
+    caminho_temp = caminho_saida + '.tmp'
+    escritor = None
+    esquema = None
+    total_linhas = 0
+    # Categorias acumuladas de cada coluna categórica (só o Feather precisa de um dicionário único)
+    dicionarios = {} if formato == 'feather' else None
+
+    def abrir_escritor():
+        if formato == 'parquet':
+            return pq.ParquetWriter(caminho_temp, esquema, compression=compressao)
+        opcoes_ipc = pa.ipc.IpcWriteOptions(compression=None if compressao == 'uncompressed' else compressao,
+                                            emit_dictionary_deltas=True)
+        return pa.ipc.new_file(caminho_temp, esquema, options=opcoes_ipc)
+
+    try:
+        if anexar_a is not None:
+            esquema, lotes = _lotes_existentes(anexar_a, formato, tamanho_bloco)
+            escritor = abrir_escritor()
+            lote = None
+            for lote in lotes:
+                escritor.write_batch(lote)
+            if dicionarios is not None and lote is not None:
+                # O último lote tem o dicionário completo de cada coluna
+                for indice, campo in enumerate(esquema):
+                    if pa.types.is_dictionary(campo.type):
+                        dicionarios[campo.name] = lote.column(indice).dictionary.to_pylist()
+
+        for bloco in blocos:
+            try:
+                if dicionarios is not None:
+                    bloco = _unificar_dicionarios(bloco, dicionarios)
+                tabela = pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False)
+                if esquema is None:
+                    esquema = _esquema_do_bloco(tabela, tipos_fixos)
+                    tabela = tabela.cast(esquema)
+                if escritor is None:
+                    escritor = abrir_escritor()
+                escritor.write_table(tabela)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(f"Bloco a partir da linha {total_linhas} incompatível com o esquema: {e}") from e
+            total_linhas += len(bloco)
+    except Exception:
+        if escritor is not None:
+            escritor.close()
+            escritor = None
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    if escritor is None:
+        raise ValueError(f"Nenhum bloco para gravar em {caminho_saida}")
+    os.replace(caminho_temp, caminho_saida)
+    return total_linhas
+
+
+def ingerir_csv_em_blocos(caminho_csv, caminho_saida, formato='parquet', transformar=None,
+                          tamanho_bloco=TAMANHO_BLOCO_PADRAO, compressao=COMPRESSAO_PADRAO,
+                          tipos_fixos=None, anexar_a=None, deslocamento=0, **opcoes_leitura):
+    """
+    Converte um CSV para formato colunar lendo no máximo ``tamanho_bloco`` linhas por vez.
+
+    ``transformar`` é aplicado a cada bloco (tradução, esquema categórico...) e
+    deve produzir as mesmas colunas e tipos em todos os blocos; valores
+    categóricos fora do esquema podem variar entre blocos. ``tipos_fixos`` força tipos numéricos (ex.: int8) em todos os
+    blocos; um valor que não caiba no tipo gera ``ValueError``.
+
+    Para ingestão incremental, ``anexar_a`` é um arquivo colunar já existente,
+    copiado primeiro (e que define o esquema), e ``deslocamento`` o byte do CSV
+    a partir do qual estão as linhas novas. Retorna o número de linhas novas.
+    """
+    if formato not in FORMATOS_SUPORTADOS:
+        raise ValueError(f"Formato não suportado: {formato}. Use um de {FORMATOS_SUPORTADOS}.")
+
+    colunas = None
+    if anexar_a is not None:
+        colunas = _lotes_existentes(anexar_a, formato, tamanho_bloco)[0].names
+
+    with _ler_csv_em_blocos(caminho_csv, tamanho_bloco, deslocamento, colunas, **opcoes_leitura) as leitor:
+        blocos = leitor if transformar is None else (transformar(bloco) for bloco in leitor)
+        return gravar_blocos_colunar(blocos, caminho_saida, formato, compressao, tipos_fixos, anexar_a,
+                                     tamanho_bloco)
+
+
+def _gravar_metadados_cache(caminho_colunar, caminho_csv, assinatura, formato, compressao, transformar,
+                            opcoes_leitura):
+    # A cauda só é registrada se o CSV não mudou durante a leitura; sem ela não há anexação incremental
+    cauda = None
+    if assinatura_fonte(caminho_csv)['tamanho'] == assinatura['tamanho']:
+        cauda = _hash_cauda(caminho_csv, assinatura['tamanho'])
+    gravar_metadados(caminho_colunar, caminho_csv, assinatura, formato=formato, compressao=compressao,
+                     opcoes=_descrever_opcoes(opcoes_leitura, transformar), cauda=cauda)
+
+
+def _pode_anexar(metadados, caminho_csv, transformar, opcoes_leitura):
+    """
+    O CSV atual é o anterior com linhas novas no final?
+
+    Com hash registrado (``com_hash=True``), o início do CSV até o tamanho
+    anterior precisa ter o mesmo hash da versão ingerida. Sem hash, só os
+    últimos ``TAMANHO_VERIFICACAO_CAUDA`` bytes da versão anterior são
+    conferidos: uma edição antes desse trecho não é detectada.
+    """
+    if not metadados or not metadados.get('cauda'):
+        return False
+    registrada = metadados.get('fonte') or {}
+    atual = assinatura_fonte(caminho_csv)
+    tamanho_anterior = registrada.get('tamanho', 0)
+    if not (registrada.get('caminho') == atual['caminho']
+            and atual['tamanho'] > tamanho_anterior
+            and metadados.get('opcoes', {}) == _descrever_opcoes(opcoes_leitura, transformar)
+            and _hash_cauda(caminho_csv, tamanho_anterior) == metadados['cauda']):
+        return False
+    return 'hash' not in registrada or _hash_inicio(caminho_csv, tamanho_anterior) == registrada['hash']
+
+
+def anexar_ao_cache(caminho_csv, formato='parquet', compressao=COMPRESSAO_PADRAO, transformar=None,
+                    tamanho_bloco=None, com_hash=False, **opcoes_leitura):
+    """Lê apenas as linhas acrescentadas ao CSV desde a última ingestão e as anexa ao arquivo colunar"""
+    caminho_colunar = caminho_cache(caminho_csv, formato)
+    metadados = ler_metadados(caminho_colunar)
+    assinatura = assinatura_fonte(caminho_csv, com_hash)
+    ingerir_csv_em_blocos(caminho_csv, caminho_colunar, formato, transformar, tamanho_bloco or TAMANHO_BLOCO_PADRAO,
+                          compressao, anexar_a=caminho_colunar, deslocamento=metadados['fonte']['tamanho'],
+                          **opcoes_leitura)
+    _gravar_metadados_cache(caminho_colunar, caminho_csv, assinatura, formato, compressao, transformar,
+                            opcoes_leitura)
+    return ler_colunar(caminho_colunar, formato)
+
+
+def construir_cache(caminho_csv, formato='parquet', compressao=COMPRESSAO_PADRAO, transformar=None,
+                    tamanho_bloco=None, com_hash=False, **opcoes_leitura):
+    """
+    Lê o CSV e (re)gera o arquivo colunar e seus metadados.
+
+    Com ``tamanho_bloco`` a ingestão é feita em blocos e o resultado é lido de
+    volta do arquivo colunar.
+    """
+    assinatura = assinatura_fonte(caminho_csv, com_hash)
+    caminho_colunar = caminho_cache(caminho_csv, formato)
+
+    if tamanho_bloco:
+        ingerir_csv_em_blocos(caminho_csv, caminho_colunar, formato, transformar, tamanho_bloco, compressao,
+                              **opcoes_leitura)
+        df = ler_colunar(caminho_colunar, formato)
+    else:
+        df = pd.read_csv(caminho_csv, **opcoes_leitura)
+        if transformar is not None:
+            df = transformar(df)
+        salvar_colunar(df, caminho_colunar, formato, compressao)
+
+    _gravar_metadados_cache(caminho_colunar, caminho_csv, assinatura, formato, compressao, transformar,
+                            opcoes_leitura)
+    return df
+
+
+def carregar_com_cache(caminho_csv, formato='parquet', compressao=COMPRESSAO_PADRAO, transformar=None,
+                       tamanho_bloco=None, com_hash=False, **opcoes_leitura):
+    """
+    Carrega um CSV usando o cache colunar quando ele estiver atualizado.
+
+    Se o CSV só ganhou linhas no final, apenas elas são lidas e anexadas. A
+    reconstrução é feita sob uma trava de arquivo, então vários processos que
+    percebem a mudança ao mesmo tempo não refazem o mesmo trabalho.
+
+    Sem pyarrow, ou se o diretório de cache não puder ser gravado, cai para
+    ``pd.read_csv`` direto para que o dashboard continue funcionando.
+    """
+    if not os.path.exists(caminho_csv):
+        raise FileNotFoundError(caminho_csv)
+
+    def ler_csv_direto():
+        df = pd.read_csv(caminho_csv, **opcoes_leitura)
+        return df if transformar is None else transformar(df)
+
+    if not PYARROW_DISPONIVEL:
+        return ler_csv_direto()
+
+    caminho_colunar = caminho_cache(caminho_csv, formato)
+
+    def ler_cache_valido():
+        if cache_valido(caminho_csv, formato, transformar, com_hash, **opcoes_leitura):
+            try:
+                return ler_colunar(caminho_colunar, formato)
+            except Exception:
+                # Arquivo corrompido ou incompatível: reconstruir a partir do CSV
+                pass
+        return None
+
+    df = ler_cache_valido()
+    if df is not None:
+        return df
+
+    try:
+        with trava_arquivo(caminho_colunar):
+            # Outro processo pode ter atualizado o cache enquanto esperávamos a trava
+            df = ler_cache_valido()
+            if df is not None:
+                return df
+
+            if _pode_anexar(ler_metadados(caminho_colunar), caminho_csv, transformar, opcoes_leitura):
+                try:
+                    return anexar_ao_cache(caminho_csv, formato, compressao, transformar, tamanho_bloco, com_hash,
+                                           **opcoes_leitura)
+                except (ValueError, pa.ArrowException):
+                    # Linhas novas incompatíveis com o esquema gravado: reconstrução completa
+                    pass
+
+            return construir_cache(caminho_csv, formato, compressao, transformar, tamanho_bloco, com_hash,
+                                   **opcoes_leitura)
+    except OSError:
+        return ler_csv_direto()
@@ -0,0 +1,223 @@
+"""
+Benchmark headless do dashboard: tempo, pico de memória e tamanho da saída por rerun.
+
+O ``app.py`` é executado com ``streamlit.testing.v1.AppTest`` (sem navegador)
+para cada combinação de página × filtros da barra lateral × tamanho do
+dataset. Para cada combinação:
+
+- um primeiro run aquece os caches (carga do dataset);
+- ``repeticoes`` reruns medem o tempo de parede;
+- um rerun extra, sob ``tracemalloc``, mede o pico de memória alocada durante
+  o rerun (separado para não inflar os tempos);
+- o tamanho da saída é a soma dos protobufs de todos os elementos
+  renderizados (o que o servidor envia ao navegador).
+
+Os resultados são gravados em JSON, com os metadados do ambiente, e dois
+arquivos podem ser comparados com ``--comparar``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from gerar_dataset_sintetico import TAMANHOS, caminho_sintetico, gerar_dataset
+
+CAMINHO_APP = 'app.py'
+CAMINHO_FONTE = 'Lung_Cancer_Trends_Realistic.csv'
+ARQUIVO_RESULTADOS = 'resultados_benchmark.json'
+TEMPO_LIMITE = 600
+
+PAGINAS = [
+    "🏠 Visão Geral",
+    "🚬 Análise de Tabagismo",
+    "👥 Demografia",
+    "🏥 Análise Médica",
+    "📈 Tendências Temporais",
+    "🔍 Análise Detalhada",
+]
+
+# Nome da combinação: {rótulo do widget da barra lateral: valor}
+COMBINACOES_FILTROS = {
+    'sem_filtros': {},
+    'faixa_etaria': {'Faixa Etária': (40, 60)},
+    'genero': {'Gênero': 'Feminino'},
+    'combinados': {
+        'Faixa Etária': (40, 60),
+        'Gênero': 'Masculino',
+        'Região': 'Norte',
+        'Status de Tabagismo': 'Atual',
+    },
+}
+
+TAMANHOS_PADRAO = ['fonte', '100k']
+
+
+def preparar_dataset(rotulo, formato='parquet'):
+    """Caminho do dataset de um tamanho; os sintéticos são gerados na primeira vez"""
+    if rotulo == 'fonte':
+        return CAMINHO_FONTE
+    caminho = caminho_sintetico(rotulo, formato)
+    if not os.path.exists(caminho):
+        print(f"🔄 Gerando dataset sintético de {rotulo} linhas...")
+        gerar_dataset(TAMANHOS[rotulo], caminho, formato)
+    return caminho
+
+
+def _widget_barra_lateral(app, rotulo):
+    for widget in list(app.sidebar.selectbox) + list(app.sidebar.slider):
+        if widget.label == rotulo:
+            return widget
+    raise KeyError(f"Widget não encontrado na barra lateral: {rotulo}")
+
+
+def tamanho_saida(app):
+    """Bytes dos protobufs de todos os elementos e blocos renderizados, e o número de elementos"""
+    total_bytes, elementos = 0, 0
+    pendentes = [app._tree]
+    while pendentes:
+        no = pendentes.pop()
+        proto = getattr(no, 'proto', None)
+        if proto is not None and hasattr(proto, 'ByteSize'):
+            total_bytes += proto.ByteSize()
+            elementos += 1
+        filhos = getattr(no, 'children', None) or {}
+        pendentes.extend(filhos.values() if isinstance(filhos, dict) else filhos)
+    return total_bytes, elementos
+
+
+def medir_combinacao(pagina, filtros, repeticoes=3, caminho_app=CAMINHO_APP):
+    """Mede os reruns de uma página com um conjunto de filtros (o dataset vem de DASHBOARD_DATASET)"""
+    app = AppTest.from_file(caminho_app, default_timeout=TEMPO_LIMITE)
+    app.run()
+    _widget_barra_lateral(app, "Selecione uma página:").set_value(pagina)
+    for rotulo, valor in filtros.items():
+        _widget_barra_lateral(app, rotulo).set_value(valor)
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        app.run()
+        pico_memoria = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    payload, elementos = tamanho_saida(app)
+    return {
+        'tempos_s': tempos,
+        'tempo_mediano_s': statistics.median(tempos) if tempos else None,
+        'pico_memoria_bytes': pico_memoria,
+        'payload_bytes': payload,
+        'elementos': elementos,
+        'graficos': len(app.get('plotly_chart')),
+        'excecoes': [excecao.message for excecao in app.exception],
+    }
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_benchmark(tamanhos=None, paginas=None, combinacoes=None, repeticoes=3, formato='parquet'):
+    """Executa a matriz tamanho × página × filtros e retorna os resultados (metadados + medições)"""
+    tamanhos = TAMANHOS_PADRAO if tamanhos is None else tamanhos
+    paginas = PAGINAS if paginas is None else paginas
+    combinacoes = list(COMBINACOES_FILTROS) if combinacoes is None else combinacoes
+
+    medicoes = []
+    dataset_anterior = os.environ.get('DASHBOARD_DATASET')
+    try:
+        for rotulo in tamanhos:
+            caminho = preparar_dataset(rotulo, formato)
+            os.environ['DASHBOARD_DATASET'] = caminho
+            for pagina in paginas:
+                for nome_filtros in combinacoes:
+                    resultado = medir_combinacao(pagina, COMBINACOES_FILTROS[nome_filtros], repeticoes)
+                    medicoes.append({'tamanho': rotulo, 'dataset': caminho, 'pagina': pagina,
+                                     'filtros': nome_filtros, **resultado})
+                    print(f"   {rotulo:>5} | {pagina:<24} | {nome_filtros:<12} | "
+                          f"{resultado['tempo_mediano_s']:.3f} s | {resultado['pico_memoria_bytes'] / 1024 ** 2:.1f} MB | "
+                          f"{resultado['payload_bytes'] / 1024:.0f} KB")
+    finally:
+        if dataset_anterior is None:
+            os.environ.pop('DASHBOARD_DATASET', None)
+        else:
+            os.environ['DASHBOARD_DATASET'] = dataset_anterior
+
+    return {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit_atual(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'repeticoes': repeticoes,
+            'formato': formato,
+        },
+        'medicoes': medicoes,
+    }
+
+
+def salvar_resultados(resultados, caminho=ARQUIVO_RESULTADOS):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+
+
+def carregar_resultados(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def comparar_resultados(anteriores, atuais):
+    """Tabela com as métricas de duas execuções lado a lado e a razão atual/anterior"""
+    chave = ['tamanho', 'pagina', 'filtros']
+    metricas = ['tempo_mediano_s', 'pico_memoria_bytes', 'payload_bytes']
+    antes = pd.DataFrame(anteriores['medicoes'])[chave + metricas]
+    depois = pd.DataFrame(atuais['medicoes'])[chave + metricas]
+    tabela = antes.merge(depois, on=chave, suffixes=('_antes', '_depois'))
+    for metrica in metricas:
+        tabela[f'{metrica}_razao'] = tabela[f'{metrica}_depois'] / tabela[f'{metrica}_antes']
+    return tabela
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark headless das páginas do dashboard")
+    parser.add_argument('--tamanhos', nargs='+', choices=['fonte', *TAMANHOS], default=TAMANHOS_PADRAO,
+                        help="Tamanhos do dataset ('fonte' é o CSV original; padrão: fonte 100k)")
+    parser.add_argument('--paginas', nargs='+', choices=PAGINAS, default=PAGINAS, help="Páginas a medir")
+    parser.add_argument('--filtros', nargs='+', choices=list(COMBINACOES_FILTROS), default=list(COMBINACOES_FILTROS),
+                        help="Combinações de filtros a medir")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Reruns cronometrados por combinação")
+    parser.add_argument('--formato', choices=['csv', 'parquet', 'feather'], default='parquet',
+                        help="Formato dos datasets sintéticos")
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADOS, help="Arquivo JSON de resultados")
+    parser.add_argument('--comparar', default=None, help="Resultados anteriores (JSON) para comparar")
+    args = parser.parse_args()
+
+    print("⏱️ Benchmark das páginas do dashboard")
+    resultados_atuais = executar_benchmark(args.tamanhos, args.paginas, args.filtros, args.repeticoes, args.formato)
+    salvar_resultados(resultados_atuais, args.saida)
+    print(f"✅ Resultados salvos em '{args.saida}'")
+
+    if args.comparar:
+        comparacao = comparar_resultados(carregar_resultados(args.comparar), resultados_atuais)
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(comparacao[['tamanho', 'pagina', 'filtros', 'tempo_mediano_s_razao', 'pico_memoria_bytes_razao',
+                              'payload_bytes_razao']].round(2).to_string(index=False))
@@ -0,0 +1,33 @@
+"""
+Colunas derivadas calculadas uma vez na carga do dataset.
+
+As páginas não criam colunas em ``df_filtrado`` a cada rerun: as categorias
+de IMC ficam em um DataFrame à parte, alinhado por posição ao dataset e
+coletado com as mesmas posições dos filtros (``motor_filtros.coletar``). Os
+grupos etários (décadas, quartis, faixas) dependem só das idades distintas,
+então são calculados sobre as idades do cubo de contagens, nunca por
+paciente (ver ``discretizacao.py``).
+"""
+
+import numpy as np
+import pandas as pd
+
+from discretizacao import classificar
+
+# Limites inferiores de cada categoria de IMC (a última vai até o infinito)
+LIMITES_IMC = [18.5, 25, 30]
+CATEGORIAS_IMC = ['Abaixo do peso', 'Peso normal', 'Sobrepeso', 'Obesidade']
+
+
+def categorias_imc(imc):
+    """Categoria de IMC de cada valor (vetorizado): < 18,5, < 25, < 30 e o restante"""
+    valores = np.asarray(imc)
+    # Comparações no tipo da coluna (IMC é float32 no modo compacto)
+    limites = np.asarray(LIMITES_IMC, dtype=valores.dtype if np.issubdtype(valores.dtype, np.floating) else float)
+    # NaN cai na última categoria, como no if/elif original
+    return classificar(valores, limites, CATEGORIAS_IMC)
+
+
+def construir_colunas_derivadas(df):
+    """DataFrame com as colunas derivadas, na mesma ordem de linhas de ``df``"""
+    return pd.DataFrame({'Categoria_IMC': categorias_imc(df['IMC'])}, index=df.index)
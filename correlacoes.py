@@ -0,0 +1,94 @@
+"""
+Correlação de vários fatores com um indicador (ex.: ``Tem_Cancer``) em uma passada.
+
+Os fatores viram uma matriz ``linhas × fatores`` (colunas numéricas e
+categorias ordinais mapeadas para números) e todas as correlações de Pearson
+saem das mesmas somas mascaradas: para cada fator só entram as linhas em que
+ele não é ausente, como em ``Series.corr`` (pares completos). Fatores ou
+recortes sem variação ficam sem correlação, em vez de gerar NaN ou avisos.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def matriz_fatores(df, colunas_numericas, mapeamentos=None):
+    """
+    DataFrame float64 com os fatores da correlação.
+
+    ``colunas_numericas`` entram como estão (se existirem e forem numéricas);
+    cada coluna de ``mapeamentos`` é convertida pelo seu dicionário
+    ``{rótulo: valor}`` e descartada se nenhum rótulo for mapeado.
+    """
+    fatores = {}
+    for coluna in colunas_numericas:
+        if coluna in df.columns and pd.api.types.is_numeric_dtype(df[coluna]):
+            fatores[coluna] = df[coluna].to_numpy(dtype=np.float64)
+    for coluna, mapeamento in (mapeamentos or {}).items():
+        if coluna in df.columns:
+            convertida = df[coluna].map(mapeamento).to_numpy(dtype=np.float64, na_value=np.nan)
+            if not np.isnan(convertida).all():
+                fatores[coluna] = convertida
+    return pd.DataFrame(fatores, index=df.index)
+
+
+def correlacoes_com_indicador(fatores, indicador):
+    """
+    Correlação de Pearson de cada coluna de ``fatores`` com ``indicador``, ignorando ausentes por coluna.
+
+    NaN quando o fator tem menos de dois valores, ou quando o fator ou o
+    indicador não variam nas linhas em que o fator está presente.
+    """
+    x = fatores.to_numpy(dtype=np.float64, copy=True)
+    y = np.asarray(indicador, dtype=np.float64)
+    if x.shape[1] == 0:
+        return pd.Series(dtype=np.float64)
+
+    presentes = ~np.isnan(x)
+    quantidade = presentes.sum(axis=0)
+    completo = quantidade.min() == len(x)
+    # Sem variação (mínimo = máximo): arredondamentos deixariam uma variância residual, não zero
+    if completo:
+        # Sem ausentes (o caso comum): a máscara não entra nas contas
+        constante = (x.min(axis=0, initial=np.inf) == x.max(axis=0, initial=-np.inf)) | (
+            y.min(initial=np.inf) == y.max(initial=-np.inf))
+    else:
+        y_presente = np.broadcast_to(y[:, None], x.shape)
+        constante = ((np.min(x, axis=0, where=presentes, initial=np.inf)
+                      == np.max(x, axis=0, where=presentes, initial=-np.inf))
+                     | (np.min(y_presente, axis=0, where=presentes, initial=np.inf)
+                        == np.max(y_presente, axis=0, where=presentes, initial=-np.inf)))
+        x[~presentes] = 0.0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Somas centradas (estabilidade numérica); a correlação não muda com o deslocamento
+        x -= x.sum(axis=0) / quantidade
+        y = y - y.mean() if len(y) else y
+        if completo:
+            soma_y, soma_y2 = np.full(x.shape[1], y.sum()), np.full(x.shape[1], y @ y)
+        else:
+            # Ausentes voltam a zero depois da centralização e as somas de y só contam as linhas presentes
+            x[~presentes] = 0.0
+            pesos = presentes.astype(np.float64)
+            soma_y, soma_y2 = y @ pesos, (y * y) @ pesos
+        soma_x = x.sum(axis=0)
+        covariancia = y @ x - soma_x * soma_y / quantidade
+        variancia_x = np.einsum('ij,ij->j', x, x) - soma_x ** 2 / quantidade
+        variancia_y = soma_y2 - soma_y ** 2 / quantidade
+        correlacoes = covariancia / np.sqrt(variancia_x * variancia_y)
+    correlacoes[(quantidade < 2) | constante] = np.nan
+    return pd.Series(correlacoes, index=fatores.columns)
+
+
+def ranking_correlacoes(fatores, indicador, minimo=1e-10):
+    """
+    ``Fator`` (nome legível) e ``Correlacao`` (valor absoluto), do menor para o maior.
+
+    Correlações indefinidas ou menores que ``minimo`` ficam de fora.
+    """
+    absolutas = correlacoes_com_indicador(fatores, indicador).abs()
+    absolutas = absolutas[absolutas > minimo].sort_values(kind='stable')
+    return pd.DataFrame({
+        'Fator': [coluna.replace('_', ' ') for coluna in absolutas.index],
+        'Correlacao': absolutas.to_numpy(),
+    })
@@ -0,0 +1,119 @@
+"""
+Cubo OLAP de contagens para as métricas do dashboard.
+
+Quase todos os números de Visão Geral, Demografia e Tendências Temporais são
+contagens ou taxas sobre poucas dimensões de baixa cardinalidade (gênero,
+região, tabagismo, idade, ano, estágio e sobrevivência). O cubo guarda, para
+cada combinação dessas dimensões, o número de pacientes: é construído uma vez
+na carga, em blocos (``np.bincount`` sobre o índice linear das combinações), e
+as métricas saem de fatias e somas do cubo, com custo proporcional ao número
+de células e não ao de linhas.
+
+Categorias ausentes ganham uma posição própria no fim do eixo, com rótulo
+NaN, então as métricas tratam ausentes exatamente como as comparações do pandas sobre as linhas.
+As colunas numéricas inteiras (idade, ano) usam um eixo por valor, do mínimo
+ao máximo. Somas de uma dimensão numérica (ex.: idade média) saem dos rótulos
+do eixo ponderados pelas contagens. Taxas e médias por grupo sobre as
+contagens usam ``agregacoes.py`` com ``pesos='Contagem'``.
+"""
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES_CUBO = ['Genero', 'Regiao', 'Status_Tabagismo', 'Idade', 'Ano_Diagnostico', 'Estagio_Cancer_Pulmao',
+                  'Status_Sobrevivencia']
+TAMANHO_BLOCO_CUBO = 1_000_000
+
+
+def _eixo(serie):
+    """Rótulos do eixo e função que converte um trecho da coluna em posições no eixo"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        quantidade = len(serie.cat.categories)
+        codigos = list(range(quantidade)) + ([-1] if serie.hasnans else [])
+        rotulos = pd.Categorical.from_codes(codigos, dtype=serie.dtype)
+        # Ausentes (código -1) vão para a última posição do eixo
+        return rotulos, lambda trecho: np.where(trecho.cat.codes.to_numpy() < 0, quantidade,
+                                                 trecho.cat.codes.to_numpy())
+    if not np.issubdtype(serie.dtype, np.integer):
+        raise TypeError(f"A dimensão {serie.name} precisa ser categórica ou inteira")
+    minimo, maximo = int(serie.min()), int(serie.max())
+    rotulos = np.arange(minimo, maximo + 1, dtype=np.int64)
+    return rotulos, lambda trecho: trecho.to_numpy().astype(np.int64) - minimo
+
+
+def construir_cubo(df, dimensoes=None, tamanho_bloco=TAMANHO_BLOCO_CUBO):
+    """
+    Cubo ``{'dimensoes': [...], 'rotulos': {dimensão: rótulos}, 'contagens': ndarray}``.
+
+    ``contagens`` tem um eixo por dimensão, na ordem de ``dimensoes``; a
+    memória de trabalho é limitada a ``tamanho_bloco`` linhas por vez.
+    """
+    dimensoes = DIMENSOES_CUBO if dimensoes is None else dimensoes
+    rotulos, conversores = {}, []
+    for dimensao in dimensoes:
+        rotulos[dimensao], conversor = _eixo(df[dimensao])
+        conversores.append(conversor)
+    forma = tuple(len(rotulos[dimensao]) for dimensao in dimensoes)
+
+    contagens = np.zeros(int(np.prod(forma)), dtype=np.int64)
+    for inicio in range(0, len(df), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        posicoes = [conversor(bloco[dimensao]) for dimensao, conversor in zip(dimensoes, conversores)]
+        contagens += np.bincount(np.ravel_multi_index(posicoes, forma), minlength=len(contagens))
+    return {'dimensoes': list(dimensoes), 'rotulos': rotulos, 'contagens': contagens.reshape(forma)}
+
+
+def cubo_responde(cubo, especificacao):
+    """O cubo responde à especificação de filtros se todas as colunas filtradas são dimensões dele"""
+    colunas = set(especificacao['categorias']) | set(especificacao['faixas'])
+    return colunas <= set(cubo['dimensoes'])
+
+
+def fatiar_cubo(cubo, especificacao):
+    """Subcubo com as células que atendem à especificação de filtros (``motor_filtros.py``)"""
+    if not cubo_responde(cubo, especificacao):
+        raise KeyError("A especificação filtra colunas que não são dimensões do cubo")
+    rotulos = dict(cubo['rotulos'])
+    contagens = cubo['contagens']
+    selecoes = {}
+    for coluna, valores in especificacao['categorias'].items():
+        selecoes[coluna] = np.asarray(pd.Series(rotulos[coluna]).isin(valores))
+    for coluna, (minimo, maximo) in especificacao['faixas'].items():
+        valores = np.asarray(rotulos[coluna])
+        na_faixa = (valores >= minimo) & (valores <= maximo)
+        selecoes[coluna] = na_faixa if coluna not in selecoes else selecoes[coluna] & na_faixa
+    for coluna, selecao in selecoes.items():
+        eixo = cubo['dimensoes'].index(coluna)
+        posicoes = np.flatnonzero(selecao)
+        contagens = np.take(contagens, posicoes, axis=eixo)
+        rotulos[coluna] = rotulos[coluna][posicoes]
+    return {'dimensoes': cubo['dimensoes'], 'rotulos': rotulos, 'contagens': contagens}
+
+
+def total_cubo(cubo):
+    """Número de pacientes no (sub)cubo"""
+    return int(cubo['contagens'].sum())
+
+
+def contagens_por(cubo, dimensoes):
+    """
+    DataFrame com as ``dimensoes`` e a coluna ``Contagem``, só com as combinações presentes.
+
+    As colunas categóricas mantêm o tipo (e a ordem) do dataset; a linha de
+    ausentes tem rótulo NaN.
+    """
+    eixos_somados = tuple(i for i, dimensao in enumerate(cubo['dimensoes']) if dimensao not in dimensoes)
+    marginal = cubo['contagens'].sum(axis=eixos_somados)
+    ordem = sorted(dimensoes, key=cubo['dimensoes'].index)
+    marginal = np.transpose(marginal, [ordem.index(dimensao) for dimensao in dimensoes])
+
+    presentes = np.nonzero(marginal)
+    resultado = {dimensao: cubo['rotulos'][dimensao][posicoes] for dimensao, posicoes in zip(dimensoes, presentes)}
+    resultado['Contagem'] = marginal[presentes]
+    return pd.DataFrame(resultado)
+
+
+def media_dimensao(cubo, dimensao):
+    """Média de uma dimensão numérica (ex.: idade média) ponderada pelas contagens"""
+    contagens = contagens_por(cubo, [dimensao])
+    return (contagens[dimensao] * contagens['Contagem']).sum() / contagens['Contagem'].sum()
@@ -0,0 +1,99 @@
+"""
+Dataset compartilhado, somente leitura, entre sessões e processos do Streamlit.
+
+O DataFrame final (já com esquema categórico e tipos compactos) é publicado em
+``.cache_dados/`` como um arquivo Arrow IPC sem compressão, em um único record
+batch. Cada processo abre esse arquivo com ``pyarrow.memory_map``: as colunas
+numéricas viram views somente leitura sobre as páginas do arquivo, que o
+sistema operacional mantém em uma única cópia física para todos os processos
+do mesmo host. Dentro de um processo, ``st.cache_resource`` entrega o mesmo
+objeto a todas as sessões, sem a cópia (pickle) que ``st.cache_data`` faz a
+cada acesso.
+"""
+
+import os
+
+import pandas as pd
+
+from armazenamento_colunar import (PYARROW_DISPONIVEL, assinatura_fonte, caminho_cache, gravar_metadados,
+                                   ler_metadados, metadados_validos, salvar_colunar, trava_arquivo)
+
+if PYARROW_DISPONIVEL:
+    import pyarrow as pa
+
+FORMATO_COMPARTILHADO = 'arrow'
+# Incrementar quando o preparo do dataset publicado mudar (ex.: novas colunas calculadas na carga)
+VERSAO_PREPARO = 2
+VARIAVEL_AMBIENTE = 'DASHBOARD_DADOS_COMPARTILHADOS'
+
+
+def modo_compartilhado_ativo():
+    """O modo compartilhado é ligado pela variável de ambiente DASHBOARD_DADOS_COMPARTILHADOS=1"""
+    return PYARROW_DISPONIVEL and os.environ.get(VARIAVEL_AMBIENTE, '0').lower() in ('1', 'true', 'sim')
+
+
+def caminho_compartilhado(caminho_csv):
+    """Arquivo Arrow IPC publicado para um CSV"""
+    return caminho_cache(caminho_csv, FORMATO_COMPARTILHADO)
+
+
+def publicar_dataset(df, caminho_csv, relatorio=None, assinatura=None):
+    """
+    Grava o DataFrame pronto em Arrow IPC sem compressão e em um único record batch.
+
+    As duas condições são necessárias para mapear sem copiar: com vários
+    lotes, o ``to_pandas`` concatenaria cada coluna em memória própria do processo.
+    """
+    caminho_arrow = caminho_compartilhado(caminho_csv)
+    salvar_colunar(df, caminho_arrow, formato='feather', compressao='uncompressed', lote_unico=True)
+    registros = [] if relatorio is None else relatorio.to_dict('records')
+    gravar_metadados(caminho_arrow, caminho_csv, assinatura, formato=FORMATO_COMPARTILHADO, relatorio=registros,
+                     versao_preparo=VERSAO_PREPARO)
+    return caminho_arrow
+
+
+def publicado_valido(caminho_arrow, caminho_csv, com_hash=False):
+    """O arquivo publicado corresponde ao CSV atual e ao preparo desta versão do dashboard"""
+    return (metadados_validos(caminho_arrow, caminho_csv, com_hash=com_hash)
+            and ler_metadados(caminho_arrow).get('versao_preparo') == VERSAO_PREPARO)
+
+
+def abrir_dataset_mapeado(caminho_arrow):
+    """
+    Abre o arquivo Arrow IPC mapeado em memória e converte para pandas.
+
+    Ficam sobre o arquivo mapeado, sem cópia: as colunas numéricas, as colunas
+    de texto (``Patient_ID``, como strings Arrow) e os códigos das categóricas
+    sem valores ausentes. São materializados em cada processo: os códigos das
+    categóricas com ausentes (o pandas troca os nulos do Arrow por -1) e as
+    colunas booleanas (bits no Arrow, um byte por valor no NumPy).
+    """
+    fonte = pa.memory_map(caminho_arrow, 'r')
+    tabela = pa.ipc.open_file(fonte).read_all()
+    mapeamento_tipos = {pa.string(): pd.ArrowDtype(pa.string()), pa.large_string(): pd.ArrowDtype(pa.large_string())}
+    return tabela.to_pandas(split_blocks=True, types_mapper=mapeamento_tipos.get)
+
+
+def carregar_compartilhado(caminho_csv, preparar, com_hash=False):
+    """
+    Retorna ``(df, relatorio)`` a partir do arquivo mapeado em memória.
+
+    ``preparar`` é chamado apenas quando o arquivo publicado não existe ou está
+    desatualizado em relação ao CSV; deve retornar ``(df, relatorio)``. O
+    primeiro processo publica o arquivo (de forma atômica, sob trava) e os
+    demais esperam e apenas o mapeiam.
+    """
+    caminho_arrow = caminho_compartilhado(caminho_csv)
+    if not publicado_valido(caminho_arrow, caminho_csv, com_hash):
+        try:
+            with trava_arquivo(caminho_arrow):
+                if not publicado_valido(caminho_arrow, caminho_csv, com_hash):
+                    assinatura = assinatura_fonte(caminho_csv, com_hash)
+                    df, relatorio = preparar()
+                    publicar_dataset(df, caminho_csv, relatorio, assinatura)
+        except OSError:
+            # Diretório somente leitura: segue com uma cópia em memória deste processo
+            return preparar()
+
+    relatorio = pd.DataFrame(ler_metadados(caminho_arrow).get('relatorio', []))
+    return abrir_dataset_mapeado(caminho_arrow), relatorio
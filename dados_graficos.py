@@ -0,0 +1,399 @@
+"""
+Camada de dados dos gráficos: resumos calculados no servidor para o Plotly.
+
+Os gráficos de distribuição (histogramas, pizzas, sunbursts) recebem só o
+resumo — contagens por faixa, por categoria ou por caminho da hierarquia — e
+não as linhas dos pacientes. O JSON enviado ao navegador e o tempo de
+renderização deixam de crescer com o tamanho do recorte: dependem apenas do
+número de faixas ou categorias.
+
+Contagens por categoria vêm de ``agregacoes.contar_por`` (ou do cubo, com
+``pesos='Contagem'``); aqui ficam os resumos específicos dos gráficos.
+
+Box plots e violinos passam a ser desenhados a partir de um resumo por grupo
+(quartis, bigodes, amostra dos outliers e curva de densidade) quando o recorte
+passa de ``LIMITE_LINHAS_BRUTAS`` linhas; abaixo disso continuam com os pontos
+originais (``grafico_distribuicao`` escolhe o modo).
+
+Gráficos de dispersão passam a WebGL acima de ``LIMITE_PONTOS_WEBGL`` pontos
+(``modo_renderizacao``) e recebem só as colunas desenhadas, com os reais
+arredondados (``dados_dispersao``). No modo densidade, recebem em vez dos
+pontos as contagens e a taxa de câncer por célula de uma grade de faixas
+(``densidade_por_faixas``).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from agregacoes import contar_por
+
+FAIXAS_HISTOGRAMA = 20
+# Acima deste número de linhas, box plots e violinos são desenhados a partir do resumo
+LIMITE_LINHAS_BRUTAS = 10_000
+# Outliers desenhados por grupo no modo resumo (amostra determinística, extremos incluídos)
+MAX_OUTLIERS_GRUPO = 200
+PONTOS_DENSIDADE = 100
+# Faixas usadas para estimar a densidade (valores inteiros com amplitude menor usam um valor por faixa)
+FAIXAS_DENSIDADE = 512
+# Acima deste número de pontos, os gráficos de dispersão são desenhados com WebGL em vez de SVG
+LIMITE_PONTOS_WEBGL = 1_000
+# Casas decimais dos valores reais enviados aos gráficos de dispersão
+CASAS_DECIMAIS_DISPERSAO = 4
+# Faixas por eixo no modo densidade dos gráficos de dispersão
+FAIXAS_DENSIDADE_GRADE = 30
+
+
+def contagens_caminho(df, caminho, pesos=None):
+    """
+    Contagens por caminho hierárquico (sunburst), só das combinações presentes.
+
+    Os rótulos viram texto: o Plotly monta a hierarquia agrupando as colunas
+    do caminho, e com categorias criaria as combinações vazias.
+    """
+    contagens = contar_por(df, caminho, pesos)
+    return contagens.astype({coluna: str for coluna in caminho})
+
+
+def _faixas(valores, faixas):
+    """
+    Faixa de cada valor e limites de até ``faixas`` faixas de mesma largura entre o mínimo e o máximo.
+
+    Valores inteiros usam larguras inteiras com limites nos meios-inteiros,
+    para que cada valor caia inteiro em uma faixa; reais seguem os limites de
+    ``np.histogram`` (a última faixa inclui o máximo). ``valores`` não pode
+    ter ausentes nem ser vazio.
+    """
+    minimo, maximo = valores.min(), valores.max()
+    if np.issubdtype(valores.dtype, np.integer):
+        largura = max(1, math.ceil((int(maximo) - int(minimo) + 1) / faixas))
+        indices = (valores.astype(np.int64) - int(minimo)) // largura
+        limites = int(minimo) - 0.5 + largura * np.arange(int(indices.max()) + 2)
+    else:
+        limites = np.histogram_bin_edges(valores, bins=faixas)
+        indices = np.clip(np.searchsorted(limites, valores, side='right') - 1, 0, len(limites) - 2)
+    return indices, limites
+
+
+def histograma(valores, faixas=FAIXAS_HISTOGRAMA):
+    """
+    Contagens em até ``faixas`` faixas de mesma largura: ``Inicio``, ``Fim``, ``Centro`` e ``Contagem``.
+
+    Valores inteiros usam larguras inteiras com limites nos meios-inteiros,
+    para que cada valor caia inteiro em uma faixa. Ausentes são ignorados.
+    """
+    valores = np.asarray(valores)
+    if not np.issubdtype(valores.dtype, np.integer):
+        valores = valores[~np.isnan(valores)]
+    if len(valores) == 0:
+        return pd.DataFrame({'Inicio': [], 'Fim': [], 'Centro': [], 'Contagem': []})
+
+    indices, limites = _faixas(valores, faixas)
+    contagens = np.bincount(indices, minlength=len(limites) - 1)
+    return pd.DataFrame({
+        'Inicio': limites[:-1],
+        'Fim': limites[1:],
+        'Centro': (limites[:-1] + limites[1:]) / 2,
+        'Contagem': contagens.astype(np.int64),
+    })
+
+
+def densidade_por_faixas(df, colunas, indicador=None, faixas=FAIXAS_DENSIDADE_GRADE):
+    """
+    Contagens na grade de faixas das ``colunas`` (2 ou mais), só das células ocupadas.
+
+    Cada coluna é dividida como em ``histograma`` (``faixas`` é um número
+    para todas ou uma lista por coluna) e a célula de cada linha sai de
+    ``np.ravel_multi_index`` + ``np.bincount``. Retorna o centro da faixa em
+    cada coluna e ``Contagem``; com ``indicador`` (ex.: ``Tem_Cancer``),
+    também ``Casos`` e ``Taxa`` (%). Linhas com algum valor ausente ficam de
+    fora. O tamanho do resultado depende só da grade, não do número de linhas.
+    """
+    faixas = [faixas] * len(colunas) if np.ndim(faixas) == 0 else list(faixas)
+    valores = [df[coluna].to_numpy() for coluna in colunas]
+    validas = np.logical_and.reduce([~pd.isna(coluna) for coluna in valores])
+    resultado = {coluna: np.array([], dtype=np.float64) for coluna in colunas}
+    resultado['Contagem'] = np.array([], dtype=np.int64)
+    if indicador is not None:
+        resultado.update(Casos=np.array([], dtype=np.int64), Taxa=np.array([], dtype=np.float64))
+    if not validas.any():
+        return pd.DataFrame(resultado)
+
+    indices, centros = [], []
+    for coluna, quantidade in zip(valores, faixas):
+        indice, limites = _faixas(coluna[validas], quantidade)
+        indices.append(indice)
+        centros.append((limites[:-1] + limites[1:]) / 2)
+    forma = tuple(len(centro) for centro in centros)
+    celula = np.ravel_multi_index(indices, forma)
+    contagens = np.bincount(celula, minlength=int(np.prod(forma)))
+    ocupadas = np.flatnonzero(contagens)
+    for coluna, centro, posicao in zip(colunas, centros, np.unravel_index(ocupadas, forma)):
+        resultado[coluna] = centro[posicao]
+    resultado['Contagem'] = contagens[ocupadas]
+    if indicador is not None:
+        casos = np.bincount(celula, np.asarray(df[indicador].to_numpy()[validas], dtype=np.float64),
+                            minlength=len(contagens))[ocupadas].astype(np.int64)
+        resultado['Casos'] = casos
+        resultado['Taxa'] = casos / resultado['Contagem'] * 100
+    return pd.DataFrame(resultado)
+
+
+def figura_densidade(densidade, x, y, cor='Contagem', titulo=None, escala='Blues'):
+    """
+    Mapa de calor de ``densidade_por_faixas`` em ``x`` × ``y``, colorido por ``cor`` (``Contagem`` ou ``Taxa``).
+
+    O hover mostra o número de pacientes e, quando calculada, a taxa de
+    câncer da célula; células vazias ficam em branco.
+    """
+    valores = ['Contagem'] + (['Taxa'] if 'Taxa' in densidade.columns else [])
+    grade = densidade.pivot(index=y, columns=x, values=valores)
+    hover = f"{x}=%{{x}}<br>{y}=%{{y}}<br>Pacientes=%{{customdata[0]}}"
+    if 'Taxa' in valores:
+        hover += "<br>Taxa de Câncer=%{customdata[1]:.1f}%"
+    figura = go.Figure(go.Heatmap(
+        x=grade[cor].columns,
+        y=grade.index,
+        z=grade[cor].to_numpy(),
+        customdata=np.dstack([grade[valor].to_numpy() for valor in valores]),
+        hovertemplate=hover + "<extra></extra>",
+        colorscale=escala,
+        colorbar=dict(title='Taxa de Câncer (%)' if cor == 'Taxa' else 'Pacientes'),
+    ))
+    figura.update_layout(title=titulo, xaxis_title=x, yaxis_title=y)
+    return figura
+
+
+def _ordenados_por_grupo(grupos, valores):
+    """Códigos e rótulos dos grupos presentes, valores ordenados por grupo e início de cada grupo"""
+    grupos = pd.Series(grupos).reset_index(drop=True)
+    valores = np.asarray(valores, dtype=np.float64)
+    if isinstance(grupos.dtype, pd.CategoricalDtype):
+        codigos, rotulos = grupos.cat.codes.to_numpy(), grupos.cat.categories
+    else:
+        codigos, rotulos = pd.factorize(grupos, sort=True)
+    validas = (codigos >= 0) & ~np.isnan(valores)
+    codigos, valores = codigos[validas], valores[validas]
+
+    # Só os grupos presentes, na ordem das categorias
+    quantidades = np.bincount(codigos, minlength=len(rotulos))
+    presentes = np.flatnonzero(quantidades)
+    renumerar = np.full(len(rotulos), -1)
+    renumerar[presentes] = np.arange(len(presentes))
+    codigos = renumerar[codigos]
+
+    ordem = np.lexsort((valores, codigos))
+    quantidades = quantidades[presentes]
+    inicios = np.concatenate(([0], np.cumsum(quantidades)[:-1]))
+    return codigos[ordem], valores[ordem], np.asarray(rotulos)[presentes], quantidades, inicios
+
+
+def _quantis_ordenados(valores, inicios, quantidades, probabilidade):
+    """Quantil (interpolação linear, como o Plotly e o NumPy) de cada grupo já ordenado"""
+    posicoes = inicios + (quantidades - 1) * probabilidade
+    abaixo, acima = np.floor(posicoes).astype(np.int64), np.ceil(posicoes).astype(np.int64)
+    return valores[abaixo] + (posicoes - abaixo) * (valores[acima] - valores[abaixo])
+
+
+def resumo_distribuicao(grupos, valores, max_outliers=MAX_OUTLIERS_GRUPO, pontos=PONTOS_DENSIDADE):
+    """
+    Resumo por grupo para box plots e violinos, sem laços sobre as linhas.
+
+    Retorna ``{'caixas', 'outliers', 'densidades'}``:
+
+    - ``caixas``: ``Grupo``, ``N``, ``Q1``, ``Mediana``, ``Q3``, ``Limite_Inferior``
+      e ``Limite_Superior`` (bigodes: valores mais distantes a até 1,5 IQR dos
+      quartis) e ``Media``;
+    - ``outliers``: ``Grupo`` e ``Valor`` de até ``max_outliers`` pontos fora
+      dos bigodes por grupo, espaçados na ordem dos valores;
+    - ``densidades``: ``Grupo``, ``Valor`` e ``Densidade`` (KDE gaussiana com a
+      largura de banda de Silverman, como os violinos do Plotly), em
+      ``pontos`` valores entre o mínimo e o máximo do grupo estendidos por
+      duas larguras de banda.
+
+    Grupos e valores ausentes são ignorados.
+    """
+    codigos, valores, rotulos, quantidades, inicios = _ordenados_por_grupo(grupos, valores)
+    if len(rotulos) == 0:
+        return {
+            'caixas': pd.DataFrame(columns=['Grupo', 'N', 'Q1', 'Mediana', 'Q3', 'Limite_Inferior',
+                                            'Limite_Superior', 'Media']),
+            'outliers': pd.DataFrame(columns=['Grupo', 'Valor']),
+            'densidades': pd.DataFrame(columns=['Grupo', 'Valor', 'Densidade']),
+        }
+
+    q1, mediana, q3 = (_quantis_ordenados(valores, inicios, quantidades, p) for p in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    corte_inferior, corte_superior = (q1 - 1.5 * iqr)[codigos], (q3 + 1.5 * iqr)[codigos]
+    dentro = (valores >= corte_inferior) & (valores <= corte_superior)
+    limite_inferior = np.minimum.reduceat(np.where(dentro, valores, np.inf), inicios)
+    limite_superior = np.maximum.reduceat(np.where(dentro, valores, -np.inf), inicios)
+    soma = np.bincount(codigos, valores)
+    media = soma / quantidades
+    desvio = np.sqrt(np.maximum(np.bincount(codigos, valores ** 2) / quantidades - media ** 2, 0)
+                     * quantidades / np.maximum(quantidades - 1, 1))
+
+    # Amostra dos outliers: posições igualmente espaçadas na ordem dos valores, do menor ao maior do grupo
+    fora = ~dentro
+    codigos_fora = codigos[fora]
+    quantidade_fora = np.bincount(codigos_fora, minlength=len(rotulos))
+    posicao_fora = np.arange(len(codigos_fora)) - np.concatenate(([0], np.cumsum(quantidade_fora)[:-1]))[codigos_fora]
+    escala = ((np.minimum(quantidade_fora, max_outliers) - 1) / np.maximum(quantidade_fora - 1, 1))[codigos_fora]
+    amostra = np.round(np.round(posicao_fora * escala) / np.where(escala > 0, escala, 1)) == posicao_fora
+
+    caixas = pd.DataFrame({
+        'Grupo': rotulos, 'N': quantidades, 'Q1': q1, 'Mediana': mediana, 'Q3': q3,
+        'Limite_Inferior': limite_inferior, 'Limite_Superior': limite_superior, 'Media': media,
+    })
+    outliers = pd.DataFrame({'Grupo': rotulos[codigos_fora[amostra]], 'Valor': valores[fora][amostra]})
+    return {'caixas': caixas, 'outliers': outliers,
+            'densidades': _densidades(codigos, valores, rotulos, quantidades, inicios, q1, q3, desvio, pontos)}
+
+
+def _densidades(codigos, valores, rotulos, quantidades, inicios, q1, q3, desvio, pontos):
+    """KDE gaussiana de cada grupo, estimada sobre as contagens em faixas finas (custo fixo por grupo)"""
+    minimos = valores[inicios]
+    maximos = valores[inicios + quantidades - 1]
+    # Largura de banda de Silverman, como no Plotly (com um mínimo para grupos sem variação)
+    espalhamento = np.where((q3 - q1) > 0, np.minimum(desvio, (q3 - q1) / 1.349), desvio)
+    banda = 1.059 * espalhamento * quantidades ** -0.2
+    banda = np.where(banda > 0, banda, np.maximum(np.abs(minimos), 1) * 1e-3)
+
+    menor, maior = valores.min(), valores.max()
+    inteiros = np.all(valores == np.round(valores))
+    if inteiros and maior - menor + 1 <= FAIXAS_DENSIDADE:
+        # Um valor inteiro por faixa: a densidade é exata
+        centros = np.arange(menor, maior + 1)
+        faixa = (valores - menor).astype(np.int64)
+    else:
+        largura = (maior - menor) / FAIXAS_DENSIDADE or 1.0
+        centros = menor + largura * (np.arange(FAIXAS_DENSIDADE) + 0.5)
+        faixa = np.minimum(((valores - menor) / largura).astype(np.int64), FAIXAS_DENSIDADE - 1)
+    contagens = np.bincount(codigos * len(centros) + faixa,
+                            minlength=len(rotulos) * len(centros)).reshape(len(rotulos), len(centros))
+
+    fracao = np.linspace(0, 1, pontos)
+    grade = (minimos - 2 * banda)[:, None] + fracao[None, :] * ((maximos - minimos) + 4 * banda)[:, None]
+    distancias = (grade[:, :, None] - centros[None, None, :]) / banda[:, None, None]
+    densidade = np.einsum('gpc,gc->gp', np.exp(-0.5 * distancias ** 2), contagens)
+    densidade /= (quantidades * banda * np.sqrt(2 * np.pi))[:, None]
+    return pd.DataFrame({
+        'Grupo': np.repeat(rotulos, pontos),
+        'Valor': grade.ravel(),
+        'Densidade': densidade.ravel(),
+    })
+
+
+def _ordenar_resumo(resumo, ordem):
+    """Reordena os grupos do resumo pela lista ``ordem`` (grupos fora dela vão para o fim)"""
+    if not ordem:
+        return resumo
+    posicao = {grupo: i for i, grupo in enumerate(ordem)}
+    caixas = resumo['caixas']
+    chave = caixas['Grupo'].map(lambda grupo: posicao.get(grupo, len(posicao)))
+    return dict(resumo, caixas=caixas.iloc[np.argsort(chave.to_numpy(), kind='stable')].reset_index(drop=True))
+
+
+def figura_resumo(resumo, tipo='box', titulo=None, rotulo_grupo=None, rotulo_valor=None, caixa=True):
+    """
+    Box plot (``tipo='box'``) ou violino (``tipo='violin'``) desenhado a partir de ``resumo_distribuicao``.
+
+    Cada grupo tem uma cor, como em ``px.box(..., color=grupo)``; o violino
+    inclui a caixa interna quando ``caixa=True``.
+    """
+    cores = px.colors.qualitative.Plotly
+    caixas = resumo['caixas']
+    figura = go.Figure()
+    for i, linha in enumerate(caixas.itertuples(index=False)):
+        cor = cores[i % len(cores)]
+        grupo = str(linha.Grupo)
+        if tipo == 'violin':
+            densidade = resumo['densidades'][resumo['densidades']['Grupo'] == linha.Grupo]
+            meia_largura = 0.45 * densidade['Densidade'].to_numpy() / max(densidade['Densidade'].max(), 1e-300)
+            figura.add_trace(go.Scatter(
+                x=np.concatenate([i - meia_largura, (i + meia_largura)[::-1]]),
+                y=np.concatenate([densidade['Valor'].to_numpy(), densidade['Valor'].to_numpy()[::-1]]),
+                fill='toself', mode='lines', line=dict(color=cor, width=1), name=grupo, legendgroup=grupo,
+                hoverinfo='skip',
+            ))
+        if tipo == 'box' or caixa:
+            figura.add_trace(go.Box(
+                x=[i], q1=[linha.Q1], median=[linha.Mediana], q3=[linha.Q3],
+                lowerfence=[linha.Limite_Inferior], upperfence=[linha.Limite_Superior],
+                width=0.8 if tipo == 'box' else 0.1, marker_color=cor, name=grupo, legendgroup=grupo,
+                showlegend=tipo == 'box',
+            ))
+        pontos = resumo['outliers'][resumo['outliers']['Grupo'] == linha.Grupo]
+        if len(pontos) > 0:
+            figura.add_trace(go.Scatter(
+                x=np.full(len(pontos), i), y=pontos['Valor'], mode='markers', marker=dict(color=cor, size=4),
+                name=grupo, legendgroup=grupo, showlegend=False,
+            ))
+    figura.update_layout(
+        title=titulo,
+        xaxis=dict(tickmode='array', tickvals=list(range(len(caixas))), ticktext=[str(g) for g in caixas['Grupo']],
+                   title=rotulo_grupo),
+        yaxis=dict(title=rotulo_valor),
+    )
+    return figura
+
+
+def grafico_distribuicao(df, grupo, valor, tipo='box', titulo=None, limite=LIMITE_LINHAS_BRUTAS, **opcoes):
+    """
+    Box plot ou violino de ``valor`` por ``grupo`` (uma cor por grupo).
+
+    Até ``limite`` linhas usa ``px.box``/``px.violin`` com os pontos
+    originais; acima disso, a figura é montada a partir do resumo por grupo e
+    o tamanho não depende mais do número de linhas. Categóricas ordenadas
+    (ex.: Baixo < Moderado < Alto) são desenhadas pela posição na escala
+    (1, 2, 3...), com os rótulos no eixo. Outros valores não numéricos viram,
+    acima do limite, um gráfico de barras com as contagens por grupo.
+    """
+    serie = df[valor]
+    rotulos_valor = None
+    if isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.ordered:
+        rotulos_valor = [str(rotulo) for rotulo in serie.cat.categories]
+        codigos = serie.cat.codes
+        df = pd.DataFrame({grupo: df[grupo], valor: codigos.where(codigos >= 0).astype(np.float64) + 1})
+    elif not pd.api.types.is_numeric_dtype(serie):
+        if len(df) <= limite:
+            return getattr(px, tipo)(df, x=grupo, y=valor, color=grupo, title=titulo, **opcoes)
+        contagens = contar_por(df, [grupo, valor])
+        return px.bar(contagens, x=grupo, y='Contagem', color=valor, barmode='group', title=titulo,
+                      category_orders=opcoes.get('category_orders'))
+
+    if len(df) <= limite:
+        figura = getattr(px, tipo)(df, x=grupo, y=valor, color=grupo, title=titulo, **opcoes)
+    else:
+        resumo = resumo_distribuicao(df[grupo], df[valor].to_numpy())
+        resumo = _ordenar_resumo(resumo, (opcoes.get('category_orders') or {}).get(grupo))
+        figura = figura_resumo(resumo, tipo, titulo, grupo, valor, caixa=opcoes.get('box', tipo == 'box'))
+    if rotulos_valor is not None:
+        figura.update_yaxes(tickmode='array', tickvals=list(range(1, len(rotulos_valor) + 1)),
+                            ticktext=rotulos_valor)
+    return figura
+
+
+def modo_renderizacao(quantidade, limite=LIMITE_PONTOS_WEBGL):
+    """``render_mode`` do ``px.scatter``: ``'webgl'`` acima de ``limite`` pontos, ``'svg'`` até lá"""
+    return 'webgl' if quantidade > limite else 'svg'
+
+
+def dados_dispersao(df, colunas, casas=CASAS_DECIMAIS_DISPERSAO):
+    """
+    Só as ``colunas`` de um gráfico de dispersão, com os reais em float64 arredondados a ``casas`` decimais.
+
+    Colunas compactadas em float32 iriam para o JSON com o ruído da conversão
+    (ex.: ``23.200000762939453`` para 23,2), aumentando o payload e o texto do
+    hover; colunas repetidas (eixo e hover) são lidas uma vez só.
+    """
+    dados = {}
+    for coluna in dict.fromkeys(colunas):
+        serie = df[coluna]
+        if pd.api.types.is_float_dtype(serie.dtype):
+            serie = serie.astype(np.float64).round(casas)
+        dados[coluna] = serie
+    return pd.DataFrame(dados, index=df.index)
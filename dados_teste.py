@@ -0,0 +1,30 @@
+"""
+Dataset da fonte preparado como no app, para os scripts de teste (testar_*.py).
+
+Um único carregador evita que cada script monte a sua própria versão do
+preparo (esquema neutro, desfechos, tradução e tipos compactos).
+"""
+
+import pandas as pd
+
+from esquema_dados import compactar_numericos, dtypes_leitura
+from localizacao import ESQUEMA_NEUTRO, aplicar_esquema_neutro, localizar, normalizar_desfechos
+
+CAMINHO_DATASET = 'Lung_Cancer_Trends_Realistic.csv'
+
+
+def carregar_dataset(normalizar=True, compacto=True):
+    """
+    Visão em português do CSV da fonte, com o mesmo preparo de ``app.preparar_dados``.
+
+    ``normalizar=False`` mantém o estágio ausente para pacientes sem câncer
+    (sem ``Tem_Cancer``/``Sobrevivente``); ``compacto=False`` mantém os tipos
+    numéricos da leitura.
+    """
+    df = aplicar_esquema_neutro(pd.read_csv(CAMINHO_DATASET, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+    if normalizar:
+        df = normalizar_desfechos(df)
+    df = localizar(df)
+    if compacto:
+        df, _ = compactar_numericos(df)
+    return df
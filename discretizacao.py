@@ -0,0 +1,144 @@
+"""
+Discretização vetorizada: categorias de IMC, décadas, quartis e faixas iguais.
+
+Todos os agrupamentos são feitos com ``np.digitize`` sobre os limites, sem
+chamadas Python por linha, e devolvem ``pd.Categorical`` com os rótulos já
+formatados. Os rótulos das faixas iguais são montados uma vez por
+(mínimo, máximo, número de faixas) e reaproveitados entre reruns.
+
+As faixas iguais e os quartis reproduzem ``pd.cut(valores, bins=n)`` e
+``pd.qcut(valores, 4)``, inclusive os rótulos "início-fim" que o dashboard
+exibia formatando os intervalos do pandas. Quartis com limites repetidos (ex.:
+um recorte de uma única idade) não geram erro: os limites repetidos são
+descartados.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ROTULOS_QUARTIS = ['Q1', 'Q2', 'Q3', 'Q4']
+# Casas usadas pelo pandas para rotular intervalos (``precision`` de pd.cut)
+PRECISAO_ROTULOS = 3
+
+
+def classificar(valores, cortes, rotulos, fechado_direita=False):
+    """
+    Categoria de cada valor a partir dos ``cortes`` internos (len(rotulos) - 1 cortes).
+
+    Com ``fechado_direita=False`` um valor igual ao corte vai para a faixa de
+    cima (``valor < corte`` fica embaixo). NaN cai na última faixa.
+    """
+    codigos = np.digitize(np.asarray(valores), cortes, right=fechado_direita)
+    return pd.Categorical.from_codes(codigos, categories=rotulos)
+
+
+def discretizar(valores, limites, rotulos):
+    """
+    Faixas fechadas à direita ``(l0, l1], (l1, l2], ...`` com o primeiro limite incluído, como ``pd.cut``.
+
+    Valores fora de ``[l0, lN]`` e ausentes ficam sem categoria.
+    """
+    valores = np.asarray(valores, dtype=float)
+    limites = np.asarray(limites, dtype=float)
+    codigos = np.digitize(valores, limites[1:-1], right=True)
+    codigos[~((valores >= limites[0]) & (valores <= limites[-1]))] = -1
+    return pd.Categorical.from_codes(codigos, categories=rotulos)
+
+
+def decadas(idades):
+    """Década de cada idade (ex.: 47 -> '40s'), em ordem crescente; sem idades, nenhuma década"""
+    idades = np.asarray(idades)
+    if len(idades) == 0:
+        return pd.Categorical([], categories=[])
+    decada = idades // 10
+    primeira, ultima = int(decada.min()), int(decada.max())
+    rotulos = [f'{d * 10}s' for d in range(primeira, ultima + 1)]
+    return pd.Categorical.from_codes((decada - primeira).astype(np.int64), categories=rotulos)
+
+
+def quantis_ponderados(valores, pesos, probabilidades):
+    """
+    Quantis (interpolação linear, como ``Series.quantile``) de valores repetidos ``pesos`` vezes.
+
+    ``valores`` precisa estar em ordem crescente. Sem valores, os quantis são NaN.
+    """
+    acumulado = np.cumsum(pesos)
+    if len(acumulado) == 0:
+        return np.full(np.shape(probabilidades), np.nan)
+    posicoes = (acumulado[-1] - 1) * np.asarray(probabilidades, dtype=float)
+    abaixo, acima = np.floor(posicoes), np.ceil(posicoes)
+    valor_abaixo = np.asarray(valores)[np.searchsorted(acumulado, abaixo, side='right')]
+    valor_acima = np.asarray(valores)[np.searchsorted(acumulado, acima, side='right')]
+    return valor_abaixo + (posicoes - abaixo) * (valor_acima - valor_abaixo)
+
+
+def quartis(valores, pesos=None):
+    """
+    Quartil (Q1 a Q4) de cada valor, como ``pd.qcut(valores, 4)``; ``pesos`` repete cada valor.
+
+    Limites repetidos (muitos valores iguais) são descartados, como em
+    ``pd.qcut(..., duplicates='drop')``, e as faixas restantes recebem os
+    primeiros rótulos; se todos os valores forem iguais, ficam todos em Q1.
+    Sem valores, o resultado é vazio.
+    """
+    valores = np.asarray(valores)
+    if len(valores) == 0:
+        return pd.Categorical([], categories=ROTULOS_QUARTIS)
+    pesos = np.ones(len(valores), dtype=np.int64) if pesos is None else np.asarray(pesos)
+    ordem = np.argsort(valores, kind='stable')
+    limites = quantis_ponderados(valores[ordem], pesos[ordem], np.linspace(0, 1, len(ROTULOS_QUARTIS) + 1))
+    limites = np.unique(limites)
+    if len(limites) == 1:
+        limites = np.repeat(limites, 2)
+    return discretizar(valores, limites, ROTULOS_QUARTIS[:len(limites) - 1])
+
+
+def _arredondar_rotulo(valor):
+    # Mesmo arredondamento do pandas ao rotular intervalos: PRECISAO_ROTULOS casas após o primeiro dígito
+    if not np.isfinite(valor) or valor == int(valor):
+        return valor
+    fracao, inteiro = math.modf(valor)
+    casas = PRECISAO_ROTULOS if inteiro != 0 else -math.floor(math.log10(abs(fracao))) - 1 + PRECISAO_ROTULOS
+    return round(valor, casas)
+
+
+@lru_cache(maxsize=64)
+def faixas_iguais_limites(minimo, maximo, quantidade):
+    """
+    Limites, rótulos "início-fim" e código do rótulo de cada faixa, para ``quantidade`` faixas iguais.
+
+    Calculado uma vez por combinação. Faixas estreitas podem ter o mesmo
+    rótulo; nesse caso compartilham a categoria, como ao agrupar os textos.
+    """
+    if minimo == maximo:
+        # Mesmo tratamento do pd.cut para uma amplitude nula
+        ajuste = 0.001 * abs(minimo) if minimo != 0 else 0.001
+        limites = np.linspace(minimo - ajuste, maximo + ajuste, quantidade + 1)
+    else:
+        limites = np.linspace(minimo, maximo, quantidade + 1)
+        limites[0] -= (maximo - minimo) * 0.001
+    extremos = [_arredondar_rotulo(float(limite)) for limite in limites]
+    extremos[0] -= 10 ** -PRECISAO_ROTULOS
+    rotulos = [f"{inicio:.0f}-{fim:.0f}" for inicio, fim in zip(extremos[:-1], extremos[1:])]
+    categorias = list(dict.fromkeys(rotulos))
+    codigos_faixas = np.array([categorias.index(rotulo) for rotulo in rotulos] + [-1])
+    return limites, categorias, codigos_faixas
+
+
+def faixas_iguais(valores, quantidade):
+    """
+    Faixa de cada valor entre ``quantidade`` faixas iguais do mínimo ao máximo, como ``pd.cut(valores, bins=quantidade)``.
+
+    Sem valores, o resultado é vazio (o ``pd.cut`` levantaria um erro).
+    """
+    valores = np.asarray(valores)
+    if len(valores) == 0:
+        return pd.Categorical([], categories=[])
+    limites, categorias, codigos_faixas = faixas_iguais_limites(float(valores.min()), float(valores.max()),
+                                                                int(quantidade))
+    faixas = discretizar(valores, limites, list(range(len(limites) - 1))).codes
+    # Código -1 (fora das faixas) indexa o último elemento, que também é -1
+    return pd.Categorical.from_codes(codigos_faixas[faixas], categories=categorias)
@@ -0,0 +1,142 @@
+"""
+Esquema de tipos do dataset traduzido.
+
+As 18 colunas de texto usadas pelo dashboard são carregadas como
+``pandas.Categorical`` com a ordem real dos níveis (Baixo < Moderado < Alto,
+Estágio I .. IV etc.). Comparações, ``isin`` e ``groupby`` passam a operar sobre
+códigos inteiros e os gráficos recebem a ordem correta via ``ORDEM_CATEGORIAS``.
+
+As colunas numéricas podem ainda ser compactadas para tipos menores
+(int8/int16/float32) com ``compactar_numericos``. Inteiros são preservados
+exatamente; reais passam a float32 quando todos os valores ficam a até
+``TOLERANCIA_FLOAT32`` (erro relativo) do original, ou seja, com perda de
+precisão limitada, não sem perda (ex.: IMC 23.2 vira 23.200000762939453).
+"""
+
+import numpy as np
+import pandas as pd
+
+# coluna: (níveis na ordem natural, se a ordem tem significado)
+ESQUEMA_CATEGORICO = {
+    'Genero': (['Feminino', 'Masculino'], False),
+    'Status_Tabagismo': (['Nunca', 'Ex-fumante', 'Atual'], True),
+    'Exposicao_Fumo_Passivo': (['Baixa', 'Média', 'Alta'], True),
+    'Exposicao_Ocupacional': (['Amianto', 'Sílica', 'Gases Diesel', 'Poeira de Carvão', 'Gases Químicos'], False),
+    'Nivel_Poluicao_Ar': (['Baixo', 'Moderado', 'Alto'], True),
+    'Historico_Familiar': (['Não', 'Sim'], False),
+    'Marcadores_Geneticos_Positivos': (['Não', 'Sim'], False),
+    'Nivel_Atividade_Fisica': (['Baixo', 'Moderado', 'Alto'], True),
+    'Consumo_Alcool': (['Baixo', 'Moderado', 'Alto'], True),
+    'Qualidade_Dieta': (['Ruim', 'Média', 'Boa'], True),
+    'Regiao': (['Norte', 'Sul', 'Leste', 'Oeste'], False),
+    'Nivel_Renda': (['Baixa', 'Média', 'Alta'], True),
+    'Nivel_Educacao': (['Fundamental', 'Médio', 'Superior'], True),
+    'Acesso_Cuidados_Saude': (['Ruim', 'Médio', 'Bom'], True),
+    'Frequencia_Exames': (['Nunca', 'Ocasionalmente', 'Regularmente'], True),
+    'Doenca_Pulmonar_Cronica': (['Não', 'Sim'], False),
+    'Estagio_Cancer_Pulmao': (['Sem Câncer', 'Estágio I', 'Estágio II', 'Estágio III', 'Estágio IV'], True),
+    'Status_Sobrevivencia': (['Vivo', 'Falecido'], False),
+}
+
+COLUNAS_NUMERICAS = ['Idade', 'Anos_Fumando', 'Cigarros_Por_Dia', 'IMC', 'Ano_Diagnostico']
+
+# Tipos compactos fixos para a ingestão em blocos, onde todos os blocos precisam do mesmo esquema
+# Erro relativo máximo aceito ao converter uma coluna real de float64 para float32
+TOLERANCIA_FLOAT32 = 1e-6
+
+TIPOS_NUMERICOS_COMPACTOS = {
+    'Idade': 'int8',
+    'Anos_Fumando': 'int8',
+    'Cigarros_Por_Dia': 'int16',
+    'IMC': 'float32',
+    'Ano_Diagnostico': 'int16',
+}
+
+# Ordem dos níveis para o parâmetro category_orders do Plotly Express
+ORDEM_CATEGORIAS = {coluna: niveis for coluna, (niveis, _) in ESQUEMA_CATEGORICO.items()}
+
+
+def dtypes_leitura(esquema=None):
+    """Tipos para ``pd.read_csv``: as colunas de texto já são lidas como categorias"""
+    esquema = ESQUEMA_CATEGORICO if esquema is None else esquema
+    return {coluna: 'category' for coluna in esquema}
+
+
+def aplicar_esquema(df, esquema=None):
+    """
+    Converte as colunas de texto do esquema em categorias ordenadas.
+
+    A conversão é feita sobre as categorias (e não sobre as linhas) quando a
+    coluna já é categórica. Valores fora do esquema não são descartados: são
+    adicionados ao final da lista de níveis. ``esquema`` permite aplicar o
+    mesmo esquema com outros rótulos (ver ``localizacao.ESQUEMA_NEUTRO``).
+    """
+    esquema = ESQUEMA_CATEGORICO if esquema is None else esquema
+    for coluna, (niveis, ordenado) in esquema.items():
+        if coluna not in df.columns:
+            continue
+        serie = df[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = serie.astype('category')
+        extras = [valor for valor in serie.cat.categories if valor not in niveis]
+        df[coluna] = serie.cat.set_categories(list(niveis) + extras, ordered=ordenado)
+    return df
+
+
+def niveis_observados(serie):
+    """Níveis presentes na série, na ordem do esquema (ou de aparição, se não for categórica)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        presentes = set(serie.cat.codes.unique().tolist())
+        return [nivel for i, nivel in enumerate(serie.cat.categories) if i in presentes]
+    return list(serie.dropna().unique())
+
+
+def tipo_compacto(serie):
+    """
+    Menor tipo numérico para a série.
+
+    Inteiros: o menor tipo inteiro que contém todos os valores (sem perda).
+    Reais: float32 se todos os valores ficam a até ``TOLERANCIA_FLOAT32`` de
+    erro relativo do original; caso contrário o tipo não muda.
+    """
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        return pd.to_numeric(serie, downcast='integer').dtype
+
+    if pd.api.types.is_float_dtype(serie.dtype):
+        valores = serie.to_numpy()
+        validos = valores[~np.isnan(valores)]
+        if serie.dtype == np.float64:
+            convertidos = validos.astype(np.float32)
+            if np.all(np.isfinite(convertidos)) and np.allclose(convertidos, validos, rtol=TOLERANCIA_FLOAT32, atol=0):
+                return np.dtype(np.float32)
+    return serie.dtype
+
+
+def compactar_numericos(df, colunas=None):
+    """
+    Converte as colunas numéricas para tipos menores (ver ``tipo_compacto``: inteiros sem perda,
+    reais em float32 dentro de ``TOLERANCIA_FLOAT32``).
+
+    Retorna o DataFrame compactado e um relatório com os bytes economizados
+    por coluna.
+    """
+    colunas = COLUNAS_NUMERICAS if colunas is None else colunas
+    linhas_relatorio = []
+    for coluna in colunas:
+        if coluna not in df.columns or not pd.api.types.is_numeric_dtype(df[coluna].dtype):
+            continue
+        tipo_original = df[coluna].dtype
+        bytes_antes = int(df[coluna].memory_usage(index=False))
+        novo_tipo = tipo_compacto(df[coluna])
+        if novo_tipo != tipo_original:
+            df[coluna] = df[coluna].astype(novo_tipo)
+        bytes_depois = int(df[coluna].memory_usage(index=False))
+        linhas_relatorio.append({
+            'Coluna': coluna,
+            'Tipo_Original': str(tipo_original),
+            'Tipo_Compacto': str(novo_tipo),
+            'Bytes_Antes': bytes_antes,
+            'Bytes_Depois': bytes_depois,
+            'Bytes_Economizados': bytes_antes - bytes_depois,
+        })
+    return df, pd.DataFrame(linhas_relatorio)
@@ -0,0 +1,191 @@
+"""
+Gerador de datasets sintéticos em escala (100 mil a 100 milhões de linhas) para benchmarks.
+
+O modelo é uma cópula gaussiana ajustada ao ``Lung_Cancer_Trends_Realistic.csv``:
+cada coluna mantém sua distribuição marginal empírica (os mesmos valores, com
+as mesmas frequências esperadas) e a dependência entre colunas vem da matriz
+de correlação dos escores normais de cada valor. As colunas de texto usam a
+ordem de níveis do esquema (ausentes primeiro), então as correlações de postos
+entre pares de colunas são reproduzidas; dependências não monotônicas entre
+níveis não são.
+
+A geração é vetorizada com NumPy, feita em blocos (memória constante) e
+determinística: a mesma semente e o mesmo tamanho de bloco produzem sempre o
+mesmo arquivo. A saída usa o esquema da fonte (colunas e rótulos neutros) e
+pode ser gravada em CSV, Parquet ou Feather.
+"""
+
+import argparse
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from armazenamento_colunar import FORMATOS_SUPORTADOS, TAMANHO_BLOCO_PADRAO, gravar_blocos_colunar
+from esquema_dados import dtypes_leitura
+from localizacao import ESQUEMA_NEUTRO, TIPOS_NUMERICOS_NEUTROS, aplicar_esquema_neutro
+
+CAMINHO_ORIGEM = 'Lung_Cancer_Trends_Realistic.csv'
+DIRETORIO_SAIDA = 'dados_sinteticos'
+TAMANHOS = {
+    '100k': 100_000,
+    '1M': 1_000_000,
+    '10M': 10_000_000,
+    '100M': 100_000_000,
+}
+SEMENTE_PADRAO = 42
+COLUNA_ID = 'Patient_ID'
+# A fonte grava valores ausentes (sem exposição, sem câncer...) como "None"
+ROTULO_AUSENTE = 'None'
+
+_NORMAL = NormalDist()
+
+
+def _quantis_normais(probabilidades):
+    """Inversa da normal padrão para um vetor pequeno de probabilidades"""
+    return np.array([_NORMAL.inv_cdf(p) for p in probabilidades])
+
+
+def _fator_correlacao(correlacao):
+    """Fator de Cholesky da correlação, projetada para a matriz positiva definida mais próxima se preciso"""
+    try:
+        return np.linalg.cholesky(correlacao)
+    except np.linalg.LinAlgError:
+        autovalores, autovetores = np.linalg.eigh(correlacao)
+        ajustada = autovetores @ np.diag(np.clip(autovalores, 1e-8, None)) @ autovetores.T
+        escala = np.sqrt(np.diag(ajustada))
+        return np.linalg.cholesky(ajustada / np.outer(escala, escala))
+
+
+def ajustar_modelo(df):
+    """
+    Ajusta a cópula gaussiana a um DataFrame no esquema da fonte.
+
+    Para cada coluna guarda os valores distintos (códigos, no caso das
+    categorias, com ausentes em -1) e os limiares normais que separam suas
+    frequências; os escores normais de todas as linhas dão a matriz de
+    correlação.
+    """
+    colunas = [coluna for coluna in df.columns if coluna != COLUNA_ID]
+    suportes, limiares, tipos = {}, {}, {}
+    escores = np.empty((len(df), len(colunas)))
+
+    for j, coluna in enumerate(colunas):
+        serie = df[coluna]
+        tipos[coluna] = serie.dtype
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            valores = serie.cat.codes.to_numpy()
+        else:
+            valores = serie.to_numpy()
+        suporte, posicoes, contagens = np.unique(valores, return_inverse=True, return_counts=True)
+        acumulada = np.cumsum(contagens) / len(valores)
+        anterior = acumulada - contagens / len(valores)
+
+        suportes[coluna] = suporte
+        limiares[coluna] = _quantis_normais(acumulada[:-1])
+        # Escore normal de cada valor: o quantil do meio do seu intervalo de probabilidade
+        escores[:, j] = _quantis_normais((anterior + acumulada) / 2)[posicoes]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlacao = np.corrcoef(escores, rowvar=False)
+    correlacao = np.nan_to_num(np.atleast_2d(correlacao))  # colunas constantes não se correlacionam
+    np.fill_diagonal(correlacao, 1.0)
+
+    primeiro_id = str(df[COLUNA_ID].iloc[0]) if COLUNA_ID in df.columns else 'P0'
+    return {
+        'colunas': list(df.columns),
+        'suportes': suportes,
+        'limiares': limiares,
+        'tipos': tipos,
+        'fator': _fator_correlacao(correlacao),
+        'prefixo_id': primeiro_id.rstrip('0123456789'),
+        'inicio_id': int(primeiro_id[len(primeiro_id.rstrip('0123456789')):] or 0),
+    }
+
+
+def carregar_modelo(caminho_origem=CAMINHO_ORIGEM):
+    """Lê o CSV da fonte com o esquema neutro e ajusta o modelo"""
+    df = aplicar_esquema_neutro(pd.read_csv(caminho_origem, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+    return ajustar_modelo(df)
+
+
+def gerar_bloco(modelo, inicio, linhas, rng):
+    """Gera ``linhas`` linhas a partir da linha ``inicio`` (usada só no ID do paciente)"""
+    normais = rng.standard_normal((linhas, len(modelo['suportes']))) @ modelo['fator'].T
+    bloco = {}
+    if COLUNA_ID in modelo['colunas']:
+        numeros = np.arange(inicio, inicio + linhas, dtype=np.int64) + modelo['inicio_id']
+        bloco[COLUNA_ID] = modelo['prefixo_id'] + pd.Series(numeros).astype(str)
+    for j, (coluna, suporte) in enumerate(modelo['suportes'].items()):
+        valores = suporte[np.searchsorted(modelo['limiares'][coluna], normais[:, j])]
+        tipo = modelo['tipos'][coluna]
+        if isinstance(tipo, pd.CategoricalDtype):
+            bloco[coluna] = pd.Categorical.from_codes(valores, dtype=tipo, validate=False)
+        else:
+            bloco[coluna] = valores.astype(tipo, copy=False)
+    return pd.DataFrame(bloco, columns=modelo['colunas'])
+
+
+def gerar_blocos(modelo, linhas, semente=SEMENTE_PADRAO, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Blocos de até ``tamanho_bloco`` linhas; cada bloco tem seu próprio gerador derivado da semente"""
+    quantidade = -(-linhas // tamanho_bloco)
+    for i, sequencia in enumerate(np.random.SeedSequence(semente).spawn(quantidade)):
+        inicio = i * tamanho_bloco
+        yield gerar_bloco(modelo, inicio, min(tamanho_bloco, linhas - inicio), np.random.default_rng(sequencia))
+
+
+def _gravar_csv(blocos, caminho_saida):
+    """Grava os blocos em CSV no formato da fonte, de forma atômica"""
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_saida)), exist_ok=True)
+    caminho_temp = caminho_saida + '.tmp'
+    total_linhas = 0
+    try:
+        with open(caminho_temp, 'w', encoding='utf-8', newline='') as arquivo:
+            for bloco in blocos:
+                bloco.to_csv(arquivo, header=total_linhas == 0, index=False, na_rep=ROTULO_AUSENTE)
+                total_linhas += len(bloco)
+    except Exception:
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+    os.replace(caminho_temp, caminho_saida)
+    return total_linhas
+
+
+def gerar_dataset(linhas, caminho_saida, formato='csv', semente=SEMENTE_PADRAO, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                  modelo=None):
+    """Gera um dataset sintético de ``linhas`` linhas em CSV ou em formato colunar"""
+    if formato != 'csv' and formato not in FORMATOS_SUPORTADOS:
+        raise ValueError(f"Formato não suportado: {formato}. Use 'csv' ou um de {FORMATOS_SUPORTADOS}.")
+    modelo = carregar_modelo() if modelo is None else modelo
+    blocos = gerar_blocos(modelo, linhas, semente, tamanho_bloco)
+    if formato == 'csv':
+        return _gravar_csv(blocos, caminho_saida)
+    return gravar_blocos_colunar(blocos, caminho_saida, formato, tipos_fixos=TIPOS_NUMERICOS_NEUTROS)
+
+
+def caminho_sintetico(rotulo, formato, diretorio=DIRETORIO_SAIDA):
+    """Nome padrão do arquivo sintético de um tamanho (ex.: dados_sinteticos/Lung_Cancer_Trends_1M.parquet)"""
+    return os.path.join(diretorio, f'Lung_Cancer_Trends_{rotulo}.{formato}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera datasets sintéticos em escala para benchmarks")
+    parser.add_argument('--tamanhos', nargs='+', choices=list(TAMANHOS), default=['100k', '1M'],
+                        help="Tamanhos a gerar (padrão: 100k 1M)")
+    parser.add_argument('--formatos', nargs='+', choices=['csv', *FORMATOS_SUPORTADOS], default=['csv', 'parquet'],
+                        help="Formatos de saída (padrão: csv parquet)")
+    parser.add_argument('--semente', type=int, default=SEMENTE_PADRAO, help="Semente do gerador")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help="Linhas geradas por bloco (define o pico de memória)")
+    parser.add_argument('--diretorio', default=DIRETORIO_SAIDA, help="Diretório de saída")
+    args = parser.parse_args()
+
+    modelo_fonte = carregar_modelo()
+    for rotulo in args.tamanhos:
+        for formato_saida in args.formatos:
+            caminho = caminho_sintetico(rotulo, formato_saida, args.diretorio)
+            print(f"🔄 Gerando {rotulo} linhas em '{caminho}'...")
+            gerar_dataset(TAMANHOS[rotulo], caminho, formato_saida, args.semente, args.tamanho_bloco, modelo_fonte)
+            print(f"✅ {caminho} ({os.path.getsize(caminho) / 1024 ** 2:.1f} MB)")
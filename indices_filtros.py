@@ -0,0 +1,173 @@
+"""
+Índices pré-computados para os filtros do dashboard.
+
+Índice bitmap: para cada coluna categórica indexada, um bitset compactado
+(``np.packbits``, 1 bit por linha) por categoria, construído uma vez na carga
+do dataset. Qualquer combinação de filtros é respondida com OR dos bitsets
+dentro de uma coluna, AND entre colunas e uma única coleta das linhas
+selecionadas, sem máscaras booleanas nem cópias intermediárias do DataFrame.
+
+Índice de faixas: para cada coluna numérica dos sliders (idade, IMC, ano),
+a permutação que ordena a coluna e os valores ordenados. Uma faixa
+``[mínimo, máximo]`` vira duas buscas binárias (``np.searchsorted``) e uma
+fatia da permutação: O(log n + k) para k linhas na faixa. As linhas
+candidatas da faixa mais seletiva são então conferidas contra as demais
+faixas e contra os bitsets das categorias, só nas k posições.
+
+Os bitsets são indexados pelo código da categoria, não pelo rótulo, então o
+mesmo índice serve a qualquer idioma (ver ``localizacao.py``).
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_BITMAP = ['Genero', 'Regiao', 'Status_Tabagismo', 'Nivel_Renda', 'Nivel_Educacao']
+COLUNAS_FAIXA = ['Idade', 'IMC', 'Ano_Diagnostico']
+# Acima desta fração de linhas na faixa mais seletiva, comparar a coluna inteira é mais barato que
+# conferir e ordenar as candidatas
+FRACAO_MAXIMA_CANDIDATAS = 0.25
+
+
+def construir_indice_bitmap(df, colunas=None):
+    """
+    Índice ``{'linhas': n, 'bitsets': {coluna: matriz uint8 (categorias × n/8)}}``.
+
+    A linha ``k`` da matriz de uma coluna é o bitset das linhas com o código ``k``.
+    """
+    colunas = COLUNAS_BITMAP if colunas is None else colunas
+    bitsets = {}
+    for coluna in colunas:
+        serie = df[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            raise TypeError(f"A coluna {coluna} precisa ser categórica para o índice bitmap")
+        codigos = serie.cat.codes.to_numpy()
+        por_categoria = [np.packbits(codigos == codigo) for codigo in range(len(serie.cat.categories))]
+        bitsets[coluna] = np.array(por_categoria, dtype=np.uint8).reshape(len(por_categoria), (len(df) + 7) // 8)
+    return {'linhas': len(df), 'bitsets': bitsets}
+
+
+def construir_indice_faixas(df, colunas=None):
+    """
+    Índice ``{'linhas': n, 'ordens': {...}, 'ordenados': {...}, 'valores': {...}}``.
+
+    ``ordens[coluna]`` é a permutação (estável) que ordena a coluna,
+    ``ordenados[coluna]`` os valores nessa ordem e ``valores[coluna]`` a
+    coluna na ordem original (referência, sem cópia).
+    """
+    colunas = COLUNAS_FAIXA if colunas is None else colunas
+    tipo_posicao = np.int32 if len(df) < np.iinfo(np.int32).max else np.int64
+    ordens, ordenados, valores = {}, {}, {}
+    for coluna in colunas:
+        coluna_valores = df[coluna].to_numpy()
+        ordem = np.argsort(coluna_valores, kind='stable').astype(tipo_posicao, copy=False)
+        ordens[coluna] = ordem
+        ordenados[coluna] = coluna_valores[ordem]
+        valores[coluna] = coluna_valores
+    return {'linhas': len(df), 'ordens': ordens, 'ordenados': ordenados, 'valores': valores}
+
+
+def construir_indices(df):
+    """Índices bitmap e de faixas do dataset, construídos uma vez na carga"""
+    return {**construir_indice_bitmap(df), **construir_indice_faixas(df)}
+
+
+def codigos_categorias(serie, valores):
+    """Códigos das categorias selecionadas; valores que não são categorias da coluna são ignorados"""
+    categorias = serie.cat.categories
+    return [categorias.get_loc(valor) for valor in valores if valor in categorias]
+
+
+def bitset_filtros(indice, filtros, mascara=None):
+    """
+    Bitset compactado das linhas que atendem a todos os filtros.
+
+    ``filtros`` é ``{coluna: [códigos]}`` (OR dentro da coluna, AND entre
+    colunas); ``mascara`` é uma máscara booleana opcional para filtros que não
+    estão no índice (ex.: faixa etária).
+    """
+    resultado = None if mascara is None else np.packbits(mascara)
+    for coluna, codigos in filtros.items():
+        bitsets = indice['bitsets'][coluna]
+        if len(codigos):
+            bitset = np.bitwise_or.reduce(bitsets[list(codigos)], axis=0)
+        else:
+            bitset = np.zeros(bitsets.shape[1], dtype=np.uint8)
+        resultado = bitset if resultado is None else resultado & bitset
+    return resultado
+
+
+def _limites(tipo, minimo, maximo):
+    # Colunas float32: comparar no tipo da coluna, como fazem as comparações do pandas
+    if np.issubdtype(tipo, np.floating):
+        return tipo.type(minimo), tipo.type(maximo)
+    return minimo, maximo
+
+
+def intervalo_faixa(indice, coluna, minimo, maximo):
+    """Início e fim, na ordem da coluna, das linhas com ``minimo <= valor <= maximo`` (duas buscas binárias)"""
+    ordenados = indice['ordenados'][coluna]
+    minimo, maximo = _limites(ordenados.dtype, minimo, maximo)
+    return (int(np.searchsorted(ordenados, minimo, side='left')),
+            int(np.searchsorted(ordenados, maximo, side='right')))
+
+
+def posicoes_faixa(indice, coluna, minimo, maximo):
+    """Posições das linhas na faixa, em ordem de valor: O(log n + k)"""
+    inicio, fim = intervalo_faixa(indice, coluna, minimo, maximo)
+    return indice['ordens'][coluna][inicio:fim]
+
+
+def _bits_nas_posicoes(bitset, posicoes):
+    """Bits de um bitset compactado apenas nas posições pedidas"""
+    return ((bitset[posicoes >> 3] >> (7 - (posicoes & 7))) & 1).astype(bool)
+
+
+def _conferir_candidatas(indice, candidatas, filtros, mascara, faixas):
+    """Mantém as candidatas que atendem às demais faixas, à máscara e às categorias (custo O(k))"""
+    manter = np.ones(len(candidatas), dtype=bool)
+    for coluna, (minimo, maximo) in faixas.items():
+        valores = indice['valores'][coluna][candidatas]
+        minimo, maximo = _limites(valores.dtype, minimo, maximo)
+        manter &= (valores >= minimo) & (valores <= maximo)
+    if mascara is not None:
+        manter &= mascara[candidatas]
+    for coluna, codigos in filtros.items():
+        na_categoria = np.zeros(len(candidatas), dtype=bool)
+        for codigo in codigos:
+            na_categoria |= _bits_nas_posicoes(indice['bitsets'][coluna][codigo], candidatas)
+        manter &= na_categoria
+    return np.sort(candidatas[manter])
+
+
+def posicoes_filtradas(indice, filtros, mascara=None, faixas=None):
+    """
+    Posições (para ``DataFrame.take``) das linhas que atendem aos filtros, em ordem crescente.
+
+    ``faixas`` é ``{coluna: (mínimo, máximo)}`` para as colunas do índice de
+    faixas (limites inclusivos). Se a faixa mais seletiva tem poucas linhas,
+    só elas são conferidas; senão as faixas viram uma máscara e o resultado
+    sai dos bitsets.
+    """
+    faixas = dict(faixas or {})
+    if faixas:
+        intervalos = {coluna: intervalo_faixa(indice, coluna, *faixa) for coluna, faixa in faixas.items()}
+        seletiva = min(intervalos, key=lambda coluna: intervalos[coluna][1] - intervalos[coluna][0])
+        inicio, fim = intervalos[seletiva]
+        if fim - inicio <= FRACAO_MAXIMA_CANDIDATAS * indice['linhas']:
+            candidatas = indice['ordens'][seletiva][inicio:fim]
+            del faixas[seletiva]
+            return _conferir_candidatas(indice, candidatas, filtros, mascara, faixas)
+
+        for coluna, (minimo, maximo) in faixas.items():
+            valores = indice['valores'][coluna]
+            minimo, maximo = _limites(valores.dtype, minimo, maximo)
+            na_faixa = (valores >= minimo) & (valores <= maximo)
+            mascara = na_faixa if mascara is None else mascara & na_faixa
+
+    bitset = bitset_filtros(indice, filtros)
+    if bitset is None:
+        return np.arange(indice['linhas']) if mascara is None else np.flatnonzero(mascara)
+    selecionadas = np.unpackbits(bitset, count=indice['linhas']).view(bool)
+    if mascara is not None:
+        selecionadas &= mascara
+    return np.flatnonzero(selecionadas)
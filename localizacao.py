@@ -0,0 +1,250 @@
+"""
+Camada de idioma aplicada na leitura (translate-on-read).
+
+O dataset é armazenado uma única vez, com os nomes de colunas e os rótulos da
+fonte (``Lung_Cancer_Trends_Realistic.csv``) como códigos neutros de idioma:
+as colunas de texto são categorias, ou seja, códigos inteiros mais um pequeno
+dicionário de rótulos. ``localizar`` troca apenas esses dicionários e os nomes
+das colunas pelo idioma pedido, sem copiar os códigos nem as colunas numéricas.
+Dashboards em português e inglês compartilham assim o mesmo arquivo, o mesmo
+cache colunar e a mesma cópia em memória.
+"""
+
+import numpy as np
+import pandas as pd
+
+from esquema_dados import COLUNAS_NUMERICAS, ESQUEMA_CATEGORICO, TIPOS_NUMERICOS_COMPACTOS, aplicar_esquema
+
+IDIOMA_FONTE = 'en'
+IDIOMA_PADRAO = 'pt'
+IDIOMAS_DISPONIVEIS = (IDIOMA_FONTE, IDIOMA_PADRAO)
+
+# Dicionário de tradução das colunas
+COLUMN_TRANSLATION = {
+    'Patient_ID': 'ID_Paciente',
+    'Age': 'Idade',
+    'Gender': 'Genero',
+    'Smoking_Status': 'Status_Tabagismo',
+    'Years_Smoking': 'Anos_Fumando',
+    'Cigarettes_Per_Day': 'Cigarros_Por_Dia',
+    'Secondhand_Smoke_Exposure': 'Exposicao_Fumo_Passivo',
+    'Occupation_Exposure': 'Exposicao_Ocupacional',
+    'Air_Pollution_Level': 'Nivel_Poluicao_Ar',
+    'Family_History': 'Historico_Familiar',
+    'Genetic_Markers_Positive': 'Marcadores_Geneticos_Positivos',
+    'BMI': 'IMC',
+    'Physical_Activity_Level': 'Nivel_Atividade_Fisica',
+    'Alcohol_Consumption': 'Consumo_Alcool',
+    'Diet_Quality': 'Qualidade_Dieta',
+    'Region': 'Regiao',
+    'Income_Level': 'Nivel_Renda',
+    'Education_Level': 'Nivel_Educacao',
+    'Access_to_Healthcare': 'Acesso_Cuidados_Saude',
+    'Screening_Frequency': 'Frequencia_Exames',
+    'Chronic_Lung_Disease': 'Doenca_Pulmonar_Cronica',
+    'Lung_Cancer_Stage': 'Estagio_Cancer_Pulmao',
+    'Diagnosis_Year': 'Ano_Diagnostico',
+    'Survival_Status': 'Status_Sobrevivencia',
+    # Indicadores calculados na carga (ver normalizar_desfechos)
+    'Has_Cancer': 'Tem_Cancer',
+    'Is_Alive': 'Sobrevivente'
+}
+
+# Traduções dos valores categóricos
+VALUE_TRANSLATIONS = {
+    'Genero': {
+        'Male': 'Masculino',
+        'Female': 'Feminino'
+    },
+    'Status_Tabagismo': {
+        'Never': 'Nunca',
+        'Current': 'Atual',
+        'Former': 'Ex-fumante'
+    },
+    'Exposicao_Fumo_Passivo': {
+        'Low': 'Baixa',
+        'Medium': 'Média',
+        'High': 'Alta'
+    },
+    'Exposicao_Ocupacional': {
+        'Asbestos': 'Amianto',
+        'Silica': 'Sílica',
+        'Diesel Fumes': 'Gases Diesel',
+        'Coal Dust': 'Poeira de Carvão',
+        'Chemical Fumes': 'Gases Químicos'
+    },
+    'Nivel_Poluicao_Ar': {
+        'Low': 'Baixo',
+        'Moderate': 'Moderado',
+        'High': 'Alto'
+    },
+    'Historico_Familiar': {
+        'Yes': 'Sim',
+        'No': 'Não'
+    },
+    'Marcadores_Geneticos_Positivos': {
+        'Yes': 'Sim',
+        'No': 'Não'
+    },
+    'Nivel_Atividade_Fisica': {
+        'Low': 'Baixo',
+        'Moderate': 'Moderado',
+        'High': 'Alto'
+    },
+    'Consumo_Alcool': {
+        'Low': 'Baixo',
+        'Moderate': 'Moderado',
+        'High': 'Alto'
+    },
+    'Qualidade_Dieta': {
+        'Poor': 'Ruim',
+        'Average': 'Média',
+        'Good': 'Boa'
+    },
+    'Regiao': {
+        'North': 'Norte',
+        'South': 'Sul',
+        'East': 'Leste',
+        'West': 'Oeste'
+    },
+    'Nivel_Renda': {
+        'Low': 'Baixa',
+        'Middle': 'Média',
+        'High': 'Alta'
+    },
+    'Nivel_Educacao': {
+        'Primary': 'Fundamental',
+        'Secondary': 'Médio',
+        'Tertiary': 'Superior'
+    },
+    'Acesso_Cuidados_Saude': {
+        'Poor': 'Ruim',
+        'Average': 'Médio',
+        'Good': 'Bom'
+    },
+    'Frequencia_Exames': {
+        'Never': 'Nunca',
+        'Occasionally': 'Ocasionalmente',
+        'Regularly': 'Regularmente'
+    },
+    'Doenca_Pulmonar_Cronica': {
+        'Yes': 'Sim',
+        'No': 'Não'
+    },
+    'Estagio_Cancer_Pulmao': {
+        'No Cancer': 'Sem Câncer',
+        'None': 'Sem Câncer',
+        'Stage I': 'Estágio I',
+        'Stage II': 'Estágio II',
+        'Stage III': 'Estágio III',
+        'Stage IV': 'Estágio IV'
+    },
+    'Status_Sobrevivencia': {
+        'Alive': 'Vivo',
+        'Deceased': 'Falecido'
+    }
+}
+
+# Nome neutro (da fonte) de cada coluna do dashboard
+COLUNAS_NEUTRAS = {traduzida: original for original, traduzida in COLUMN_TRANSLATION.items()}
+
+
+def _esquema_neutro():
+    """Esquema categórico com os rótulos da fonte, na mesma ordem de níveis do esquema em português"""
+    esquema = {}
+    for coluna, (niveis, ordenado) in ESQUEMA_CATEGORICO.items():
+        inverso = {}
+        for original, traduzido in VALUE_TRANSLATIONS.get(coluna, {}).items():
+            inverso.setdefault(traduzido, original)
+        esquema[COLUNAS_NEUTRAS[coluna]] = ([inverso.get(nivel, nivel) for nivel in niveis], ordenado)
+    return esquema
+
+
+ESQUEMA_NEUTRO = _esquema_neutro()
+# Rótulos da fonte usados pelos indicadores de desfecho
+ESTAGIO_SEM_CANCER = 'No Cancer'
+STATUS_VIVO = 'Alive'
+COLUNAS_NUMERICAS_NEUTRAS = [COLUNAS_NEUTRAS[coluna] for coluna in COLUNAS_NUMERICAS]
+TIPOS_NUMERICOS_NEUTROS = {COLUNAS_NEUTRAS[coluna]: tipo for coluna, tipo in TIPOS_NUMERICOS_COMPACTOS.items()}
+
+
+def aplicar_esquema_neutro(df):
+    """``aplicar_esquema`` para o dataset armazenado com os rótulos da fonte"""
+    return aplicar_esquema(df, ESQUEMA_NEUTRO)
+
+
+def normalizar_desfechos(df):
+    """
+    Normaliza o estágio do câncer e adiciona os indicadores booleanos, uma vez na carga.
+
+    A fonte grava "None" no estágio de quem não tem câncer, e o pandas lê isso
+    como ausente: esses pacientes passam a ``No Cancer``. ``Has_Cancer`` e
+    ``Is_Alive`` são comparações dos códigos (int8) do estágio e da
+    sobrevivência, para que taxas sejam médias e somas nativas.
+    """
+    estagio = df['Lung_Cancer_Stage']
+    sem_cancer = estagio.cat.categories.get_loc(ESTAGIO_SEM_CANCER)
+    codigos = estagio.cat.codes.to_numpy()
+    if (codigos < 0).any():
+        codigos = np.where(codigos < 0, sem_cancer, codigos).astype(codigos.dtype)
+        df['Lung_Cancer_Stage'] = pd.Categorical.from_codes(codigos, dtype=estagio.dtype, validate=False)
+    df['Has_Cancer'] = codigos != sem_cancer
+
+    sobrevivencia = df['Survival_Status']
+    df['Is_Alive'] = sobrevivencia.cat.codes.to_numpy() == sobrevivencia.cat.categories.get_loc(STATUS_VIVO)
+    return df
+
+
+def traduzir_categorias(serie, translations):
+    """
+    Traduz uma coluna renomeando apenas suas categorias (custo proporcional ao
+    número de valores distintos, não de linhas). Os códigos são reaproveitados
+    sem cópia.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    novas = [translations.get(categoria, categoria) for categoria in serie.cat.categories]
+    unicas = list(dict.fromkeys(novas))
+    codigos = serie.cat.codes.to_numpy()
+    if len(unicas) == len(novas):
+        tipo = pd.CategoricalDtype(novas, ordered=serie.cat.ordered)
+        return pd.Series(pd.Categorical.from_codes(codigos, dtype=tipo, validate=False),
+                         index=serie.index, name=serie.name)
+
+    # Duas categorias com a mesma tradução: remapear os códigos com uma tabela de consulta
+    posicoes = {categoria: i for i, categoria in enumerate(unicas)}
+    tabela = np.array([posicoes[nova] for nova in novas], dtype=codigos.dtype)
+    novos_codigos = np.where(codigos >= 0, tabela[codigos], -1).astype(codigos.dtype)
+    tipo = pd.CategoricalDtype(unicas, ordered=serie.cat.ordered)
+    return pd.Series(pd.Categorical.from_codes(novos_codigos, dtype=tipo, validate=False),
+                     index=serie.index, name=serie.name)
+
+
+def rotulo_coluna(coluna, idioma=IDIOMA_PADRAO):
+    """Nome de uma coluna neutra no idioma pedido"""
+    if idioma == IDIOMA_FONTE:
+        return coluna
+    return COLUMN_TRANSLATION.get(coluna, coluna)
+
+
+def localizar(df, idioma=IDIOMA_PADRAO):
+    """
+    Visão do dataset neutro no idioma pedido.
+
+    Renomeia as colunas e as categorias; os arrays de códigos e as colunas
+    numéricas são os mesmos objetos do DataFrame de origem (inclusive os
+    somente leitura do modo compartilhado).
+    """
+    if idioma not in IDIOMAS_DISPONIVEIS:
+        raise ValueError(f"Idioma não suportado: {idioma!r}")
+    if idioma == IDIOMA_FONTE:
+        return df
+
+    colunas = {}
+    for coluna in df.columns:
+        nome = rotulo_coluna(coluna, idioma)
+        serie = df[coluna]
+        if nome in VALUE_TRANSLATIONS:
+            serie = traduzir_categorias(serie, VALUE_TRANSLATIONS[nome])
+        colunas[nome] = serie
+    return pd.concat(colunas, axis=1, copy=False)
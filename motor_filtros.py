@@ -0,0 +1,163 @@
+"""
+Motor de filtros declarativo do dashboard.
+
+Os filtros globais (barra lateral) e os locais de cada página são descritos
+por uma especificação:
+
+    {'categorias': {coluna: [rótulos aceitos]}, 'faixas': {coluna: (mínimo, máximo)}}
+
+Especificações são combinadas com ``combinar_filtros`` (AND) e avaliadas de
+uma vez por ``avaliar_filtros``, que devolve um único array de posições das
+linhas selecionadas. Colunas presentes nos índices (``indices_filtros.py``)
+usam bitsets e buscas binárias; as demais viram uma única máscara. Nenhum
+DataFrame intermediário é criado: cada página coleta, com ``coletar``, só as
+linhas e colunas que usa.
+
+As posições resultantes podem ser guardadas em um cache LRU limitado por
+quantidade e por bytes (``criar_cache_filtros``), indexado pela forma canônica
+da especificação: a mesma seleção, em qualquer ordem, reaproveita o resultado.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from indices_filtros import codigos_categorias, posicoes_filtradas
+
+# Limites do cache de resultados: quantidade de seleções e bytes de posições guardadas
+MAX_ENTRADAS_CACHE = 128
+MAX_BYTES_CACHE = 64 * 1024 ** 2
+
+
+def especificacao_filtros(categorias=None, faixas=None):
+    """Especificação de filtros: categorias aceitas e faixas inclusivas, por coluna"""
+    return {
+        'categorias': {coluna: list(valores) for coluna, valores in (categorias or {}).items()},
+        'faixas': {coluna: tuple(faixa) for coluna, faixa in (faixas or {}).items()},
+    }
+
+
+def combinar_filtros(*especificacoes):
+    """AND de especificações: interseção das categorias e das faixas de uma mesma coluna"""
+    categorias, faixas = {}, {}
+    for especificacao in especificacoes:
+        for coluna, valores in especificacao['categorias'].items():
+            if coluna in categorias:
+                aceitos = set(valores)
+                valores = [valor for valor in categorias[coluna] if valor in aceitos]
+            categorias[coluna] = list(valores)
+        for coluna, (minimo, maximo) in especificacao['faixas'].items():
+            if coluna in faixas:
+                minimo, maximo = max(minimo, faixas[coluna][0]), min(maximo, faixas[coluna][1])
+            faixas[coluna] = (minimo, maximo)
+    return especificacao_filtros(categorias, faixas)
+
+
+def avaliar_filtros(df, indice, especificacao):
+    """Posições (em ordem crescente) das linhas de ``df`` que atendem à especificação, em uma passada"""
+    filtros, faixas = {}, {}
+    mascara = None
+
+    def restringir(selecao):
+        nonlocal mascara
+        mascara = selecao if mascara is None else mascara & selecao
+
+    for coluna, valores in especificacao['categorias'].items():
+        serie = df[coluna]
+        if coluna in indice['bitsets']:
+            filtros[coluna] = codigos_categorias(serie, valores)
+        elif isinstance(serie.dtype, pd.CategoricalDtype):
+            restringir(np.isin(serie.cat.codes.to_numpy(), codigos_categorias(serie, valores)))
+        else:
+            restringir(serie.isin(valores).to_numpy())
+
+    for coluna, (minimo, maximo) in especificacao['faixas'].items():
+        if coluna in indice['ordens']:
+            faixas[coluna] = (minimo, maximo)
+        else:
+            valores = df[coluna].to_numpy()
+            restringir((valores >= minimo) & (valores <= maximo))
+
+    return posicoes_filtradas(indice, filtros, mascara, faixas)
+
+
+def coletar(df, posicoes, colunas=None):
+    """Linhas selecionadas de ``df`` em uma única coleta, opcionalmente só das colunas pedidas"""
+    if colunas is None:
+        return df.take(posicoes)
+    return df.iloc[posicoes, [df.columns.get_loc(coluna) for coluna in colunas]]
+
+
+def chave_filtros(especificacao):
+    """Forma canônica (hashable) da especificação: colunas e valores ordenados, limites como float"""
+    categorias = tuple(sorted(
+        (coluna, tuple(sorted(set(valores), key=str))) for coluna, valores in especificacao['categorias'].items()
+    ))
+    faixas = tuple(sorted(
+        (coluna, (float(minimo), float(maximo))) for coluna, (minimo, maximo) in especificacao['faixas'].items()
+    ))
+    return categorias, faixas
+
+
+def criar_cache_filtros(max_entradas=MAX_ENTRADAS_CACHE, max_bytes=MAX_BYTES_CACHE):
+    """Cache LRU de posições filtradas, seguro para sessões em threads diferentes"""
+    return {
+        'entradas': OrderedDict(),
+        'max_entradas': max_entradas,
+        'max_bytes': max_bytes,
+        'bytes': 0,
+        'acertos': 0,
+        'faltas': 0,
+        'remocoes': 0,
+        'trava': threading.Lock(),
+    }
+
+
+def _guardar(cache, chave, posicoes):
+    if posicoes.nbytes > cache['max_bytes'] or chave in cache['entradas']:
+        return
+    cache['entradas'][chave] = posicoes
+    cache['bytes'] += posicoes.nbytes
+    while len(cache['entradas']) > cache['max_entradas'] or cache['bytes'] > cache['max_bytes']:
+        _, removidas = cache['entradas'].popitem(last=False)
+        cache['bytes'] -= removidas.nbytes
+        cache['remocoes'] += 1
+
+
+def avaliar_filtros_em_cache(cache, df, indice, especificacao):
+    """
+    ``avaliar_filtros`` com cache: posições já calculadas para a mesma seleção são reaproveitadas.
+
+    As posições devolvidas são somente leitura, pois são compartilhadas entre sessões.
+    """
+    chave = chave_filtros(especificacao)
+    with cache['trava']:
+        posicoes = cache['entradas'].get(chave)
+        if posicoes is not None:
+            cache['entradas'].move_to_end(chave)
+            cache['acertos'] += 1
+            return posicoes
+        cache['faltas'] += 1
+
+    # Avaliado fora da trava para não serializar sessões com filtros diferentes
+    posicoes = avaliar_filtros(df, indice, especificacao)
+    posicoes.flags.writeable = False
+    with cache['trava']:
+        _guardar(cache, chave, posicoes)
+    return posicoes
+
+
+def estatisticas_cache(cache):
+    """Acertos, faltas, remoções, entradas, bytes ocupados e taxa de acerto do cache"""
+    with cache['trava']:
+        consultas = cache['acertos'] + cache['faltas']
+        return {
+            'acertos': cache['acertos'],
+            'faltas': cache['faltas'],
+            'remocoes': cache['remocoes'],
+            'entradas': len(cache['entradas']),
+            'bytes': cache['bytes'],
+            'taxa_acerto': cache['acertos'] / consultas if consultas else 0.0,
+        }
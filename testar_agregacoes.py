@@ -0,0 +1,130 @@
+"""
+Script de teste para as agregações por grupo (agregacoes.py).
+Compara cada agregação com o groupby equivalente do pandas, sobre linhas e sobre contagens do cubo.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from agregacoes import contar_por, media_por, percentual_no_grupo, proporcao, taxa_por
+from cubo_metricas import construir_cubo, contagens_por
+from dados_teste import carregar_dataset
+
+
+def testar_linhas():
+    print("🧪 Testando agregações sobre as linhas...")
+    df = carregar_dataset()
+    for grupos in ['Genero', ['Nivel_Atividade_Fisica', 'Qualidade_Dieta'], ['Ano_Diagnostico', 'Regiao']]:
+        esperado = df.groupby(grupos, observed=True)
+
+        contagens = contar_por(df, grupos)
+        if not contagens.equals(esperado.size().reset_index(name='Contagem')):
+            print(f"❌ Contagens diferentes por {grupos}")
+            return False
+
+        taxas = taxa_por(df, grupos, 'Tem_Cancer')
+        taxa_esperada = esperado['Tem_Cancer'].apply(lambda x: x.mean() * 100).to_numpy()
+        if not np.allclose(taxas['Taxa'], taxa_esperada) or not (taxas['Total'] == contagens['Contagem']).all():
+            print(f"❌ Taxa de câncer diferente por {grupos}")
+            return False
+
+        medias = media_por(df, grupos, ['Idade', 'IMC'])
+        if not np.allclose(medias[['Idade', 'IMC']], esperado[['Idade', 'IMC']].mean().to_numpy()):
+            print(f"❌ Médias diferentes por {grupos}")
+            return False
+
+    if not np.isclose(proporcao(df, 'Tem_Cancer'), df['Tem_Cancer'].mean()):
+        print("❌ Proporção diferente da média do indicador")
+        return False
+    print("✅ Contagens, taxas, médias e proporção idênticas ao groupby")
+    return True
+
+
+def testar_ausentes():
+    print("\n🧪 Testando grupos e valores ausentes...")
+    df = pd.DataFrame({
+        'Grupo': pd.Categorical(['a', 'b', None, 'a', 'c'], categories=['c', 'a', 'b']),
+        'Valor': [1.0, np.nan, 5.0, 3.0, np.nan],
+        'Caso': [True, False, True, False, True],
+    })
+    medias = media_por(df, 'Grupo', 'Valor')
+    esperado = df.groupby('Grupo', observed=True)['Valor'].mean()
+    if list(medias['Grupo']) != list(esperado.index) or not np.allclose(medias['Valor'], esperado, equal_nan=True):
+        print(f"❌ Médias com ausentes: {medias.to_dict('list')}")
+        return False
+    taxas = taxa_por(df, 'Grupo', 'Caso')
+    if list(taxas['Total']) != [1, 2, 1] or list(taxas['Casos']) != [1, 1, 0]:
+        print(f"❌ Taxas com ausentes: {taxas.to_dict('list')}")
+        return False
+    print("✅ Linhas com grupo ausente ignoradas e médias só sobre valores presentes")
+    return True
+
+
+def testar_cubo():
+    print("\n🧪 Testando agregações ponderadas sobre o cubo...")
+    df = carregar_dataset()
+    por_ano = contagens_por(construir_cubo(df), ['Ano_Diagnostico', 'Status_Tabagismo', 'Idade'])
+
+    idade = media_por(por_ano, 'Ano_Diagnostico', 'Idade', pesos='Contagem')
+    if not np.allclose(idade['Idade'], df.groupby('Ano_Diagnostico')['Idade'].mean().to_numpy()):
+        print("❌ Idade média ponderada diferente")
+        return False
+
+    por_status = contar_por(por_ano, ['Ano_Diagnostico', 'Status_Tabagismo'], pesos='Contagem')
+    esperado = df.groupby(['Ano_Diagnostico', 'Status_Tabagismo'], observed=True).size()
+    if not np.array_equal(por_status['Contagem'].to_numpy(), esperado.to_numpy()):
+        print("❌ Contagens ponderadas diferentes")
+        return False
+
+    percentual = percentual_no_grupo(por_status, 'Ano_Diagnostico', 'Contagem')
+    percentual_esperado = (esperado / esperado.groupby(level=0).transform('sum') * 100).to_numpy()
+    if not np.allclose(percentual, percentual_esperado):
+        print("❌ Percentuais no ano diferentes")
+        return False
+    print("✅ Médias, contagens e percentuais ponderados pelas contagens do cubo")
+    return True
+
+
+def testar_desempenho():
+    print("\n🧪 Comparando com groupby().agg(lambda)...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 100)].reset_index(drop=True)
+    grupos = ['Nivel_Atividade_Fisica', 'Qualidade_Dieta']
+
+    inicio = time.perf_counter()
+    grande.groupby(grupos, observed=True).agg({'Estagio_Cancer_Pulmao': lambda x: (x != 'Sem Câncer').mean() * 100})
+    tempo_lambda = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    taxa_por(grande, grupos, 'Tem_Cancer')
+    tempo_bincount = time.perf_counter() - inicio
+
+    print(f"✅ {len(grande)} linhas: lambda {tempo_lambda * 1000:.1f} ms, bincount {tempo_bincount * 1000:.1f} ms "
+          f"({tempo_lambda / tempo_bincount:.0f}x)")
+    return tempo_bincount < tempo_lambda
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DAS AGREGAÇÕES POR GRUPO")
+    print("=" * 60)
+
+    sucesso_linhas = testar_linhas()
+    sucesso_ausentes = testar_ausentes()
+    sucesso_cubo = testar_cubo()
+    sucesso_desempenho = testar_desempenho()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Agregações sobre linhas: {'PASSOU' if sucesso_linhas else 'FALHOU'}")
+    print(f"✅ Ausentes: {'PASSOU' if sucesso_ausentes else 'FALHOU'}")
+    print(f"✅ Agregações ponderadas: {'PASSOU' if sucesso_cubo else 'FALHOU'}")
+    print(f"✅ Desempenho: {'PASSOU' if sucesso_desempenho else 'FALHOU'}")
+
+    if sucesso_linhas and sucesso_ausentes and sucesso_cubo and sucesso_desempenho:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
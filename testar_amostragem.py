@@ -0,0 +1,97 @@
+"""
+Script de teste para a amostragem dos gráficos de dispersão (amostragem.py).
+Verifica o orçamento de pontos, a presença de todos os estratos e dos outliers extremos e o determinismo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from amostragem import nota_amostra, posicoes_amostra, prioridade_outliers
+from dados_teste import carregar_dataset
+
+COLUNAS_OUTLIERS = ('Idade', 'Cigarros_Por_Dia', 'Anos_Fumando')
+
+
+def testar_orcamento():
+    print("🧪 Testando orçamento de pontos e estratos...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 20)].reset_index(drop=True)
+    # Um estágio raro: só três pacientes no recorte
+    raros = np.flatnonzero(grande['Estagio_Cancer_Pulmao'] == 'Estágio IV')[3:]
+    grande = grande.drop(index=raros).reset_index(drop=True)
+
+    posicoes = posicoes_amostra(grande, 2000, ('Estagio_Cancer_Pulmao',), COLUNAS_OUTLIERS)
+    if len(posicoes) > 2000 or not np.all(np.diff(posicoes) > 0):
+        print(f"❌ Amostra com {len(posicoes)} posições ou fora de ordem")
+        return False
+    amostra = grande.iloc[posicoes]
+    estagios = set(grande['Estagio_Cancer_Pulmao'].dropna().unique())
+    if set(amostra['Estagio_Cancer_Pulmao'].dropna().unique()) != estagios:
+        print("❌ Algum estágio do câncer ficou fora da amostra")
+        return False
+    if (amostra['Estagio_Cancer_Pulmao'] == 'Estágio IV').sum() != 3:
+        print("❌ O estágio raro deveria manter todos os pacientes")
+        return False
+    # Orçamento menor que o número de estratos (gênero × estágio): o limite continua valendo
+    estratos = ('Genero', 'Estagio_Cancer_Pulmao')
+    for orcamento in range(1, 12):
+        pequena = posicoes_amostra(grande, orcamento, estratos)
+        if len(pequena) > orcamento:
+            print(f"❌ Orçamento de {orcamento} pontos devolveu {len(pequena)} posições")
+            return False
+    if len(posicoes_amostra(grande, 0, estratos)) != 0:
+        print("❌ Orçamento zero deveria devolver uma amostra vazia")
+        return False
+    if len(posicoes_amostra(df, len(df))) != len(df):
+        print("❌ Dentro do orçamento todas as linhas deveriam ser mantidas")
+        return False
+    print(f"✅ {len(posicoes)} de {len(grande)} linhas, com os {len(estagios)} estágios")
+    return True
+
+
+def testar_outliers():
+    print("\n🧪 Testando outliers e determinismo...")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Grupo': rng.choice(['A', 'B'], 50_000),
+        'Normal': rng.normal(size=50_000),
+        'Cauda_Longa': rng.lognormal(size=50_000),
+    })
+    prioridade = prioridade_outliers(df, ['Normal', 'Cauda_Longa'])
+    extremos = [df['Normal'].idxmin(), df['Normal'].idxmax(), df['Cauda_Longa'].idxmax()]
+    if not np.all(prioridade[extremos] == 0):
+        print("❌ Os extremos de cada coluna deveriam ter a maior prioridade")
+        return False
+
+    posicoes = posicoes_amostra(df, 1000, ('Grupo',), ['Normal', 'Cauda_Longa'])
+    if not set(extremos) <= set(posicoes):
+        print("❌ Os extremos de todas as colunas deveriam estar na amostra")
+        return False
+    if not np.array_equal(posicoes, posicoes_amostra(df, 1000, ('Grupo',), ['Normal', 'Cauda_Longa'])):
+        print("❌ A mesma entrada deveria gerar a mesma amostra")
+        return False
+    if nota_amostra(1000, 50_000) != "1.000 de 50.000 pontos exibidos":
+        print(f"❌ Nota inesperada: {nota_amostra(1000, 50_000)}")
+        return False
+    print(f"✅ {len(posicoes)} pontos, extremos incluídos e amostra repetível")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DA AMOSTRAGEM DOS GRÁFICOS DE DISPERSÃO")
+    print("=" * 60)
+
+    sucesso_orcamento = testar_orcamento()
+    sucesso_outliers = testar_outliers()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Orçamento e estratos: {'PASSOU' if sucesso_orcamento else 'FALHOU'}")
+    print(f"✅ Outliers e determinismo: {'PASSOU' if sucesso_outliers else 'FALHOU'}")
+
+    if sucesso_orcamento and sucesso_outliers:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
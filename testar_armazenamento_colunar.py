@@ -0,0 +1,216 @@
+"""
+Script de teste para o cache colunar (Parquet/Feather) do carregamento de dados.
+Verifica a criação do cache, o reaproveitamento e a reconstrução quando o CSV muda,
+além da ingestão em blocos, da anexação incremental e da verificação por hash.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import armazenamento_colunar
+from armazenamento_colunar import cache_valido, caminho_cache, carregar_com_cache, ingerir_csv_em_blocos, ler_colunar
+from esquema_dados import dtypes_leitura
+from localizacao import ESQUEMA_NEUTRO, aplicar_esquema_neutro
+
+
+def comparar(df, esperado):
+    # O formato colunar devolve None (e não NaN) nas colunas de texto vazias
+    pd.testing.assert_frame_equal(df.fillna(np.nan), esperado.fillna(np.nan))
+
+
+def testar_cache_colunar(formato):
+    print(f"🧪 Testando cache colunar ({formato})...")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        caminho_csv = os.path.join(diretorio, 'Lung_Cancer_Trends_Realistic.csv')
+        shutil.copy('Lung_Cancer_Trends_Realistic.csv', caminho_csv)
+        df_original = pd.read_csv(caminho_csv)
+
+        # Primeira leitura: cria o cache
+        df = carregar_com_cache(caminho_csv, formato=formato)
+        if not os.path.exists(caminho_cache(caminho_csv, formato)):
+            print("❌ Arquivo colunar não foi criado")
+            return False
+        comparar(df, df_original)
+        print("✅ Cache criado e idêntico ao CSV")
+
+        # Segunda leitura: usa o cache
+        if not cache_valido(caminho_csv, formato):
+            print("❌ Cache deveria ser válido")
+            return False
+        comparar(carregar_com_cache(caminho_csv, formato=formato), df_original)
+        print("✅ Cache reaproveitado")
+
+        # Alterar o CSV: o cache deve ser reconstruído
+        time.sleep(0.01)
+        df_original.head(100).to_csv(caminho_csv, index=False)
+        if cache_valido(caminho_csv, formato):
+            print("❌ Cache deveria ter sido invalidado")
+            return False
+        df = carregar_com_cache(caminho_csv, formato=formato)
+        if len(df) != 100:
+            print(f"❌ Cache não foi reconstruído: {len(df)} linhas")
+            return False
+        print("✅ Cache reconstruído após alteração do CSV")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar cache colunar: {e}")
+        return False
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def testar_ingestao_em_blocos(formato):
+    print(f"\n🧪 Testando ingestão em blocos ({formato})...")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        esperado = aplicar_esquema_neutro(pd.read_csv('Lung_Cancer_Trends_Realistic.csv',
+                                                      dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+        caminho_saida = os.path.join(diretorio, f'dataset.{formato}')
+        linhas = ingerir_csv_em_blocos('Lung_Cancer_Trends_Realistic.csv', caminho_saida, formato,
+                                       transformar=aplicar_esquema_neutro, tamanho_bloco=700,
+                                       dtype=dtypes_leitura(ESQUEMA_NEUTRO))
+        if linhas != len(esperado):
+            print(f"❌ {linhas} linhas gravadas, esperado {len(esperado)}")
+            return False
+        comparar(ler_colunar(caminho_saida, formato), esperado)
+        print(f"✅ {linhas} linhas em blocos de 700, idênticas à leitura completa")
+
+        # Um valor que não cabe no tipo fixo deve ser rejeitado, não truncado
+        try:
+            ingerir_csv_em_blocos('Lung_Cancer_Trends_Realistic.csv', caminho_saida, formato,
+                                  tamanho_bloco=700, tipos_fixos={'Diagnosis_Year': 'int8'})
+            print("❌ Overflow de tipo não detectado")
+            return False
+        except ValueError:
+            print("✅ Overflow de tipo detectado")
+
+        # Valores fora do esquema diferentes em cada bloco: as categorias são unificadas
+        caminho_csv = os.path.join(diretorio, 'extras.csv')
+        extras = pd.read_csv('Lung_Cancer_Trends_Realistic.csv', nrows=5)
+        extras.loc[1, 'Gender'] = 'Other'
+        extras.loc[3, 'Gender'] = 'X'
+        extras.to_csv(caminho_csv, index=False)
+        ingerir_csv_em_blocos(caminho_csv, caminho_saida, formato, transformar=aplicar_esquema_neutro,
+                              tamanho_bloco=2, dtype=dtypes_leitura(ESQUEMA_NEUTRO))
+        comparar(ler_colunar(caminho_saida, formato),
+                 aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO))))
+        print("✅ Blocos com valores fora do esquema diferentes gravados com as categorias unificadas")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar ingestão em blocos: {e}")
+        return False
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def testar_atualizacao_incremental():
+    print("\n🧪 Testando atualização incremental e hash de conteúdo...")
+
+    diretorio = tempfile.mkdtemp()
+    construir_original = armazenamento_colunar.construir_cache
+    reconstrucoes = []
+
+    def construir_contando(*args, **kwargs):
+        reconstrucoes.append(1)
+        return construir_original(*args, **kwargs)
+
+    armazenamento_colunar.construir_cache = construir_contando
+    try:
+        completo = pd.read_csv('Lung_Cancer_Trends_Realistic.csv')
+        caminho_csv = os.path.join(diretorio, 'dados.csv')
+        completo.head(2000).to_csv(caminho_csv, index=False)
+        opcoes = dict(transformar=aplicar_esquema_neutro, com_hash=True, tamanho_bloco=500,
+                      dtype=dtypes_leitura(ESQUEMA_NEUTRO))
+
+        carregar_com_cache(caminho_csv, **opcoes)
+
+        # Novas linhas no final do CSV: apenas elas devem ser lidas
+        completo.tail(1000).to_csv(caminho_csv, index=False, header=False, mode='a')
+        df = carregar_com_cache(caminho_csv, **opcoes)
+        esperado = aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+        comparar(df, esperado)
+        if len(reconstrucoes) != 1:
+            print(f"❌ Cache reconstruído {len(reconstrucoes)} vezes, esperado 1")
+            return False
+        print(f"✅ {len(df)} linhas após anexar 1000 linhas sem reconstruir o cache")
+
+        # Mesmo conteúdo com nova data de modificação: o hash mantém o cache válido
+        time.sleep(0.01)
+        shutil.copy(caminho_csv, caminho_csv + '.copia')
+        os.replace(caminho_csv + '.copia', caminho_csv)
+        if not cache_valido(caminho_csv, 'parquet', aplicar_esquema_neutro, True,
+                            dtype=dtypes_leitura(ESQUEMA_NEUTRO)):
+            print("❌ Cópia idêntica invalidou o cache com hash")
+            return False
+        print("✅ Cópia idêntica do CSV reconhecida pelo hash")
+
+        # Conteúdo diferente com o mesmo tamanho: detectado apenas pelo hash
+        conteudo = open(caminho_csv, encoding='utf-8').read().replace('Male', 'Xale', 1)
+        with open(caminho_csv, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        if cache_valido(caminho_csv, 'parquet', aplicar_esquema_neutro, True,
+                            dtype=dtypes_leitura(ESQUEMA_NEUTRO)):
+            print("❌ Alteração de conteúdo não detectada pelo hash")
+            return False
+        print("✅ Alteração de conteúdo detectada pelo hash")
+
+        # Linha editada longe do final e linhas novas anexadas: com hash, o cache é reconstruído por inteiro
+        completo.head(2000).to_csv(caminho_csv, index=False)
+        carregar_com_cache(caminho_csv, **opcoes)
+        antes = len(reconstrucoes)
+        conteudo = open(caminho_csv, encoding='utf-8').read()
+        primeira = completo['Patient_ID'].iloc[0]
+        conteudo = conteudo.replace(f"{primeira},{completo['Age'].iloc[0]},", f"{primeira},99,", 1)
+        with open(caminho_csv, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        completo.tail(100).to_csv(caminho_csv, index=False, header=False, mode='a')
+        df = carregar_com_cache(caminho_csv, **opcoes)
+        comparar(df, aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO))))
+        if df['Age'].iloc[0] != 99 or len(reconstrucoes) != antes + 1:
+            print("❌ Edição antes das linhas anexadas não reconstruiu o cache")
+            return False
+        print("✅ Edição no início do CSV seguida de novas linhas reconstrói o cache")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar atualização incremental: {e}")
+        return False
+    finally:
+        armazenamento_colunar.construir_cache = construir_original
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO CACHE COLUNAR")
+    print("=" * 60)
+
+    sucesso_parquet = testar_cache_colunar('parquet')
+    sucesso_feather = testar_cache_colunar('feather')
+    sucesso_blocos_parquet = testar_ingestao_em_blocos('parquet')
+    sucesso_blocos_feather = testar_ingestao_em_blocos('feather')
+    sucesso_incremental = testar_atualizacao_incremental()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Parquet: {'PASSOU' if sucesso_parquet else 'FALHOU'}")
+    print(f"✅ Feather: {'PASSOU' if sucesso_feather else 'FALHOU'}")
+    print(f"✅ Ingestão em blocos (Parquet): {'PASSOU' if sucesso_blocos_parquet else 'FALHOU'}")
+    print(f"✅ Ingestão em blocos (Feather): {'PASSOU' if sucesso_blocos_feather else 'FALHOU'}")
+    print(f"✅ Atualização incremental e hash: {'PASSOU' if sucesso_incremental else 'FALHOU'}")
+
+    if all([sucesso_parquet, sucesso_feather, sucesso_blocos_parquet, sucesso_blocos_feather, sucesso_incremental]):
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,56 @@
+"""
+Script de teste para o benchmark headless das páginas do dashboard.
+Executa uma combinação pequena da matriz e verifica o formato dos resultados.
+"""
+
+from benchmark_paginas import comparar_resultados, executar_benchmark
+
+
+def testar_benchmark():
+    print("🧪 Testando benchmark das páginas...")
+
+    try:
+        resultados = executar_benchmark(tamanhos=['fonte'], paginas=["🏠 Visão Geral"],
+                                        combinacoes=['sem_filtros', 'combinados'], repeticoes=1)
+    except Exception as e:
+        print(f"❌ Erro ao executar benchmark: {e}")
+        return False
+
+    medicoes = resultados['medicoes']
+    if len(medicoes) != 2 or any(medicao['excecoes'] for medicao in medicoes):
+        print(f"❌ Medições inesperadas: {medicoes}")
+        return False
+    for medicao in medicoes:
+        if not (medicao['tempo_mediano_s'] > 0 and medicao['pico_memoria_bytes'] > 0 and medicao['payload_bytes'] > 0):
+            print(f"❌ Métricas vazias em {medicao['filtros']}")
+            return False
+    # Menos linhas filtradas, gráficos menores
+    if medicoes[1]['payload_bytes'] >= medicoes[0]['payload_bytes']:
+        print("❌ Filtros não alteraram a saída")
+        return False
+    print("✅ Tempo, pico de memória e tamanho da saída medidos")
+
+    comparacao = comparar_resultados(resultados, resultados)
+    if not (comparacao['tempo_mediano_s_razao'] == 1).all():
+        print("❌ Comparação de uma execução com ela mesma deveria ter razão 1")
+        return False
+    print("✅ Comparação entre execuções")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO BENCHMARK DAS PÁGINAS")
+    print("=" * 60)
+
+    sucesso = testar_benchmark()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Benchmark: {'PASSOU' if sucesso else 'FALHOU'}")
+
+    if sucesso:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,67 @@
+"""
+Script de teste para as colunas derivadas calculadas na carga.
+Compara as categorias de IMC vetorizadas com a classificação linha a linha.
+"""
+
+import numpy as np
+import pandas as pd
+
+from colunas_derivadas import CATEGORIAS_IMC, categorias_imc, construir_colunas_derivadas
+from esquema_dados import compactar_numericos, dtypes_leitura
+from localizacao import ESQUEMA_NEUTRO, aplicar_esquema_neutro, localizar
+
+
+def categorizar_imc(imc):
+    if imc < 18.5:
+        return 'Abaixo do peso'
+    elif imc < 25:
+        return 'Peso normal'
+    elif imc < 30:
+        return 'Sobrepeso'
+    else:
+        return 'Obesidade'
+
+
+def testar_categorias_imc():
+    print("🧪 Testando categorias de IMC...")
+    neutro = aplicar_esquema_neutro(pd.read_csv('Lung_Cancer_Trends_Realistic.csv',
+                                                dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+    for compacto in (False, True):
+        df = localizar(neutro)
+        if compacto:
+            df, _ = compactar_numericos(df)
+        derivadas = construir_colunas_derivadas(df)
+        esperado = df['IMC'].apply(categorizar_imc)
+        if not (derivadas['Categoria_IMC'].astype(str) == esperado).all():
+            print(f"❌ Categorias diferentes (IMC {df['IMC'].dtype})")
+            return False
+        print(f"✅ {len(df)} linhas idênticas à classificação linha a linha (IMC {df['IMC'].dtype})")
+
+    # Limites exatos e ausentes
+    valores = np.array([18.4999, 18.5, 25, 29.999, 30, np.nan], dtype=np.float32)
+    if list(categorias_imc(valores)) != [categorizar_imc(valor) for valor in valores]:
+        print("❌ Limites das categorias incorretos")
+        return False
+    if list(categorias_imc(valores).categories) != CATEGORIAS_IMC:
+        print("❌ Ordem das categorias incorreta")
+        return False
+    print("✅ Limites exatos e ausentes como no if/elif")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DAS COLUNAS DERIVADAS")
+    print("=" * 60)
+
+    sucesso_imc = testar_categorias_imc()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Categorias de IMC: {'PASSOU' if sucesso_imc else 'FALHOU'}")
+
+    if sucesso_imc:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
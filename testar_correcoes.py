@@ -6,6 +6,8 @@ Este script testa especificamente a funcionalidade de faixas etárias personaliz
 import pandas as pd
 import plotly.express as px
 
+from localizacao import localizar
+
 def converter_intervalos_para_string(series):
     """Converte objetos Interval para strings legíveis para uso em gráficos"""
     if hasattr(series, 'dtype') and series.dtype.name == 'category':
@@ -17,9 +19,9 @@ def converter_intervalos_para_string(series):
 def testar_faixas_etarias():
     print("🧪 Testando correção de serialização JSON para faixas etárias...")
     
-    # Carregar dataset traduzido
+    # Carregar dataset (traduzido na leitura)
     try:
-        df = pd.read_csv('Dataset_Cancer_Pulmao_Traduzido.csv')
+        df = localizar(pd.read_csv('Lung_Cancer_Trends_Realistic.csv'))
         print("✅ Dataset carregado com sucesso")
     except FileNotFoundError:
         print("❌ Dataset não encontrado")
@@ -68,7 +70,7 @@ def testar_quartis():
     print("\n🧪 Testando pd.qcut (quartis)...")
     
     try:
-        df = pd.read_csv('Dataset_Cancer_Pulmao_Traduzido.csv')
+        df = localizar(pd.read_csv('Lung_Cancer_Trends_Realistic.csv'))
         df['Grupo_Idade_Quartis'] = pd.qcut(df['Idade'], 4, labels=['Q1', 'Q2', 'Q3', 'Q4'])
         
         dados_quartis = df.groupby(['Grupo_Idade_Quartis', 'Genero'], observed=True).size().reset_index(name='Contagem')
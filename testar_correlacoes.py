@@ -0,0 +1,111 @@
+"""
+Script de teste para o ranking de correlações com o indicador de câncer (correlacoes.py).
+Compara a passada vetorizada com Series.corr coluna a coluna.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from correlacoes import correlacoes_com_indicador, matriz_fatores, ranking_correlacoes
+from dados_teste import carregar_dataset
+
+FATORES_NUMERICOS = ['Idade', 'Anos_Fumando', 'Cigarros_Por_Dia', 'IMC']
+FATORES_ORDINAIS = {
+    'Nivel_Poluicao_Ar': {'Baixo': 1, 'Moderado': 2, 'Alto': 3},
+    'Qualidade_Dieta': {'Ruim': 1, 'Média': 2, 'Boa': 3},
+}
+
+
+def correlacao_por_coluna(fatores, indicador):
+    indicador = pd.Series(np.asarray(indicador, dtype=float), index=fatores.index)
+    return pd.Series({coluna: fatores[coluna].corr(indicador) for coluna in fatores.columns})
+
+
+def testar_dataset():
+    print("🧪 Testando correlações do dataset...")
+    df = carregar_dataset()
+    fatores = matriz_fatores(df, FATORES_NUMERICOS, FATORES_ORDINAIS)
+    if list(fatores.columns) != FATORES_NUMERICOS + list(FATORES_ORDINAIS):
+        print(f"❌ Fatores inesperados: {list(fatores.columns)}")
+        return False
+    obtidas = correlacoes_com_indicador(fatores, df['Tem_Cancer'])
+    esperadas = correlacao_por_coluna(fatores, df['Tem_Cancer'])
+    if not np.allclose(obtidas, esperadas):
+        print(f"❌ Correlações diferentes:\n{pd.DataFrame({'obtidas': obtidas, 'esperadas': esperadas})}")
+        return False
+
+    ranking = ranking_correlacoes(fatores, df['Tem_Cancer'])
+    if not ranking['Correlacao'].is_monotonic_increasing or len(ranking) != len(fatores.columns):
+        print(f"❌ Ranking fora de ordem:\n{ranking}")
+        return False
+    print(f"✅ {len(fatores.columns)} correlações iguais às de Series.corr; maior: {ranking['Fator'].iloc[-1]}")
+    return True
+
+
+def testar_casos_limite():
+    print("\n🧪 Testando ausentes e fatores sem variação...")
+    fatores = pd.DataFrame({
+        'Com_Ausentes': [1.0, np.nan, 3.0, 4.0, np.nan, 2.0],
+        'Constante': [0.1] * 6,
+        'Um_Valor': [np.nan, np.nan, 5.0, np.nan, np.nan, np.nan],
+        'Indicador_Constante_Nas_Presentes': [1.0, np.nan, 2.0, np.nan, 3.0, np.nan],
+    })
+    indicador = np.array([True, False, True, False, True, False])
+    obtidas = correlacoes_com_indicador(fatores, indicador)
+    if not np.isclose(obtidas['Com_Ausentes'], correlacao_por_coluna(fatores, indicador)['Com_Ausentes']):
+        print("❌ Correlação com ausentes diferente de Series.corr")
+        return False
+    if not obtidas[['Constante', 'Um_Valor', 'Indicador_Constante_Nas_Presentes']].isna().all():
+        print(f"❌ Correlações indefinidas deveriam ser NaN: {obtidas.to_dict()}")
+        return False
+    if list(ranking_correlacoes(fatores, indicador)['Fator']) != ['Com Ausentes']:
+        print("❌ Ranking deveria ter só o fator com correlação definida")
+        return False
+    if len(ranking_correlacoes(fatores.iloc[:0], indicador[:0])) != 0:
+        print("❌ Recorte vazio deveria gerar ranking vazio")
+        return False
+    print("✅ Ausentes ignorados por fator e correlações indefinidas descartadas")
+    return True
+
+
+def testar_desempenho():
+    print("\n🧪 Comparando com Series.corr coluna a coluna...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 100)].reset_index(drop=True)
+    fatores = matriz_fatores(grande, FATORES_NUMERICOS, FATORES_ORDINAIS)
+
+    inicio = time.perf_counter()
+    correlacao_por_coluna(fatores, grande['Tem_Cancer'])
+    tempo_colunas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    correlacoes_com_indicador(fatores, grande['Tem_Cancer'])
+    tempo_vetorizado = time.perf_counter() - inicio
+
+    print(f"✅ {len(grande)} linhas × {len(fatores.columns)} fatores: por coluna {tempo_colunas * 1000:.1f} ms, "
+          f"vetorizado {tempo_vetorizado * 1000:.1f} ms")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO RANKING DE CORRELAÇÕES")
+    print("=" * 60)
+
+    sucesso_dataset = testar_dataset()
+    sucesso_limites = testar_casos_limite()
+    sucesso_desempenho = testar_desempenho()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Correlações do dataset: {'PASSOU' if sucesso_dataset else 'FALHOU'}")
+    print(f"✅ Casos limite: {'PASSOU' if sucesso_limites else 'FALHOU'}")
+    print(f"✅ Desempenho: {'PASSOU' if sucesso_desempenho else 'FALHOU'}")
+
+    if sucesso_dataset and sucesso_limites and sucesso_desempenho:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,105 @@
+"""
+Script de teste para o cubo de contagens das métricas.
+Compara as métricas tiradas do cubo com as mesmas contas feitas sobre as linhas.
+"""
+
+import numpy as np
+
+from agregacoes import proporcao, taxa_por
+from cubo_metricas import construir_cubo, contagens_por, fatiar_cubo, media_dimensao, total_cubo
+from dados_teste import carregar_dataset
+from motor_filtros import especificacao_filtros
+
+
+def filtrar_linhas(df, especificacao):
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valores in especificacao['categorias'].items():
+        mascara &= df[coluna].isin(valores).to_numpy()
+    for coluna, (minimo, maximo) in especificacao['faixas'].items():
+        mascara &= ((df[coluna] >= minimo) & (df[coluna] <= maximo)).to_numpy()
+    return df[mascara]
+
+
+def testar_construcao():
+    print("🧪 Testando construção do cubo...")
+    # Sem normalizar os desfechos, o estágio "None" da fonte fica ausente
+    df = carregar_dataset(normalizar=False)
+    cubo = construir_cubo(df)
+    em_blocos = construir_cubo(df, tamanho_bloco=700)
+    if total_cubo(cubo) != len(df) or not np.array_equal(cubo['contagens'], em_blocos['contagens']):
+        print("❌ Contagens do cubo não batem com as linhas")
+        return False
+    # Estágio vazio tem posição própria no eixo
+    por_estagio = contagens_por(cubo, ['Estagio_Cancer_Pulmao'])
+    if por_estagio['Contagem'][por_estagio['Estagio_Cancer_Pulmao'].isna()].sum() != df['Estagio_Cancer_Pulmao'].isna().sum():
+        print("❌ Ausentes não contados")
+        return False
+    print(f"✅ Cubo {cubo['contagens'].shape} com {total_cubo(cubo)} pacientes ({cubo['contagens'].nbytes} bytes)")
+    return True
+
+
+def testar_metricas():
+    print("\n🧪 Testando métricas do cubo contra as linhas...")
+    df = carregar_dataset()
+    cubo = construir_cubo(df)
+    especificacoes = [
+        especificacao_filtros(),
+        especificacao_filtros({'Genero': ['Feminino']}, {'Idade': (40, 60)}),
+        especificacao_filtros({'Regiao': ['Norte', 'Sul'], 'Status_Tabagismo': ['Atual']},
+                              {'Ano_Diagnostico': (2005, 2015)}),
+    ]
+    for especificacao in especificacoes:
+        fatia = fatiar_cubo(cubo, especificacao)
+        linhas = filtrar_linhas(df, especificacao)
+        por_estagio = contagens_por(fatia, ['Estagio_Cancer_Pulmao'])
+        taxa_cancer = proporcao(por_estagio, por_estagio['Estagio_Cancer_Pulmao'] != 'Sem Câncer', pesos='Contagem')
+        if total_cubo(fatia) != len(linhas) or not np.isclose(
+                taxa_cancer, linhas['Tem_Cancer'].mean()):
+            print(f"❌ Total ou taxa de câncer diferentes para {especificacao}")
+            return False
+        if not np.isclose(media_dimensao(fatia, 'Idade'), linhas['Idade'].mean()):
+            print(f"❌ Idade média diferente para {especificacao}")
+            return False
+
+        por_ano = contagens_por(fatia, ['Ano_Diagnostico', 'Status_Sobrevivencia'])
+        sobrevivencia = taxa_por(por_ano, 'Ano_Diagnostico', por_ano['Status_Sobrevivencia'] == 'Vivo', pesos='Contagem')
+        esperado = linhas.groupby('Ano_Diagnostico')['Sobrevivente'].mean() * 100
+        if (list(sobrevivencia['Ano_Diagnostico']) != list(esperado.index)
+                or not np.allclose(sobrevivencia['Taxa'], esperado.to_numpy())):
+            print(f"❌ Série anual diferente para {especificacao}")
+            return False
+
+        por_tabagismo = contagens_por(fatia, ['Ano_Diagnostico', 'Status_Tabagismo']).dropna()
+        esperado = linhas.groupby(['Ano_Diagnostico', 'Status_Tabagismo'], observed=True).size()
+        if not np.array_equal(por_tabagismo['Contagem'].to_numpy(), esperado.to_numpy()):
+            print(f"❌ Contagens por ano e tabagismo diferentes para {especificacao}")
+            return False
+    print(f"✅ {len(especificacoes)} fatias idênticas às contas sobre as linhas")
+
+    try:
+        fatiar_cubo(cubo, especificacao_filtros({'Nivel_Renda': ['Alta']}))
+        print("❌ Filtro fora das dimensões deveria falhar")
+        return False
+    except KeyError:
+        print("✅ Filtro fora das dimensões rejeitado")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO CUBO DE MÉTRICAS")
+    print("=" * 60)
+
+    sucesso_construcao = testar_construcao()
+    sucesso_metricas = testar_metricas()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Construção: {'PASSOU' if sucesso_construcao else 'FALHOU'}")
+    print(f"✅ Métricas: {'PASSOU' if sucesso_metricas else 'FALHOU'}")
+
+    if sucesso_construcao and sucesso_metricas:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,146 @@
+"""
+Script de teste para o modo de dataset compartilhado (Arrow IPC mapeado em memória).
+Verifica que o conteúdo é preservado e que as colunas numéricas não são copiadas,
+nem mesmo na visão traduzida, também acima de 65.536 linhas (o tamanho padrão
+dos lotes do Feather).
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from dados_compartilhados import abrir_dataset_mapeado, caminho_compartilhado, carregar_compartilhado, publicar_dataset
+from esquema_dados import compactar_numericos, dtypes_leitura
+from localizacao import COLUNAS_NUMERICAS_NEUTRAS, ESQUEMA_NEUTRO, aplicar_esquema_neutro, localizar
+
+
+def testar_dataset_mapeado():
+    print("🧪 Testando dataset compartilhado mapeado em memória...")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        caminho_csv = os.path.join(diretorio, 'Lung_Cancer_Trends_Realistic.csv')
+        shutil.copy('Lung_Cancer_Trends_Realistic.csv', caminho_csv)
+        chamadas = []
+
+        def preparar():
+            chamadas.append(1)
+            df = aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+            return compactar_numericos(df, COLUNAS_NUMERICAS_NEUTRAS)
+
+        esperado, _ = preparar()
+        chamadas.clear()
+
+        df, relatorio = carregar_compartilhado(caminho_csv, preparar)
+        if not os.path.exists(caminho_compartilhado(caminho_csv)):
+            print("❌ Arquivo Arrow não foi publicado")
+            return False
+
+        # Segundo processo/sessão: apenas mapeia o arquivo publicado
+        df, relatorio = carregar_compartilhado(caminho_csv, preparar)
+        if len(chamadas) != 1:
+            print(f"❌ Dataset preparado {len(chamadas)} vezes")
+            return False
+        print("✅ Arquivo publicado uma vez e reaproveitado")
+
+        for coluna in ['Age', 'BMI', 'Diagnosis_Year']:
+            valores = df[coluna].to_numpy()
+            if valores.flags.writeable or valores.dtype != esperado[coluna].dtype:
+                print(f"❌ {coluna} foi copiada ({valores.dtype}, gravável={valores.flags.writeable})")
+                return False
+            if not np.array_equal(valores, esperado[coluna].to_numpy()):
+                print(f"❌ Valores alterados em {coluna}")
+                return False
+        print("✅ Colunas numéricas mapeadas sem cópia")
+
+        if not df['Lung_Cancer_Stage'].cat.ordered or len(relatorio) == 0:
+            print("❌ Esquema ou relatório de memória perdidos")
+            return False
+        print("✅ Esquema categórico e relatório de memória preservados")
+
+        # A visão em português reaproveita os mesmos arrays mapeados
+        df_pt = localizar(df)
+        if not np.shares_memory(df_pt['Idade'].to_numpy(), df['Age'].to_numpy()):
+            print("❌ Visão traduzida copiou as colunas numéricas")
+            return False
+        if df_pt['Status_Tabagismo'].cat.categories.tolist() != ['Nunca', 'Ex-fumante', 'Atual']:
+            print("❌ Categorias não traduzidas")
+            return False
+        print("✅ Visão traduzida sem cópia dos dados")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar dataset compartilhado: {e}")
+        return False
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def regioes_mapeadas(caminho):
+    """Faixas de endereços em que ``caminho`` está mapeado neste processo (Linux), ou None"""
+    if not os.path.exists('/proc/self/maps'):
+        return None
+    real = os.path.realpath(caminho)
+    with open('/proc/self/maps') as mapas:
+        return [tuple(int(endereco, 16) for endereco in linha.split()[0].split('-'))
+                for linha in mapas if linha.rstrip().endswith(real)]
+
+
+def testar_dataset_grande():
+    print("\n🧪 Testando dataset compartilhado acima de um lote do Feather...")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        caminho_csv = os.path.join(diretorio, 'Lung_Cancer_Trends_Realistic.csv')
+        shutil.copy('Lung_Cancer_Trends_Realistic.csv', caminho_csv)
+        df = aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+        df, _ = compactar_numericos(df, COLUNAS_NUMERICAS_NEUTRAS)
+        grande = df.iloc[np.tile(np.arange(len(df)), 25)].reset_index(drop=True)
+        if len(grande) <= 65_536:
+            print("❌ O dataset do teste deveria passar de um lote")
+            return False
+
+        caminho_arrow = publicar_dataset(grande, caminho_csv)
+        mapeado = abrir_dataset_mapeado(caminho_arrow)
+        regioes = regioes_mapeadas(caminho_arrow)
+        for coluna in COLUNAS_NUMERICAS_NEUTRAS:
+            valores = mapeado[coluna].to_numpy()
+            endereco = valores.__array_interface__['data'][0]
+            if valores.flags.writeable or (regioes is not None
+                                           and not any(inicio <= endereco < fim for inicio, fim in regioes)):
+                print(f"❌ {coluna} foi copiada para fora do arquivo mapeado")
+                return False
+            if not np.array_equal(valores, grande[coluna].to_numpy()):
+                print(f"❌ Valores alterados em {coluna}")
+                return False
+        print(f"✅ {len(grande)} linhas: colunas numéricas lidas direto do arquivo mapeado")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar dataset compartilhado grande: {e}")
+        return False
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO DATASET COMPARTILHADO")
+    print("=" * 60)
+
+    sucesso = testar_dataset_mapeado()
+    sucesso_grande = testar_dataset_grande()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Dataset mapeado: {'PASSOU' if sucesso else 'FALHOU'}")
+    print(f"✅ Dataset acima de um lote: {'PASSOU' if sucesso_grande else 'FALHOU'}")
+
+    if sucesso and sucesso_grande:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,223 @@
+"""
+Script de teste para a camada de dados dos gráficos (dados_graficos.py).
+Verifica que os resumos têm os mesmos totais das linhas e que o tamanho não cresce com o recorte,
+e que os resumos de box plot e violino batem com os quartis e a densidade calculados pelas linhas.
+"""
+
+import numpy as np
+
+from dados_graficos import (LIMITE_PONTOS_WEBGL, contagens_caminho, dados_dispersao, densidade_por_faixas,
+                            figura_densidade, grafico_distribuicao, histograma, modo_renderizacao, resumo_distribuicao)
+from dados_teste import carregar_dataset
+
+
+def testar_histograma():
+    print("🧪 Testando histogramas no servidor...")
+    df = carregar_dataset()
+    anos = df.loc[df['Anos_Fumando'] > 0, 'Anos_Fumando']
+    faixas = histograma(anos, 20)
+    if len(faixas) > 20 or faixas['Contagem'].sum() != len(anos):
+        print(f"❌ Faixas ou total inesperados: {len(faixas)} faixas, {faixas['Contagem'].sum()} valores")
+        return False
+    # Faixas inteiras: limites nos meios-inteiros e contagens iguais às de np.histogram com os mesmos limites
+    limites = np.append(faixas['Inicio'].to_numpy(), faixas['Fim'].iloc[-1])
+    if not (limites % 1 == 0.5).all() or not np.array_equal(np.histogram(anos, limites)[0], faixas['Contagem']):
+        print("❌ Faixas inteiras não alinhadas aos valores")
+        return False
+
+    imc = df['IMC'].to_numpy().astype(float)
+    imc[::7] = np.nan
+    faixas_imc = histograma(imc, 15)
+    if len(faixas_imc) != 15 or faixas_imc['Contagem'].sum() != (~np.isnan(imc)).sum():
+        print("❌ Histograma de valores reais deveria ignorar ausentes")
+        return False
+    if len(histograma(np.array([], dtype=float))) != 0:
+        print("❌ Histograma vazio deveria ter zero faixas")
+        return False
+    print(f"✅ {len(faixas)} faixas inteiras e {len(faixas_imc)} faixas reais com os totais das linhas")
+    return True
+
+
+def testar_caminho():
+    print("\n🧪 Testando contagens por caminho do sunburst...")
+    df = carregar_dataset()
+    caminho = ['Exposicao_Fumo_Passivo', 'Estagio_Cancer_Pulmao']
+    contagens = contagens_caminho(df, caminho)
+    esperado = df[caminho].dropna().astype(str).value_counts()
+    obtido = contagens.set_index(caminho)['Contagem']
+    if not obtido.sort_index().equals(esperado.sort_index().rename('Contagem')):
+        print("❌ Contagens por caminho diferentes das linhas")
+        return False
+    if not all(contagens[coluna].dtype == object for coluna in caminho):
+        print("❌ Rótulos do caminho deveriam ser texto")
+        return False
+    print(f"✅ {len(contagens)} caminhos com {contagens['Contagem'].sum()} pacientes")
+    return True
+
+
+def testar_tamanho_fixo():
+    print("\n🧪 Testando tamanho dos resumos com recortes maiores...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 50)].reset_index(drop=True)
+    caminho = ['Exposicao_Fumo_Passivo', 'Estagio_Cancer_Pulmao']
+    if (len(contagens_caminho(grande, caminho)) != len(contagens_caminho(df, caminho))
+            or len(histograma(grande['Anos_Fumando'])) != len(histograma(df['Anos_Fumando']))):
+        print("❌ O resumo cresceu com o número de linhas")
+        return False
+    print(f"✅ Mesmo número de faixas e caminhos para {len(df)} e {len(grande)} linhas")
+    return True
+
+
+def testar_resumo_distribuicao():
+    print("\n🧪 Testando quartis, bigodes, outliers e densidade por grupo...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 10)].reset_index(drop=True)
+    grupo, valor = 'Estagio_Cancer_Pulmao', 'Cigarros_Por_Dia'
+    resumo = resumo_distribuicao(grande[grupo], grande[valor].to_numpy(), max_outliers=50)
+    for linha in resumo['caixas'].itertuples(index=False):
+        valores = grande.loc[grande[grupo] == linha.Grupo, valor].dropna().to_numpy(dtype=float)
+        q1, mediana, q3 = np.percentile(valores, [25, 50, 75])
+        dentro = valores[(valores >= q1 - 1.5 * (q3 - q1)) & (valores <= q3 + 1.5 * (q3 - q1))]
+        if (linha.N != len(valores) or not np.allclose([linha.Q1, linha.Mediana, linha.Q3], [q1, mediana, q3])
+                or linha.Limite_Inferior != dentro.min() or linha.Limite_Superior != dentro.max()):
+            print(f"❌ Caixa de '{linha.Grupo}' diferente das linhas: {linha}")
+            return False
+        outliers = resumo['outliers'].loc[resumo['outliers']['Grupo'] == linha.Grupo, 'Valor']
+        fora = np.setdiff1d(valores, dentro)
+        if len(outliers) > 50 or (len(fora) and (outliers.min() != fora.min() or outliers.max() != fora.max())):
+            print(f"❌ Amostra de outliers de '{linha.Grupo}' sem os extremos ou acima do limite")
+            return False
+        densidade = resumo['densidades'][resumo['densidades']['Grupo'] == linha.Grupo]
+        area = np.trapezoid(densidade['Densidade'], densidade['Valor'])
+        if not 0.95 < area <= 1.0001:
+            print(f"❌ Densidade de '{linha.Grupo}' com área {area:.3f}")
+            return False
+    print(f"✅ {len(resumo['caixas'])} grupos com quartis de np.percentile e densidades de área ≈ 1")
+    return True
+
+
+def testar_modo_grafico():
+    print("\n🧪 Testando a troca automática entre pontos e resumo...")
+    df = carregar_dataset()
+    grande = df.iloc[np.tile(np.arange(len(df)), 10)].reset_index(drop=True)
+    pequeno = grafico_distribuicao(df, 'Genero', 'IMC', 'box', limite=len(df))
+    resumido = grafico_distribuicao(grande, 'Genero', 'IMC', 'violin', limite=len(df), box=True)
+    if len(pequeno.data[0].y) != (df['Genero'] == pequeno.data[0].name).sum():
+        print("❌ Abaixo do limite o box plot deveria ter os pontos originais")
+        return False
+    if any(traco.y is not None and len(traco.y) > 1000 for traco in resumido.data):
+        print("❌ Acima do limite o violino deveria ter só o resumo")
+        return False
+    print(f"✅ {len(df)} linhas com pontos; {len(grande)} linhas resumidas em {len(resumido.data)} traços")
+
+    # Categórica ordenada: resumo pela posição na escala, com os rótulos no eixo
+    ordinal = grafico_distribuicao(grande, 'Genero', 'Nivel_Poluicao_Ar', 'violin', limite=len(df), box=True)
+    if any(traco.y is not None and len(traco.y) > 1000 for traco in ordinal.data):
+        print("❌ Acima do limite a métrica ordinal deveria ter só o resumo")
+        return False
+    if list(ordinal.layout.yaxis.ticktext) != list(df['Nivel_Poluicao_Ar'].cat.categories):
+        print(f"❌ Rótulos do eixo inesperados: {ordinal.layout.yaxis.ticktext}")
+        return False
+    niveis = grande.assign(Nivel=grande['Nivel_Poluicao_Ar'].cat.codes + 1)
+    medianas = niveis.groupby('Genero', observed=True)['Nivel'].median()
+    caixas = {traco.name: traco.median[0] for traco in ordinal.data if traco.type == 'box'}
+    if any(caixas[str(genero)] != mediana for genero, mediana in medianas.items()):
+        print("❌ Medianas da métrica ordinal diferentes das calculadas pelas linhas")
+        return False
+    pequeno_ordinal = grafico_distribuicao(df, 'Genero', 'Nivel_Poluicao_Ar', 'box', limite=len(df))
+    if sum(len(traco.y) for traco in pequeno_ordinal.data) != len(df):
+        print("❌ Abaixo do limite a métrica ordinal deveria ter os pontos originais")
+        return False
+
+    # Categórica sem ordem: contagens por grupo em barras
+    barras = grafico_distribuicao(grande, 'Genero', 'Regiao', 'violin', limite=len(df), box=True)
+    if (any(traco.type != 'bar' for traco in barras.data)
+            or sum(sum(traco.y) for traco in barras.data) != len(grande)):
+        print("❌ Acima do limite a métrica sem ordem deveria virar contagens em barras")
+        return False
+    print("✅ Métrica ordinal resumida pela escala; métrica sem ordem em barras de contagem")
+    return True
+
+
+def testar_dispersao():
+    print("\n🧪 Testando os dados e o modo de renderização da dispersão...")
+    df = carregar_dataset()
+    if modo_renderizacao(LIMITE_PONTOS_WEBGL) != 'svg' or modo_renderizacao(LIMITE_PONTOS_WEBGL + 1) != 'webgl':
+        print("❌ A troca para WebGL deveria acontecer acima do limite")
+        return False
+    dados = dados_dispersao(df, ['Idade', 'IMC', 'Genero', 'IMC'])
+    if list(dados.columns) != ['Idade', 'IMC', 'Genero'] or not dados.index.equals(df.index):
+        print(f"❌ Colunas ou índice inesperados: {list(dados.columns)}")
+        return False
+    if dados['IMC'].dtype != np.float64 or dados['Idade'].dtype != df['Idade'].dtype:
+        print("❌ Só as colunas reais deveriam virar float64")
+        return False
+    if not np.allclose(dados['IMC'], df['IMC'], atol=1e-4) or '00000' in str(dados['IMC'].tolist()[:50]):
+        print("❌ IMC deveria ir para o gráfico arredondado, sem o ruído do float32")
+        return False
+    print(f"✅ WebGL acima de {LIMITE_PONTOS_WEBGL} pontos; {len(dados.columns)} colunas sem ruído de float32")
+    return True
+
+
+def testar_densidade():
+    print("\n🧪 Testando a grade de densidade com taxa de câncer...")
+    df = carregar_dataset()
+    densidade = densidade_por_faixas(df, ['IMC', 'Idade'], 'Tem_Cancer')
+    if densidade['Contagem'].sum() != len(df) or densidade['Casos'].sum() != df['Tem_Cancer'].sum():
+        print("❌ Totais da grade diferentes das linhas")
+        return False
+    # Mesmas células de np.histogram2d com os limites de histograma() em cada eixo
+    limites = [np.append(faixas['Inicio'].to_numpy(), faixas['Fim'].iloc[-1])
+               for faixas in (histograma(df['IMC'], 30), histograma(df['Idade'], 30))]
+    esperado, _, _ = np.histogram2d(df['IMC'].astype(float), df['Idade'], bins=limites)
+    if sorted(esperado[esperado > 0].astype(int)) != sorted(densidade['Contagem']):
+        print("❌ Contagens diferentes de np.histogram2d")
+        return False
+    taxa = densidade['Casos'] / densidade['Contagem'] * 100
+    if not np.allclose(densidade['Taxa'], taxa):
+        print("❌ Taxa por célula inconsistente")
+        return False
+
+    grande = df.iloc[np.tile(np.arange(len(df)), 50)].reset_index(drop=True)
+    tres_eixos = densidade_por_faixas(grande, ['Idade', 'IMC', 'Anos_Fumando'], 'Tem_Cancer', 15)
+    if len(tres_eixos) > 15 ** 3 or len(tres_eixos) != len(densidade_por_faixas(df, ['Idade', 'IMC', 'Anos_Fumando'],
+                                                                               'Tem_Cancer', 15)):
+        print("❌ A grade cresceu com o número de linhas")
+        return False
+    figura = figura_densidade(densidade, 'IMC', 'Idade', cor='Taxa')
+    if np.nansum(figura.data[0].customdata[:, :, 0]) != len(df):
+        print("❌ Mapa de calor sem todos os pacientes")
+        return False
+    print(f"✅ {len(densidade)} células 2D iguais às de np.histogram2d; {len(tres_eixos)} células 3D")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DA CAMADA DE DADOS DOS GRÁFICOS")
+    print("=" * 60)
+
+    sucesso_histograma = testar_histograma()
+    sucesso_caminho = testar_caminho()
+    sucesso_tamanho = testar_tamanho_fixo()
+    sucesso_resumo = testar_resumo_distribuicao()
+    sucesso_modo = testar_modo_grafico()
+    sucesso_dispersao = testar_dispersao()
+    sucesso_densidade = testar_densidade()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Histogramas: {'PASSOU' if sucesso_histograma else 'FALHOU'}")
+    print(f"✅ Caminhos do sunburst: {'PASSOU' if sucesso_caminho else 'FALHOU'}")
+    print(f"✅ Tamanho fixo: {'PASSOU' if sucesso_tamanho else 'FALHOU'}")
+    print(f"✅ Resumo de box plot e violino: {'PASSOU' if sucesso_resumo else 'FALHOU'}")
+    print(f"✅ Modo do gráfico: {'PASSOU' if sucesso_modo else 'FALHOU'}")
+    print(f"✅ Dados da dispersão: {'PASSOU' if sucesso_dispersao else 'FALHOU'}")
+    print(f"✅ Grade de densidade: {'PASSOU' if sucesso_densidade else 'FALHOU'}")
+
+    if (sucesso_histograma and sucesso_caminho and sucesso_tamanho and sucesso_resumo and sucesso_modo
+            and sucesso_dispersao and sucesso_densidade):
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
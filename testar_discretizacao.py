@@ -0,0 +1,136 @@
+"""
+Script de teste para a discretização vetorizada.
+Compara décadas, quartis e faixas iguais com pd.cut/pd.qcut e a formatação dos intervalos.
+"""
+
+import numpy as np
+import pandas as pd
+
+from discretizacao import (ROTULOS_QUARTIS, classificar, decadas, faixas_iguais, faixas_iguais_limites, quantis_ponderados,
+                           quartis)
+
+
+def converter_intervalos_para_string(series):
+    """Formatação usada pelo dashboard antes da discretização vetorizada"""
+    return series.apply(lambda x: f"{x.left:.0f}-{x.right:.0f}")
+
+
+def carregar_idades():
+    return pd.read_csv('Lung_Cancer_Trends_Realistic.csv', usecols=['Age'])['Age']
+
+
+def testar_faixas_iguais():
+    print("🧪 Testando faixas iguais...")
+    idades = carregar_idades()
+    rng = np.random.default_rng(0)
+    amostras = [idades, idades[idades < 40], pd.Series([50, 50, 50]), pd.Series([25, 26])]
+    amostras += [pd.Series(rng.integers(inicio, inicio + amplitude + 1, 200))
+                 for inicio, amplitude in zip(rng.integers(0, 80, 40), rng.integers(0, 60, 40))]
+    comparacoes = 0
+    for amostra in amostras:
+        for quantidade in range(3, 11):
+            esperado = converter_intervalos_para_string(pd.cut(amostra, bins=quantidade)).astype(str).to_numpy()
+            obtido = np.asarray(faixas_iguais(amostra, quantidade)).astype(str)
+            if not np.array_equal(esperado, obtido):
+                print(f"❌ Faixas diferentes com {quantidade} faixas: {esperado[:3]} vs {obtido[:3]}")
+                return False
+            comparacoes += 1
+    print(f"✅ {comparacoes} combinações idênticas ao pd.cut")
+
+    faixas_iguais(idades, 5)
+    acertos = faixas_iguais_limites.cache_info().hits
+    faixas_iguais(idades, 5)
+    if faixas_iguais_limites.cache_info().hits != acertos + 1:
+        print("❌ Rótulos deveriam ser reaproveitados")
+        return False
+    print("✅ Limites e rótulos reaproveitados entre chamadas")
+    return True
+
+
+def testar_quartis_e_decadas():
+    print("\n🧪 Testando quartis e décadas...")
+    idades = carregar_idades()
+    esperado = pd.qcut(idades, 4, labels=ROTULOS_QUARTIS).astype(str).to_numpy()
+    if not np.array_equal(np.asarray(quartis(idades)).astype(str), esperado):
+        print("❌ Quartis diferentes do pd.qcut")
+        return False
+
+    # Idades distintas com pesos = mesmos quartis das linhas
+    contagens = idades.value_counts()
+    ponderados = pd.Series(quartis(contagens.index, pesos=contagens.to_numpy()), index=contagens.index)
+    if not np.array_equal(ponderados.reindex(idades).astype(str).to_numpy(), esperado):
+        print("❌ Quartis ponderados diferentes")
+        return False
+    limites = quantis_ponderados(np.sort(contagens.index), contagens.sort_index().to_numpy(), [0, 0.5, 1])
+    if not np.allclose(limites, idades.quantile([0, 0.5, 1]).to_numpy()):
+        print("❌ Quantis ponderados diferentes")
+        return False
+    print("✅ Quartis idênticos ao pd.qcut, por linha e ponderados")
+
+    # Limites repetidos: descartados como em pd.qcut(..., duplicates='drop')
+    for valores in ([1, 1, 1, 1, 2], [1, 2, 2, 2, 2, 2, 3, 4]):
+        obtido = quartis(valores)
+        esperado_codigos = pd.qcut(valores, 4, labels=False, duplicates='drop')
+        if not np.array_equal(obtido.codes, esperado_codigos):
+            print(f"❌ Quartis com limites repetidos diferentes do pd.qcut: {list(obtido)}")
+            return False
+    # Uma única idade (ex.: filtro de 25 a 25 anos): todos em Q1
+    constante = quartis(np.array([25]), pesos=np.array([40]))
+    if list(constante) != ['Q1'] or list(constante.categories) != ['Q1']:
+        print(f"❌ Valores iguais deveriam ficar todos em Q1: {list(constante)}")
+        return False
+    print("✅ Limites repetidos descartados; valores iguais em Q1")
+
+    esperado = ((idades // 10) * 10).astype(str) + 's'
+    if not np.array_equal(np.asarray(decadas(idades)).astype(str), esperado.to_numpy()):
+        print("❌ Décadas diferentes")
+        return False
+    print("✅ Décadas")
+
+    categorias = classificar(np.array([1.0, 2.0, 2.5, 3.0, np.nan]), [2, 3], ['baixo', 'médio', 'alto'])
+    if list(categorias) != ['baixo', 'médio', 'médio', 'alto', 'alto']:
+        print(f"❌ Classificação por cortes incorreta: {list(categorias)}")
+        return False
+    print("✅ Classificação por cortes (valor igual ao corte sobe de faixa)")
+    return True
+
+
+def testar_vazio():
+    print("\n🧪 Testando recortes vazios...")
+    vazio = np.array([], dtype=np.int64)
+    resultados = {
+        'decadas': decadas(vazio),
+        'quartis': quartis(vazio, pesos=vazio),
+        'faixas_iguais': faixas_iguais(vazio, 5),
+    }
+    for nome, categorias in resultados.items():
+        if not isinstance(categorias, pd.Categorical) or len(categorias) != 0:
+            print(f"❌ {nome} deveria devolver um Categorical vazio")
+            return False
+    if not np.isnan(quantis_ponderados(vazio, vazio, [0, 0.5, 1])).all():
+        print("❌ Quantis ponderados sem valores deveriam ser NaN")
+        return False
+    print("✅ Décadas, quartis e faixas iguais vazios sem erro")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DA DISCRETIZAÇÃO VETORIZADA")
+    print("=" * 60)
+
+    sucesso_faixas = testar_faixas_iguais()
+    sucesso_quartis = testar_quartis_e_decadas()
+    sucesso_vazio = testar_vazio()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Faixas iguais: {'PASSOU' if sucesso_faixas else 'FALHOU'}")
+    print(f"✅ Quartis e décadas: {'PASSOU' if sucesso_quartis else 'FALHOU'}")
+    print(f"✅ Recortes vazios: {'PASSOU' if sucesso_vazio else 'FALHOU'}")
+
+    if sucesso_faixas and sucesso_quartis and sucesso_vazio:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
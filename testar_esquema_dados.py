@@ -0,0 +1,104 @@
+"""
+Script de teste para o esquema categórico do dataset (visão em português).
+Verifica tipos, ordem dos níveis e economia de memória.
+"""
+
+import pandas as pd
+
+from esquema_dados import (ESQUEMA_CATEGORICO, TOLERANCIA_FLOAT32, aplicar_esquema, compactar_numericos,
+                           dtypes_leitura, niveis_observados)
+from localizacao import localizar
+
+
+def ler_traduzido_texto():
+    """Dataset em português com as colunas de texto como strings comuns"""
+    df = localizar(pd.read_csv('Lung_Cancer_Trends_Realistic.csv'))
+    return df.astype({coluna: object for coluna in ESQUEMA_CATEGORICO})
+
+
+def testar_esquema():
+    print("🧪 Testando esquema categórico...")
+
+    try:
+        df_texto = ler_traduzido_texto()
+        df = aplicar_esquema(df_texto.astype(dtypes_leitura()))
+    except FileNotFoundError:
+        print("❌ Dataset não encontrado")
+        return False
+
+    for coluna in ESQUEMA_CATEGORICO:
+        if not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            print(f"❌ {coluna} não é categórica")
+            return False
+        # Nenhum valor pode ser perdido na conversão
+        if not df[coluna].astype(object).equals(df_texto[coluna].astype(object)):
+            print(f"❌ Valores alterados em {coluna}")
+            return False
+    print(f"✅ {len(ESQUEMA_CATEGORICO)} colunas categóricas sem perda de valores")
+
+    if not (df['Nivel_Renda'] < 'Alta').equals(df_texto['Nivel_Renda'].isin(['Baixa', 'Média'])):
+        print("❌ Ordem de Nivel_Renda incorreta")
+        return False
+    print(f"✅ Ordem dos estágios: {niveis_observados(df['Estagio_Cancer_Pulmao'])}")
+
+    memoria_texto = df_texto[list(ESQUEMA_CATEGORICO)].memory_usage(deep=True).sum()
+    memoria_cat = df[list(ESQUEMA_CATEGORICO)].memory_usage(deep=True).sum()
+    print(f"✅ Memória: {memoria_texto / 1024:.0f} KB → {memoria_cat / 1024:.0f} KB")
+    return memoria_cat < memoria_texto
+
+
+def testar_valores_fora_do_esquema():
+    print("\n🧪 Testando valores fora do esquema...")
+    df = aplicar_esquema(pd.DataFrame({'Regiao': ['Norte', 'Centro', 'Sul']}))
+    if df['Regiao'].isna().any():
+        print("❌ Valor desconhecido foi descartado")
+        return False
+    print(f"✅ Níveis: {list(df['Regiao'].cat.categories)}")
+    return True
+
+
+def testar_compactacao():
+    print("\n🧪 Testando compactação numérica...")
+    df_original = ler_traduzido_texto()
+    df, relatorio = compactar_numericos(df_original.copy())
+
+    for _, linha in relatorio.iterrows():
+        coluna = linha['Coluna']
+        if not (df[coluna].astype(float) - df_original[coluna]).abs().max() < 1e-4:
+            print(f"❌ Valores alterados em {coluna}")
+            return False
+        print(f"   {coluna}: {linha['Tipo_Original']} → {linha['Tipo_Compacto']} "
+              f"({linha['Bytes_Economizados']} bytes economizados)")
+
+    if str(df['Idade'].dtype) != 'int8' or str(df['IMC'].dtype) != 'float32':
+        print("❌ Tipos compactos inesperados")
+        return False
+    # float32 não é exato: o erro relativo fica dentro da tolerância declarada
+    erro_relativo = ((df['IMC'].astype(float) - df_original['IMC']).abs() / df_original['IMC'].abs()).max()
+    if not erro_relativo <= TOLERANCIA_FLOAT32:
+        print(f"❌ Erro relativo do IMC acima da tolerância: {erro_relativo:.2e}")
+        return False
+    print(f"✅ Total economizado: {relatorio['Bytes_Economizados'].sum()} bytes")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO ESQUEMA CATEGÓRICO")
+    print("=" * 60)
+
+    sucesso_esquema = testar_esquema()
+    sucesso_extras = testar_valores_fora_do_esquema()
+    sucesso_compactacao = testar_compactacao()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Esquema: {'PASSOU' if sucesso_esquema else 'FALHOU'}")
+    print(f"✅ Valores fora do esquema: {'PASSOU' if sucesso_extras else 'FALHOU'}")
+    print(f"✅ Compactação numérica: {'PASSOU' if sucesso_compactacao else 'FALHOU'}")
+
+    if sucesso_esquema and sucesso_extras and sucesso_compactacao:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,105 @@
+"""
+Script de teste para o gerador de datasets sintéticos em escala.
+Verifica determinismo, distribuições marginais, correlações e a leitura pelo dashboard.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from esquema_dados import dtypes_leitura
+from gerar_dataset_sintetico import carregar_modelo, gerar_blocos, gerar_dataset
+from localizacao import ESQUEMA_NEUTRO, aplicar_esquema_neutro, localizar
+
+
+def como_numeros(df):
+    """Códigos das categorias (ausentes = -1) e colunas numéricas, para comparar distribuições"""
+    return pd.DataFrame({
+        coluna: df[coluna].cat.codes if isinstance(df[coluna].dtype, pd.CategoricalDtype) else df[coluna]
+        for coluna in df.columns if coluna != 'Patient_ID'
+    }).astype(float)
+
+
+def testar_gerador():
+    print("🧪 Testando gerador sintético...")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        modelo = carregar_modelo()
+        fonte = aplicar_esquema_neutro(pd.read_csv('Lung_Cancer_Trends_Realistic.csv',
+                                                   dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+
+        primeira = pd.concat(gerar_blocos(modelo, 5000, semente=7, tamanho_bloco=2000), ignore_index=True)
+        segunda = pd.concat(gerar_blocos(modelo, 5000, semente=7, tamanho_bloco=2000), ignore_index=True)
+        if not primeira.equals(segunda) or not primeira['Patient_ID'].is_unique:
+            print("❌ Geração não determinística ou IDs repetidos")
+            return False
+        print("✅ Mesma semente, mesmo dataset")
+
+        caminho_csv = os.path.join(diretorio, 'sintetico.csv')
+        caminho_parquet = os.path.join(diretorio, 'sintetico.parquet')
+        linhas = gerar_dataset(200_000, caminho_csv, 'csv', modelo=modelo)
+        gerar_dataset(200_000, caminho_parquet, 'parquet', modelo=modelo)
+        if list(pd.read_csv(caminho_csv, nrows=0).columns) != list(fonte.columns):
+            print("❌ Colunas diferentes da fonte")
+            return False
+        sintetico = aplicar_esquema_neutro(pd.read_csv(caminho_csv, dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+        colunar = pd.read_parquet(caminho_parquet)
+        if len(sintetico) != linhas or not sintetico['Lung_Cancer_Stage'].cat.codes.equals(
+                colunar['Lung_Cancer_Stage'].cat.codes):
+            print("❌ CSV e Parquet gerados diferem")
+            return False
+        print(f"✅ {linhas} linhas em CSV e Parquet, no esquema da fonte")
+
+        for coluna in ESQUEMA_NEUTRO:
+            diferenca = (sintetico[coluna].value_counts(normalize=True, dropna=False)
+                         - fonte[coluna].value_counts(normalize=True, dropna=False)).abs().max()
+            if diferenca > 0.01:
+                print(f"❌ Distribuição de {coluna} diverge em {diferenca:.3f}")
+                return False
+        medias_fonte = como_numeros(fonte).mean()
+        medias_sintetico = como_numeros(sintetico).mean()
+        if not np.allclose(medias_sintetico, medias_fonte, rtol=0.01):
+            print("❌ Médias das colunas divergem")
+            return False
+        print("✅ Distribuições marginais preservadas")
+
+        correlacao_fonte = como_numeros(fonte).corr(method='spearman')
+        correlacao_sintetico = como_numeros(sintetico).corr(method='spearman')
+        erro = (correlacao_sintetico - correlacao_fonte).abs().max().max()
+        if erro > 0.05:
+            print(f"❌ Correlações divergem em até {erro:.3f}")
+            return False
+        print(f"✅ Correlações preservadas (erro máximo {erro:.3f})")
+
+        if localizar(colunar)['Idade'].dtype != np.int8:
+            print("❌ Tipos compactos não aplicados ao Parquet")
+            return False
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao testar gerador sintético: {e}")
+        return False
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO GERADOR SINTÉTICO")
+    print("=" * 60)
+
+    sucesso = testar_gerador()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Gerador sintético: {'PASSOU' if sucesso else 'FALHOU'}")
+
+    if sucesso:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
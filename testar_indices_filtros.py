@@ -0,0 +1,113 @@
+"""
+Script de teste para os índices dos filtros globais.
+Compara os índices bitmap e de faixas com as máscaras booleanas equivalentes.
+"""
+
+import itertools
+
+import numpy as np
+
+from dados_teste import carregar_dataset
+from indices_filtros import (COLUNAS_BITMAP, codigos_categorias, construir_indice_bitmap, construir_indices,
+                             posicoes_faixa, posicoes_filtradas)
+
+
+def testar_indice_bitmap():
+    print("🧪 Testando índice bitmap...")
+    df = carregar_dataset(compacto=False)
+    indice = construir_indice_bitmap(df)
+
+    combinacoes = 0
+    opcoes = [[None] + list(df[coluna].cat.categories) for coluna in COLUNAS_BITMAP]
+    for selecao in itertools.product(*opcoes):
+        filtros = {}
+        mascara = np.ones(len(df), dtype=bool)
+        for coluna, valor in zip(COLUNAS_BITMAP, selecao):
+            if valor is not None:
+                filtros[coluna] = codigos_categorias(df[coluna], [valor])
+                mascara &= (df[coluna] == valor).to_numpy()
+        for mascara_idade in (None, (df['Idade'] < 50).to_numpy()):
+            esperado = mascara if mascara_idade is None else mascara & mascara_idade
+            if not np.array_equal(posicoes_filtradas(indice, filtros, mascara_idade), np.flatnonzero(esperado)):
+                print(f"❌ Resultado diferente para {selecao}")
+                return False
+            combinacoes += 1
+    print(f"✅ {combinacoes} combinações idênticas às máscaras booleanas")
+
+    # Vários valores na mesma coluna (OR) e categoria inexistente
+    filtros = {'Regiao': codigos_categorias(df['Regiao'], ['Norte', 'Sul', 'Centro'])}
+    esperado = np.flatnonzero(df['Regiao'].isin(['Norte', 'Sul']).to_numpy())
+    if not np.array_equal(posicoes_filtradas(indice, filtros), esperado):
+        print("❌ OR dentro da coluna incorreto")
+        return False
+    if len(posicoes_filtradas(indice, {'Regiao': []})) != 0:
+        print("❌ Seleção vazia deveria retornar nenhuma linha")
+        return False
+    print("✅ OR dentro da coluna e seleção vazia")
+
+    bytes_indice = sum(bitsets.nbytes for bitsets in indice['bitsets'].values())
+    print(f"✅ Tamanho do índice: {bytes_indice} bytes para {len(df)} linhas")
+    return True
+
+
+def testar_indice_faixas():
+    print("\n🧪 Testando índice de faixas...")
+    df = carregar_dataset()
+    indice = construir_indices(df)
+    rng = np.random.default_rng(0)
+
+    # IMC é float32: limites arredondados como no slider do app
+    imc = df['IMC'].to_numpy()
+    faixas_teste = [
+        {'Idade': (40, 41)},
+        {'Idade': (25, 89)},
+        {'IMC': (round(float(imc.min()), 6), round(float(np.median(imc)), 6))},
+        {'Ano_Diagnostico': (2010, 2010), 'Idade': (30, 60)},
+    ]
+    for _ in range(30):
+        faixas_teste.append({
+            'Idade': tuple(sorted(rng.integers(25, 90, 2).tolist())),
+            'IMC': tuple(sorted(round(float(valor), 6) for valor in rng.choice(imc, 2))),
+            'Ano_Diagnostico': tuple(sorted(rng.integers(2000, 2025, 2).tolist())),
+        })
+
+    for faixas in faixas_teste:
+        for filtros_categoricos in ({}, {'Genero': ['Feminino'], 'Nivel_Renda': ['Baixa', 'Alta']}):
+            mascara = np.ones(len(df), dtype=bool)
+            for coluna, (minimo, maximo) in faixas.items():
+                mascara &= ((df[coluna] >= minimo) & (df[coluna] <= maximo)).to_numpy()
+            filtros = {}
+            for coluna, valores in filtros_categoricos.items():
+                filtros[coluna] = codigos_categorias(df[coluna], valores)
+                mascara &= df[coluna].isin(valores).to_numpy()
+            if not np.array_equal(posicoes_filtradas(indice, filtros, faixas=faixas), np.flatnonzero(mascara)):
+                print(f"❌ Resultado diferente para {faixas} {filtros_categoricos}")
+                return False
+    print(f"✅ {2 * len(faixas_teste)} combinações de faixas idênticas às máscaras booleanas")
+
+    posicoes = posicoes_faixa(indice, 'Idade', 50, 50)
+    if not (df['Idade'].to_numpy()[posicoes] == 50).all() or len(posicoes) != (df['Idade'] == 50).sum():
+        print("❌ Faixa de um único valor incorreta")
+        return False
+    print(f"✅ Faixa Idade = 50: {len(posicoes)} linhas por busca binária")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DOS ÍNDICES DE FILTROS")
+    print("=" * 60)
+
+    sucesso_bitmap = testar_indice_bitmap()
+    sucesso_faixas = testar_indice_faixas()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Índice bitmap: {'PASSOU' if sucesso_bitmap else 'FALHOU'}")
+    print(f"✅ Índice de faixas: {'PASSOU' if sucesso_faixas else 'FALHOU'}")
+
+    if sucesso_bitmap and sucesso_faixas:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
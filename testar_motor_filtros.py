@@ -0,0 +1,152 @@
+"""
+Script de teste para o motor de filtros declarativo.
+Compara a avaliação das especificações com as máscaras booleanas equivalentes.
+"""
+
+import numpy as np
+
+from dados_teste import carregar_dataset
+from indices_filtros import construir_indices
+from motor_filtros import (avaliar_filtros, avaliar_filtros_em_cache, chave_filtros, coletar, combinar_filtros,
+                           criar_cache_filtros, especificacao_filtros, estatisticas_cache)
+
+
+def mascara_especificacao(df, especificacao):
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valores in especificacao['categorias'].items():
+        mascara &= df[coluna].isin(valores).to_numpy()
+    for coluna, (minimo, maximo) in especificacao['faixas'].items():
+        mascara &= ((df[coluna] >= minimo) & (df[coluna] <= maximo)).to_numpy()
+    return mascara
+
+
+def testar_combinacao():
+    print("🧪 Testando combinação de especificações...")
+    globais = especificacao_filtros({'Regiao': ['Norte', 'Sul']}, {'Idade': (30, 60)})
+    locais = especificacao_filtros({'Regiao': ['Sul', 'Leste'], 'Genero': ['Feminino']},
+                                   {'Idade': (40, 80), 'IMC': (20, 30)})
+    combinada = combinar_filtros(globais, locais)
+    esperada = especificacao_filtros({'Regiao': ['Sul'], 'Genero': ['Feminino']},
+                                     {'Idade': (40, 60), 'IMC': (20, 30)})
+    if combinada != esperada:
+        print(f"❌ Combinação incorreta: {combinada}")
+        return False
+    if globais != especificacao_filtros({'Regiao': ['Norte', 'Sul']}, {'Idade': (30, 60)}):
+        print("❌ A combinação não deveria alterar as especificações originais")
+        return False
+    print("✅ Interseção das categorias e das faixas de uma mesma coluna")
+    return True
+
+
+def testar_avaliacao():
+    print("\n🧪 Testando avaliação em uma passada...")
+    df = carregar_dataset()
+    indice = construir_indices(df)
+    imc = df['IMC'].to_numpy()
+    imc_mediano = round(float(np.median(imc)), 6)
+
+    especificacoes = [
+        especificacao_filtros(),
+        especificacao_filtros({'Genero': ['Feminino']}),
+        especificacao_filtros(faixas={'Idade': (40, 41)}),
+        # Colunas fora dos índices: categoria e faixa viram uma máscara
+        especificacao_filtros({'Consumo_Alcool': ['Moderado']}, {'Anos_Fumando': (5, 20)}),
+        combinar_filtros(
+            especificacao_filtros({'Regiao': ['Norte'], 'Status_Tabagismo': ['Atual']}, {'Idade': (40, 60)}),
+            especificacao_filtros({'Nivel_Renda': ['Baixa', 'Alta'], 'Nivel_Educacao': []},
+                                  {'IMC': (round(float(imc.min()), 6), imc_mediano)}),
+        ),
+        combinar_filtros(
+            especificacao_filtros({'Genero': ['Masculino']}, {'Idade': (25, 89)}),
+            especificacao_filtros({'Nivel_Renda': ['Média']}, {'Ano_Diagnostico': (2010, 2015)}),
+        ),
+    ]
+    for especificacao in especificacoes:
+        posicoes = avaliar_filtros(df, indice, especificacao)
+        if not np.array_equal(posicoes, np.flatnonzero(mascara_especificacao(df, especificacao))):
+            print(f"❌ Resultado diferente para {especificacao}")
+            return False
+    print(f"✅ {len(especificacoes)} especificações idênticas às máscaras booleanas")
+
+    posicoes = avaliar_filtros(df, indice, especificacoes[-1])
+    recorte = coletar(df, posicoes, ['Ano_Diagnostico', 'Genero'])
+    if list(recorte.columns) != ['Ano_Diagnostico', 'Genero'] or len(recorte) != len(posicoes):
+        print("❌ Coleta de colunas incorreta")
+        return False
+    if not recorte.equals(df.take(posicoes)[['Ano_Diagnostico', 'Genero']]):
+        print("❌ Coleta diferente da seleção completa")
+        return False
+    print(f"✅ Coleta de {len(posicoes)} linhas só com as colunas pedidas")
+    return True
+
+
+def testar_cache():
+    print("\n🧪 Testando cache LRU de resultados...")
+    df = carregar_dataset()
+    indice = construir_indices(df)
+
+    # Mesma seleção em outra ordem e com limites int/float tem a mesma chave
+    a = especificacao_filtros({'Regiao': ['Norte', 'Sul'], 'Genero': ['Feminino']}, {'Idade': (40, 60)})
+    b = especificacao_filtros({'Genero': ['Feminino'], 'Regiao': ['Sul', 'Norte']}, {'Idade': (40.0, 60.0)})
+    if chave_filtros(a) != chave_filtros(b):
+        print("❌ Especificações equivalentes com chaves diferentes")
+        return False
+    print("✅ Chave canônica independe da ordem")
+
+    cache = criar_cache_filtros(max_entradas=2)
+    primeira = avaliar_filtros_em_cache(cache, df, indice, a)
+    segunda = avaliar_filtros_em_cache(cache, df, indice, b)
+    if segunda is not primeira or not np.array_equal(primeira, avaliar_filtros(df, indice, a)):
+        print("❌ A segunda consulta deveria reaproveitar o resultado")
+        return False
+    if primeira.flags.writeable:
+        print("❌ Posições compartilhadas deveriam ser somente leitura")
+        return False
+    estatisticas = estatisticas_cache(cache)
+    if (estatisticas['acertos'], estatisticas['faltas']) != (1, 1):
+        print(f"❌ Estatísticas incorretas: {estatisticas}")
+        return False
+    print("✅ Acerto na seleção repetida, resultado somente leitura")
+
+    # Limite de entradas: a menos usada recentemente sai
+    c = especificacao_filtros({'Genero': ['Masculino']})
+    d = especificacao_filtros(faixas={'Ano_Diagnostico': (2010, 2012)})
+    avaliar_filtros_em_cache(cache, df, indice, c)
+    avaliar_filtros_em_cache(cache, df, indice, a)
+    avaliar_filtros_em_cache(cache, df, indice, d)
+    estatisticas = estatisticas_cache(cache)
+    if estatisticas['entradas'] != 2 or estatisticas['remocoes'] != 1 or chave_filtros(c) in cache['entradas']:
+        print(f"❌ Remoção LRU incorreta: {estatisticas}")
+        return False
+    print(f"✅ Remoção LRU por quantidade: {estatisticas}")
+
+    # Limite de bytes: resultados maiores que o limite não são guardados
+    pequeno = criar_cache_filtros(max_bytes=1024)
+    avaliar_filtros_em_cache(pequeno, df, indice, especificacao_filtros())
+    if estatisticas_cache(pequeno)['entradas'] != 0:
+        print("❌ Resultado maior que o limite de bytes não deveria ser guardado")
+        return False
+    print("✅ Limite de bytes respeitado")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DO MOTOR DE FILTROS")
+    print("=" * 60)
+
+    sucesso_combinacao = testar_combinacao()
+    sucesso_avaliacao = testar_avaliacao()
+    sucesso_cache = testar_cache()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Combinação: {'PASSOU' if sucesso_combinacao else 'FALHOU'}")
+    print(f"✅ Avaliação: {'PASSOU' if sucesso_avaliacao else 'FALHOU'}")
+    print(f"✅ Cache de resultados: {'PASSOU' if sucesso_cache else 'FALHOU'}")
+
+    if sucesso_combinacao and sucesso_avaliacao and sucesso_cache:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -0,0 +1,123 @@
+"""
+Script de teste para a tradução categórica do dataset (traduzir_dataset.py).
+Compara a tradução por categorias com uma tradução linha a linha de referência.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from esquema_dados import dtypes_leitura
+from localizacao import (COLUMN_TRANSLATION, ESQUEMA_NEUTRO, VALUE_TRANSLATIONS, aplicar_esquema_neutro, localizar,
+                         normalizar_desfechos, traduzir_categorias)
+from traduzir_dataset import translate_dataset
+
+
+def traduzir_linha_a_linha(caminho):
+    """Tradução de referência, valor a valor, independente das categorias"""
+    df = pd.read_csv(caminho).rename(columns=COLUMN_TRANSLATION)
+    for coluna, traducoes in VALUE_TRANSLATIONS.items():
+        df[coluna] = df[coluna].map(traducoes)
+    return df
+
+
+def testar_traducao_completa():
+    print("🧪 Testando tradução por categorias...")
+
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    try:
+        referencia = traduzir_linha_a_linha('Lung_Cancer_Trends_Realistic.csv')
+        shutil.copy('Lung_Cancer_Trends_Realistic.csv', diretorio)
+        os.chdir(diretorio)
+        traduzido = translate_dataset()
+        gravado = pd.read_parquet('Dataset_Cancer_Pulmao_Traduzido.parquet')
+    except FileNotFoundError:
+        print("❌ Dataset não encontrado")
+        return False
+    finally:
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    for coluna in referencia.columns:
+        esperado = referencia[coluna].astype(object).where(referencia[coluna].notna(), None)
+        obtido = gravado[coluna].astype(object).where(gravado[coluna].notna(), None)
+        if not esperado.equals(obtido):
+            print(f"❌ Coluna {coluna} diferente da referência")
+            return False
+    print(f"✅ {traduzido.shape[1]} colunas idênticas à tradução de referência")
+    return True
+
+
+def testar_categorias_duplicadas():
+    print("\n🧪 Testando categorias com a mesma tradução...")
+    serie = pd.Series(['No Cancer', 'None', 'Stage I', None, 'No Cancer'])
+    traduzida = traduzir_categorias(serie, VALUE_TRANSLATIONS['Estagio_Cancer_Pulmao'])
+    esperado = ['Sem Câncer', 'Sem Câncer', 'Estágio I', None, 'Sem Câncer']
+    obtido = traduzida.astype(object).where(traduzida.notna(), None).tolist()
+    if obtido != esperado:
+        print(f"❌ Resultado inesperado: {obtido}")
+        return False
+    print(f"✅ Categorias: {list(traduzida.cat.categories)}")
+    return True
+
+
+def testar_desfechos():
+    print("\n🧪 Testando normalização dos desfechos na carga...")
+    neutro = aplicar_esquema_neutro(pd.read_csv('Lung_Cancer_Trends_Realistic.csv', dtype=dtypes_leitura(ESQUEMA_NEUTRO)))
+    fonte = pd.read_csv('Lung_Cancer_Trends_Realistic.csv', keep_default_na=False)
+    sem_cancer_fonte = fonte['Lung_Cancer_Stage'].isin(['No Cancer', 'None']).to_numpy()
+    normalizado = localizar(normalizar_desfechos(neutro))
+    estagio = normalizado['Estagio_Cancer_Pulmao']
+    if estagio.isna().any() or not np.array_equal((estagio == 'Sem Câncer').to_numpy(), sem_cancer_fonte):
+        print("❌ Estágio \"None\" da fonte não virou Sem Câncer")
+        return False
+    if normalizado['Tem_Cancer'].dtype != bool or not np.array_equal(normalizado['Tem_Cancer'].to_numpy(), ~sem_cancer_fonte):
+        print("❌ Indicador de câncer diferente do estágio")
+        return False
+    if not np.array_equal(normalizado['Sobrevivente'].to_numpy(), (fonte['Survival_Status'] == 'Alive').to_numpy()):
+        print("❌ Indicador de sobrevivência diferente do status")
+        return False
+    print(f"✅ Taxa de câncer {normalizado['Tem_Cancer'].mean():.1%}, sobrevivência {normalizado['Sobrevivente'].mean():.1%}")
+    return True
+
+
+def testar_idiomas():
+    print("\n🧪 Testando tradução na leitura (um dataset, dois idiomas)...")
+    neutro = pd.read_csv('Lung_Cancer_Trends_Realistic.csv', dtype={coluna: 'category' for coluna in ESQUEMA_NEUTRO})
+    if localizar(neutro, 'en') is not neutro:
+        print("❌ A visão em inglês deveria ser o próprio dataset")
+        return False
+    portugues = localizar(neutro, 'pt')
+    if not np.shares_memory(portugues['Genero'].cat.codes.to_numpy(), neutro['Gender'].cat.codes.to_numpy()):
+        print("❌ Os códigos das categorias foram copiados")
+        return False
+    print(f"✅ Visões em inglês e português sobre os mesmos dados: {list(portugues['Genero'].cat.categories)}")
+    return True
+
+
+if __name__ == "__main__":
+    print("🫁 Dashboard de Análise de Fatores de Risco do Câncer de Pulmão")
+    print("=" * 60)
+    print("TESTE DA TRADUÇÃO CATEGÓRICA")
+    print("=" * 60)
+
+    sucesso_traducao = testar_traducao_completa()
+    sucesso_duplicadas = testar_categorias_duplicadas()
+    sucesso_desfechos = testar_desfechos()
+    sucesso_idiomas = testar_idiomas()
+
+    print("\n" + "=" * 60)
+    print("RESULTADOS:")
+    print(f"✅ Tradução completa: {'PASSOU' if sucesso_traducao else 'FALHOU'}")
+    print(f"✅ Categorias duplicadas: {'PASSOU' if sucesso_duplicadas else 'FALHOU'}")
+    print(f"✅ Desfechos normalizados: {'PASSOU' if sucesso_desfechos else 'FALHOU'}")
+    print(f"✅ Tradução na leitura: {'PASSOU' if sucesso_idiomas else 'FALHOU'}")
+
+    if sucesso_traducao and sucesso_duplicadas and sucesso_desfechos and sucesso_idiomas:
+        print("\n🎉 TODOS OS TESTES PASSARAM!")
+    else:
+        print("\n❌ ALGUNS TESTES FALHARAM")
@@ -1,153 +1,81 @@
+"""
+Exporta uma cópia traduzida do dataset.
+
+O dashboard não precisa mais dela: lê o CSV da fonte e traduz na leitura (ver
+``localizacao.py``). Este script continua útil para entregar o dataset em
+português a outras ferramentas.
+"""
+
+import argparse
+
 import pandas as pd
-import numpy as np
 
-def translate_dataset():
+from armazenamento_colunar import TAMANHO_BLOCO_PADRAO, ingerir_csv_em_blocos, salvar_colunar
+from esquema_dados import TIPOS_NUMERICOS_COMPACTOS, aplicar_esquema, dtypes_leitura
+from localizacao import ESQUEMA_NEUTRO, IDIOMA_PADRAO, localizar
+
+# Colunas de origem lidas direto como categorias: a tradução atua só sobre os valores distintos
+DTYPES_ORIGEM = dtypes_leitura(ESQUEMA_NEUTRO)
+
+def traduzir_bloco(df):
+    """Renomeia as colunas e traduz os valores categóricos de um DataFrame (ou bloco)"""
+    return localizar(df, IDIOMA_PADRAO)
+
+def translate_dataset(formato='parquet', caminho_origem='Lung_Cancer_Trends_Realistic.csv'):
     """Traduz o dataset para português"""
     print("🔄 Carregando dataset...")
-    df = pd.read_csv('Lung_Cancer_Trends_Realistic.csv')
-    
-    print("🔄 Traduzindo colunas...")
-    # Dicionário de tradução das colunas
-    column_translation = {
-        'Patient_ID': 'ID_Paciente',
-        'Age': 'Idade',
-        'Gender': 'Genero',
-        'Smoking_Status': 'Status_Tabagismo',
-        'Years_Smoking': 'Anos_Fumando',
-        'Cigarettes_Per_Day': 'Cigarros_Por_Dia',
-        'Secondhand_Smoke_Exposure': 'Exposicao_Fumo_Passivo',
-        'Occupation_Exposure': 'Exposicao_Ocupacional',
-        'Air_Pollution_Level': 'Nivel_Poluicao_Ar',
-        'Family_History': 'Historico_Familiar',
-        'Genetic_Markers_Positive': 'Marcadores_Geneticos_Positivos',
-        'BMI': 'IMC',
-        'Physical_Activity_Level': 'Nivel_Atividade_Fisica',
-        'Alcohol_Consumption': 'Consumo_Alcool',
-        'Diet_Quality': 'Qualidade_Dieta',
-        'Region': 'Regiao',
-        'Income_Level': 'Nivel_Renda',
-        'Education_Level': 'Nivel_Educacao',
-        'Access_to_Healthcare': 'Acesso_Cuidados_Saude',
-        'Screening_Frequency': 'Frequencia_Exames',
-        'Chronic_Lung_Disease': 'Doenca_Pulmonar_Cronica',
-        'Lung_Cancer_Stage': 'Estagio_Cancer_Pulmao',
-        'Diagnosis_Year': 'Ano_Diagnostico',
-        'Survival_Status': 'Status_Sobrevivencia'
-    }
+    df = pd.read_csv(caminho_origem, dtype=DTYPES_ORIGEM)
     
-    # Renomear colunas
-    df_translated = df.rename(columns=column_translation)
-    
-    print("🔄 Traduzindo valores categóricos...")
-    
-    # Traduzir valores categóricos
-    value_translations = {
-        'Genero': {
-            'Male': 'Masculino',
-            'Female': 'Feminino'
-        },
-        'Status_Tabagismo': {
-            'Never': 'Nunca',
-            'Current': 'Atual',
-            'Former': 'Ex-fumante'
-        },
-        'Exposicao_Fumo_Passivo': {
-            'Low': 'Baixa',
-            'Medium': 'Média',
-            'High': 'Alta'
-        },
-        'Exposicao_Ocupacional': {
-            'Asbestos': 'Amianto',
-            'Silica': 'Sílica',
-            'Diesel Fumes': 'Gases Diesel',
-            'Coal Dust': 'Poeira de Carvão',
-            'Chemical Fumes': 'Gases Químicos'
-        },
-        'Nivel_Poluicao_Ar': {
-            'Low': 'Baixo',
-            'Moderate': 'Moderado',
-            'High': 'Alto'
-        },
-        'Historico_Familiar': {
-            'Yes': 'Sim',
-            'No': 'Não'
-        },
-        'Marcadores_Geneticos_Positivos': {
-            'Yes': 'Sim',
-            'No': 'Não'
-        },
-        'Nivel_Atividade_Fisica': {
-            'Low': 'Baixo',
-            'Moderate': 'Moderado',
-            'High': 'Alto'
-        },
-        'Consumo_Alcool': {
-            'Low': 'Baixo',
-            'Moderate': 'Moderado',
-            'High': 'Alto'
-        },
-        'Qualidade_Dieta': {
-            'Poor': 'Ruim',
-            'Average': 'Média',
-            'Good': 'Boa'
-        },
-        'Regiao': {
-            'North': 'Norte',
-            'South': 'Sul',
-            'East': 'Leste',
-            'West': 'Oeste'
-        },
-        'Nivel_Renda': {
-            'Low': 'Baixa',
-            'Middle': 'Média',
-            'High': 'Alta'
-        },
-        'Nivel_Educacao': {
-            'Primary': 'Fundamental',
-            'Secondary': 'Médio',
-            'Tertiary': 'Superior'
-        },
-        'Acesso_Cuidados_Saude': {
-            'Poor': 'Ruim',
-            'Average': 'Médio',
-            'Good': 'Bom'
-        },
-        'Frequencia_Exames': {
-            'Never': 'Nunca',
-            'Occasionally': 'Ocasionalmente',
-            'Regularly': 'Regularmente'
-        },
-        'Doenca_Pulmonar_Cronica': {
-            'Yes': 'Sim',
-            'No': 'Não'
-        },
-        'Estagio_Cancer_Pulmao': {
-            'No Cancer': 'Sem Câncer',
-            'None': 'Sem Câncer',
-            'Stage I': 'Estágio I',
-            'Stage II': 'Estágio II',
-            'Stage III': 'Estágio III',
-            'Stage IV': 'Estágio IV'
-        },
-        'Status_Sobrevivencia': {
-            'Alive': 'Vivo',
-            'Deceased': 'Falecido'
-        }
-    }
-    
-    # Aplicar traduções
-    for column, translations in value_translations.items():
-        if column in df_translated.columns:
-            df_translated[column] = df_translated[column].replace(translations)
+    print("🔄 Traduzindo colunas e valores categóricos...")
+    df_translated = aplicar_esquema(traduzir_bloco(df))
     
     print("💾 Salvando dataset traduzido...")
-    df_translated.to_csv('Dataset_Cancer_Pulmao_Traduzido.csv', index=False, encoding='utf-8')
+    if formato == 'csv':
+        caminho_destino = 'Dataset_Cancer_Pulmao_Traduzido.csv'
+        df_translated.to_csv(caminho_destino, index=False, encoding='utf-8')
+    else:
+        caminho_destino = f'Dataset_Cancer_Pulmao_Traduzido.{formato}'
+        salvar_colunar(df_translated, caminho_destino, formato)
     
-    print("✅ Dataset traduzido salvo como 'Dataset_Cancer_Pulmao_Traduzido.csv'")
+    print(f"✅ Dataset traduzido salvo como '{caminho_destino}'")
     print(f"📊 Shape: {df_translated.shape}")
     print(f"📋 Colunas traduzidas: {list(df_translated.columns)}")
     
     return df_translated
 
+def translate_dataset_em_blocos(caminho_origem='Lung_Cancer_Trends_Realistic.csv',
+                                caminho_destino='Dataset_Cancer_Pulmao_Traduzido.parquet',
+                                tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Traduz extratos grandes em blocos, direto para Parquet.
+
+    Cada bloco é traduzido, convertido para o esquema categórico e para os tipos
+    numéricos compactos e anexado ao arquivo, então o pico de memória depende
+    apenas do tamanho do bloco.
+    """
+    print(f"🔄 Traduzindo '{caminho_origem}' em blocos de {tamanho_bloco} linhas...")
+    total_linhas = ingerir_csv_em_blocos(
+        caminho_origem,
+        caminho_destino,
+        formato='parquet',
+        transformar=lambda bloco: aplicar_esquema(traduzir_bloco(bloco)),
+        tamanho_bloco=tamanho_bloco,
+        tipos_fixos=TIPOS_NUMERICOS_COMPACTOS,
+        dtype=DTYPES_ORIGEM
+    )
+    print(f"✅ Dataset traduzido salvo como '{caminho_destino}'")
+    print(f"📊 Linhas: {total_linhas}")
+    return total_linhas
+
 if __name__ == "__main__":
-    translate_dataset()
+    parser = argparse.ArgumentParser(description="Traduz o dataset para português")
+    parser.add_argument('--formato', choices=['parquet', 'feather', 'csv'], default='parquet',
+                        help="Formato do arquivo traduzido (padrão: parquet)")
+    parser.add_argument('--tamanho-bloco', type=int, default=None,
+                        help="Traduz em blocos desse tamanho e grava em Parquet (para extratos grandes)")
+    args = parser.parse_args()
+
+    if args.tamanho_bloco:
+        translate_dataset_em_blocos(tamanho_bloco=args.tamanho_bloco)
+    else:
+        translate_dataset(args.formato)